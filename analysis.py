@@ -0,0 +1,179 @@
+from interpreter import Direction, COMMAND_SYMBOLS
+from playfield import SPACE, to_symbol
+
+TURNS = {
+    '>': Direction.RIGHT,
+    '<': Direction.LEFT,
+    '^': Direction.UP,
+    'v': Direction.DOWN,
+}
+BRANCHES = {
+    '_': (Direction.LEFT, Direction.RIGHT),
+    '|': (Direction.UP, Direction.DOWN),
+}
+SIDE_EFFECTS = set('.,&~p@')
+BINARY_OPERATIONS = {
+    '+': lambda x, y: x + y,
+    '-': lambda x, y: x - y,
+    '*': lambda x, y: x * y,
+    '/': lambda x, y: x // y if y else None,
+    '%': lambda x, y: x % y if y else None,
+    '`': lambda x, y: 1 if x > y else 0,
+}
+DIGITS = set('0123456789')
+
+
+class Analysis:
+    def __init__(self, playfield, start=(0, Direction.RIGHT, False)):
+        self.playfield = playfield
+        self.start = start
+        self.graph = {}
+        self.writes = False
+        self.reads = False
+        if playfield.cells:
+            self.explore()
+        self.reachable_cells = {position for position, _, _ in self.graph}
+        self.dead_cells = [position
+                           for position, value in enumerate(playfield.cells)
+                           if value != SPACE
+                           and position not in self.reachable_cells]
+        self.blocks = self.find_blocks()
+        self.loops = self.find_loops()
+        self.folds = self.find_folds()
+
+    def symbol(self, state):
+        return to_symbol(self.playfield.cells[state[0]])
+
+    def next_states(self, state):
+        position, direction, quote_mode = state
+        successors = self.playfield.successors()
+        symbol = self.symbol(state)
+        if quote_mode:
+            return [(successors[position * 4 + direction], direction,
+                     symbol != '"')]
+        if symbol == '"':
+            return [(successors[position * 4 + direction], direction, True)]
+        if symbol == '@' or symbol not in COMMAND_SYMBOLS \
+                and symbol not in DIGITS:
+            return []
+        if symbol in TURNS:
+            direction = TURNS[symbol]
+        elif symbol == '#':
+            position = successors[position * 4 + direction]
+        elif symbol in BRANCHES:
+            return [(successors[position * 4 + branch], branch, False)
+                    for branch in BRANCHES[symbol]]
+        elif symbol == '?':
+            return [(successors[position * 4 + turn], turn, False)
+                    for turn in Direction]
+        return [(successors[position * 4 + direction], direction, False)]
+
+    def explore(self):
+        pending = [self.start]
+        while pending:
+            state = pending.pop()
+            if state in self.graph:
+                continue
+            if not state[2]:
+                symbol = self.symbol(state)
+                self.writes = self.writes or symbol == 'p'
+                self.reads = self.reads or symbol in '&~'
+            self.graph[state] = self.next_states(state)
+            pending.extend(self.graph[state])
+
+    def find_blocks(self):
+        incoming = dict.fromkeys(self.graph, 0)
+        for targets in self.graph.values():
+            for target in targets:
+                incoming[target] += 1
+        leaders = {state for state, count in incoming.items() if count != 1}
+        leaders.add(self.start)
+        for state, targets in self.graph.items():
+            if len(targets) != 1:
+                leaders.update(targets)
+        blocks = []
+        for leader in leaders & self.graph.keys():
+            block = [leader]
+            targets = self.graph[leader]
+            while len(targets) == 1 and targets[0] not in leaders:
+                block.append(targets[0])
+                targets = self.graph[targets[0]]
+            blocks.append(block)
+        blocks.sort()
+        return blocks
+
+    def pure(self, state):
+        return len(self.graph[state]) == 1 \
+            and (state[2] or self.symbol(state) not in SIDE_EFFECTS)
+
+    def find_loops(self):
+        loops = []
+        finished = set()
+        for state in self.graph:
+            path = {}
+            while state not in finished and state not in path \
+                    and self.pure(state):
+                path[state] = len(path)
+                state = self.graph[state][0]
+            if state in path:
+                loops.append(list(path)[path[state]:])
+            finished.update(path)
+        return loops
+
+    def find_folds(self):
+        folds = []
+        for block in self.blocks:
+            values = []
+            for state in block:
+                symbol = self.symbol(state)
+                if state[2] and symbol != '"':
+                    values.append(self.playfield.cells[state[0]])
+                elif symbol in DIGITS:
+                    values.append(int(symbol))
+                elif symbol in BINARY_OPERATIONS:
+                    y = values.pop() if values else None
+                    x = values.pop() if values else None
+                    value = None
+                    if x is not None and y is not None:
+                        value = BINARY_OPERATIONS[symbol](x, y)
+                        if value is not None:
+                            folds.append((state, value))
+                    values.append(value)
+                elif symbol == '!':
+                    value = values.pop() if values else None
+                    values.append(None if value is None else int(value == 0))
+                elif symbol == ':':
+                    values.append(values[-1] if values else None)
+                elif symbol == '\\':
+                    y = values.pop() if values else None
+                    x = values.pop() if values else None
+                    values += [y, x]
+                elif symbol == '$':
+                    del values[-1:]
+                elif symbol not in TURNS and symbol not in ' #"':
+                    values = []
+        return folds
+
+    def report(self):
+        width = self.playfield.width
+
+        def cell(position):
+            return f'({position % width}, {position // width})'
+
+        lines = [f'reachable states: {len(self.graph)}',
+                 f'reachable cells: {len(self.reachable_cells)}',
+                 f'basic blocks: {len(self.blocks)}',
+                 f'writes with p: {"yes" if self.writes else "no"}',
+                 f'reads input: {"yes" if self.reads else "no"}',
+                 f'dead cells: {len(self.dead_cells)}']
+        lines += [f'  {cell(position)} '
+                  f'{to_symbol(self.playfield.cells[position])!r}'
+                  for position in self.dead_cells]
+        lines.append(f'infinite loops without side effects: '
+                     f'{len(self.loops)}')
+        lines += [f'  from {cell(loop[0][0])}, {len(loop)} states'
+                  for loop in self.loops]
+        lines.append(f'constant folds: {len(self.folds)}')
+        lines += [f'  {cell(state[0])} {self.symbol(state)!r} = {value}'
+                  for state, value in self.folds]
+        return lines
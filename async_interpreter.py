@@ -0,0 +1,55 @@
+import asyncio
+import time
+from interpreter import Interpreter, Status
+from sinks import CallbackSink
+
+DEFAULT_SLICE = 1000
+READ_SIZE = 65536
+
+
+class AsyncInterpreter(Interpreter):
+    def __init__(self, reader, writer, slice_steps=DEFAULT_SLICE,
+                 width=None, height=None):
+        super().__init__(width, height,
+                         CallbackSink(lambda text: writer.write(text.encode())))
+        self.reader = reader
+        self.writer = writer
+        self.slice_steps = slice_steps
+        self.input_data.eof = False
+
+    async def read_input(self):
+        data = await self.reader.read(READ_SIZE)
+        if data:
+            self.input_data.feed(data)
+        else:
+            self.input_data.eof = True
+
+    async def run(self, max_steps=None, timeout=None):
+        self.compile()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        limit = None if max_steps is None else self.steps + max_steps
+        while True:
+            steps = self.slice_steps
+            if limit is not None:
+                steps = min(steps, limit - self.steps)
+            status = self.step(steps)
+            self.output.flush()
+            await self.writer.drain()
+            if status == Status.NEEDS_INPUT:
+                if self.input_data.eof:
+                    return status
+                try:
+                    await asyncio.wait_for(
+                        self.read_input(),
+                        None if deadline is None
+                        else deadline - time.monotonic())
+                except asyncio.TimeoutError:
+                    return Status.TIMED_OUT
+                continue
+            if status != Status.BUDGET_EXHAUSTED:
+                return status
+            if limit is not None and self.steps >= limit:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return Status.TIMED_OUT
+            await asyncio.sleep(0)
@@ -0,0 +1,90 @@
+import json
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from interpreter import Interpreter, Status
+from limits import Limits
+
+argparser = ArgumentParser(prog='main.py batch')
+argparser.add_argument('manifest',
+                       help="path to JSONL file with one job per line: "
+                            "{\"id\", \"program\" or \"program_file\", "
+                            "\"input\", \"max_steps\", \"timeout\", "
+                            "\"seed\", \"max_stack\", \"max_bits\", \"wrap\", "
+                            "\"max_output\"}")
+argparser.add_argument('-o', '--output', default='-',
+                       help="path to JSONL file with results, '-' for "
+                            "standard output (default)")
+argparser.add_argument('-j', '--workers', type=int,
+                       help="number of worker processes "
+                            "(default: number of CPUs)")
+argparser.add_argument('--max-steps', type=int,
+                       help="default step limit for jobs without one")
+argparser.add_argument('--timeout', type=float,
+                       help="default time limit in seconds for jobs "
+                            "without one")
+argparser.add_argument('--max-stack', type=int,
+                       help="default stack depth limit for jobs without one")
+argparser.add_argument('--max-output', type=int,
+                       help="default output size limit in characters for "
+                            "jobs without one")
+
+
+def run_job(job):
+    result = {'id': job.get('id'), 'status': None, 'output': '',
+              'error': None}
+    interpreter = Interpreter(seed=job.get('seed'))
+    interpreter.limits = Limits(job.get('max_stack'), job.get('max_bits'),
+                                job.get('max_output'), job.get('wrap', False))
+    start = time.perf_counter()
+    try:
+        if 'program_file' in job:
+            interpreter.load_file(job['program_file'])
+        else:
+            interpreter.program = job['program'].split('\n')
+        interpreter.input_data.feed(job.get('input', ''))
+        status = interpreter.run(job.get('max_steps'), job.get('timeout'))
+        result['status'] = status.value
+        if status == Status.LIMIT_EXCEEDED:
+            result['error'] = str(interpreter.limit_error)
+            result['limit'] = interpreter.limit_error.resource
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f'{type(e).__name__}: {e}'
+    result['elapsed'] = time.perf_counter() - start
+    result['steps'] = interpreter.steps
+    result['output'] = interpreter.output.getvalue()
+    result['memory'] = interpreter.memory_usage()['total']
+    result['peak_stack'] = interpreter.limits.peak_stack
+    return result
+
+
+def read_jobs(manifest, max_steps=None, timeout=None, max_stack=None,
+              max_output=None):
+    with open(manifest) as f:
+        for line in f:
+            if line.strip():
+                job = json.loads(line)
+                job.setdefault('max_steps', max_steps)
+                job.setdefault('timeout', timeout)
+                job.setdefault('max_stack', max_stack)
+                job.setdefault('max_output', max_output)
+                yield job
+
+
+def run_batch(jobs, results, workers=None):
+    with ProcessPoolExecutor(workers) as executor:
+        for result in executor.map(run_job, jobs, chunksize=16):
+            results.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def main(argv):
+    args = argparser.parse_args(argv)
+    jobs = read_jobs(args.manifest, args.max_steps, args.timeout,
+                     args.max_stack, args.max_output)
+    if args.output == '-':
+        run_batch(jobs, sys.stdout, args.workers)
+    else:
+        with open(args.output, 'w') as results:
+            run_batch(jobs, results, args.workers)
@@ -0,0 +1,57 @@
+import json
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('--width', type=int, default=2000)
+    argparser.add_argument('--height', type=int, default=2000)
+    argparser.add_argument('--stack', type=int, default=100000,
+                           help="number of values on the stack")
+    args = argparser.parse_args()
+
+    interpreter = Interpreter(args.width, args.height, seed=0)
+    interpreter.program = ['>1+:v', '^   <']
+    interpreter.stack.extend(range(args.stack))
+    interpreter.stack.append(10 ** 30)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, 'state.json')
+        binary_path = os.path.join(directory, 'state.bin')
+
+        def save_json():
+            with open(json_path, 'w') as f:
+                json.dump(interpreter.snapshot(), f)
+
+        def load_json():
+            with open(json_path) as f:
+                Interpreter().restore(json.load(f))
+
+        mappable_path = os.path.join(directory, 'mappable.bin')
+        results = [
+            ('json save', timed(save_json)),
+            ('json load', timed(load_json)),
+            ('binary save', timed(
+                lambda: interpreter.save_state(binary_path))),
+            ('binary load', timed(
+                lambda: Interpreter().load_state(binary_path))),
+            ('mappable save', timed(
+                lambda: interpreter.save_state(mappable_path, True))),
+            ('mappable load, mmap', timed(
+                lambda: Interpreter().load_state(mappable_path, True))),
+        ]
+        print(f'{args.width}x{args.height} playfield, {args.stack} stack '
+              f'values: json {os.path.getsize(json_path) / 2 ** 20:.1f} MB, '
+              f'binary {os.path.getsize(binary_path) / 2 ** 20:.1f} MB, '
+              f'mappable {os.path.getsize(mappable_path) / 2 ** 20:.1f} MB')
+        for name, elapsed in results:
+            print(f'{name}: {elapsed * 1000:.1f} ms')
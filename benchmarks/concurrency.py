@@ -0,0 +1,52 @@
+import os
+import time
+from argparse import ArgumentParser
+from concurrency import ConcurrentInterpreter, run_parallel
+
+
+def split_lines(pointers, count):
+    first = '>' + count + '#vt' * pointers + '@'
+    second = ['v'] + [' '] * (len(first) - 1)
+    for i in range(pointers):
+        second[len(count) + 3 * i + 2] = '<'
+    return [first, ''.join(second),
+            '>1-:#v_.@',
+            '^    <']
+
+
+def measure(lines, workers=None):
+    interpreter = ConcurrentInterpreter()
+    interpreter.program = lines
+    start = time.perf_counter()
+    if workers is None:
+        interpreter.run()
+    else:
+        run_parallel(interpreter, workers)
+    return time.perf_counter() - start, interpreter.output.getvalue()
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-k', '--pointers', type=int, default=8,
+                           help="number of instruction pointers spawned "
+                                "with t")
+    argparser.add_argument('--count', default='"~~"*9*',
+                           help="Befunge code pushing the number of loop "
+                                "iterations of every pointer")
+    argparser.add_argument('-j', '--workers', type=int,
+                           default=os.cpu_count(),
+                           help="largest number of worker processes")
+    args = argparser.parse_args()
+
+    lines = split_lines(args.pointers, args.count)
+    elapsed, expected = measure(lines)
+    print(f'{args.pointers} pointers, round-robin: {elapsed:.3f}s')
+    workers = 1
+    while True:
+        parallel, output = measure(lines, workers)
+        assert output == expected
+        print(f'{workers} workers: {parallel:.3f}s '
+              f'({elapsed / parallel:.2f}x)')
+        if workers >= args.workers:
+            break
+        workers = min(workers * 2, args.workers)
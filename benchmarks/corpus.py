@@ -0,0 +1,53 @@
+SIEVE_LIMIT = 126
+STRING = 'zyxwvutsrqponmlkjihgfedcbaZYXWVUTSRQPONMLKJIHGFEDCBA'
+
+
+class Workload:
+    def __init__(self, name, lines, input_data='', description=''):
+        self.name = name
+        self.lines = lines
+        self.input_data = input_data
+        self.description = description
+
+
+def string_lines():
+    first = '&  >:!#@_0"' + STRING + '"v'
+    return [first,
+            '   ^ v' + ' ' * (len(first) - 7) + '<',
+            '     >:#,_$1-v',
+            '   ^         <']
+
+
+WORKLOADS = [
+    Workload('sieve',
+             ['2>:3g" "-!v\\  g30          <',
+              ' |!`"~":+1_:.:03p>03g+:"~"`|',
+              ' @               ^  p3\\" ":<',
+              '2 ' + '#' * (SIEVE_LIMIT + 1)],
+             description=f'sieve of Eratosthenes up to {SIEVE_LIMIT} '
+                         f'in a playfield row'),
+    Workload('factorial',
+             ['vv    <>v *<',
+              '&>:1-:|$>\\:|',
+              '>^    >^@.$<'],
+             '500', 'factorial of 500 with big integers'),
+    Workload('self_modifying',
+             ['&>1-:' + ' ' * 15 + 'v',
+              ' ^    $0p17+*86%+55:_@'],
+             '5000', 'loop that rewrites one of its own cells with p'),
+    Workload('strings', string_lines(), '200',
+             'long string mode literal pushed and printed 200 times'),
+    Workload('quine',
+             ['01->1# +# :# 0# g# ,# :# 5# 8# *# 4# +# -# _@'],
+             description='classic one-line quine'),
+    Workload('deep_stack',
+             ['&0\\>:1-:v    +',
+              '   ^    _$>\\:|',
+              '             >$.@',
+              '          ^  <'],
+             '20000', 'pushes 20000 numbers and sums the whole stack'),
+    Workload('countdown',
+             ['&>1-:v',
+              ' ^   _@'],
+             '100000', 'tight arithmetic loop'),
+]
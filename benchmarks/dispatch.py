@@ -0,0 +1,47 @@
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from exceptions import Halt
+
+COUNTDOWN = ['&>1-:v',
+             ' ^   _@']
+
+
+def reference_run(interpreter):
+    while True:
+        interpreter.execute_command()
+        interpreter.move_pointer()
+
+
+def prepare(interpreter_class, program, *tokens):
+    interpreter = interpreter_class()
+    interpreter.program = [list(line) for line in program]
+    interpreter.input_data.feed(" ".join(map(str, tokens)))
+    return interpreter
+
+
+def measure(loop, interpreter):
+    start = time.perf_counter()
+    try:
+        loop(interpreter)
+    except Halt:
+        pass
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--iterations', type=int, default=100000)
+    args = argparser.parse_args()
+    steps = 10 * args.iterations
+
+    os.chdir(tempfile.mkdtemp())
+    reference = measure(reference_run,
+                        prepare(Interpreter, COUNTDOWN, args.iterations))
+    compiled = measure(Interpreter.run,
+                       prepare(Interpreter, COUNTDOWN, args.iterations))
+    print(f'reference: {steps / reference:12.0f} steps/s')
+    print(f'compiled:  {steps / compiled:12.0f} steps/s')
+    print(f'speedup:   {reference / compiled:12.2f}x')
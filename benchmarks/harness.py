@@ -0,0 +1,155 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from jit import JitInterpreter
+from profiler import ProfilingInterpreter
+from sparse import SparseInterpreter
+from stack import CompactStack
+from benchmarks.corpus import WORKLOADS
+
+FORMAT_VERSION = 1
+ENGINES = {'interpreter': Interpreter, 'jit': JitInterpreter,
+           'profiler': ProfilingInterpreter, 'sparse': SparseInterpreter,
+           'compact': lambda: Interpreter(stack=CompactStack())}
+
+argparser = ArgumentParser(prog='python -m benchmarks.harness')
+argparser.add_argument('workloads', nargs='*',
+                       help="names of workloads to run (default: all)")
+argparser.add_argument('-e', '--engine', choices=ENGINES,
+                       default='interpreter')
+argparser.add_argument('-t', '--min-time', type=float, default=1.0,
+                       help="repeat each workload for at least this many "
+                            "seconds")
+argparser.add_argument('-o', '--output',
+                       help="write results as JSON to this file")
+argparser.add_argument('--compare',
+                       help="JSON results of a previous run to compare with")
+argparser.add_argument('--threshold', type=float, default=0.1,
+                       help="relative slowdown or memory growth reported as "
+                            "a regression (default: 0.1)")
+
+
+def prepare(engine, workload):
+    interpreter = engine()
+    interpreter.program = workload.lines
+    interpreter.input_data.feed(workload.input_data)
+    interpreter.compile()
+    return interpreter
+
+
+def time_startup(engine, workload):
+    start = time.perf_counter()
+    prepare(engine, workload)
+    return time.perf_counter() - start
+
+
+def time_run(engine, workload, min_time):
+    runs = elapsed = steps = 0
+    while elapsed < min_time:
+        interpreter = prepare(engine, workload)
+        start = time.perf_counter()
+        interpreter.run()
+        elapsed += time.perf_counter() - start
+        steps += interpreter.steps
+        runs += 1
+    return runs, steps, elapsed
+
+
+def peak_memory(engine, workload):
+    tracemalloc.start()
+    try:
+        prepare(engine, workload).run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def import_time():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import interpreter'],
+                   cwd=os.path.dirname(os.path.dirname(
+                       os.path.abspath(__file__))),
+                   check=True)
+    return time.perf_counter() - start
+
+
+def measure(engine, workload, min_time):
+    runs, steps, elapsed = time_run(engine, workload, min_time)
+    return {'steps': steps // runs,
+            'runs': runs,
+            'steps_per_second': steps / elapsed,
+            'startup_seconds': time_startup(engine, workload),
+            'peak_memory': peak_memory(engine, workload)}
+
+
+def commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results['workloads'].items():
+        old = baseline['workloads'].get(name)
+        if old is None:
+            continue
+        speed = result['steps_per_second'] / old['steps_per_second']
+        memory = result['peak_memory'] / max(old['peak_memory'], 1)
+        print(f'{name:16} speed {speed:6.2f}x  memory {memory:6.2f}x')
+        if speed < 1 - threshold:
+            regressions.append(f'{name}: steps/s {speed:.2f}x')
+        if memory > 1 + threshold:
+            regressions.append(f'{name}: peak memory {memory:.2f}x')
+    return regressions
+
+
+def main(argv):
+    args = argparser.parse_args(argv)
+    engine = ENGINES[args.engine]
+    workloads = [workload for workload in WORKLOADS
+                 if not args.workloads or workload.name in args.workloads]
+    results = {'version': FORMAT_VERSION,
+               'engine': args.engine,
+               'python': platform.python_version(),
+               'commit': commit(),
+               'import_seconds': import_time(),
+               'workloads': {}}
+    print(f'import: {results["import_seconds"] * 1000:.1f} ms')
+    with tempfile.TemporaryDirectory() as directory:
+        cwd = os.getcwd()
+        os.chdir(directory)
+        try:
+            for workload in workloads:
+                result = measure(engine, workload, args.min_time)
+                results['workloads'][workload.name] = result
+                print(f'{workload.name:16} {result["steps"]:9} steps '
+                      f'{result["steps_per_second"]:12.0f} steps/s '
+                      f'{result["startup_seconds"] * 1000:8.3f} ms startup '
+                      f'{result["peak_memory"] / 1024:9.1f} KiB peak')
+        finally:
+            os.chdir(cwd)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare is not None:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print('regressions:', *regressions, sep='\n  ')
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from journal import RecordingInterpreter, ReplayInterpreter, JournalWriter
+
+PROGRAM = ['&03p>03g:!#@_1-03pv',
+           '                v2?1v',
+           '    ^     .     < < <',
+           '']
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run(interpreter, iterations, steps=None):
+    interpreter.program = PROGRAM
+    interpreter.input_data.feed(str(iterations))
+    interpreter.run(steps)
+    return interpreter
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--iterations', type=int, default=20000)
+    argparser.add_argument('--every', type=int, default=100000,
+                           help="steps between snapshots")
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.journal')
+
+        def record():
+            interpreter = RecordingInterpreter(seed=0)
+            interpreter.journal = JournalWriter(path, args.every)
+            try:
+                return run(interpreter, args.iterations)
+            finally:
+                interpreter.journal.close()
+
+        plain, reference = timed(
+            lambda: run(Interpreter(seed=0), args.iterations))
+        recording, _ = timed(record)
+        steps = reference.steps
+        target = steps * 3 // 4
+        print(f'{steps} steps, journal {os.path.getsize(path) / 1024:.1f} KB '
+              f'({os.path.getsize(path) * 8 / steps:.2f} bits per step)')
+        print(f'plain run: {plain:.3f}s')
+        print(f'recording: {recording:.3f}s ({recording / plain - 1:+.1%})')
+        rerun, _ = timed(
+            lambda: run(Interpreter(seed=0), args.iterations, target))
+        load, replay = timed(lambda: ReplayInterpreter(path))
+        seek, _ = timed(lambda: replay.seek(target))
+        print(f'step {target}: rerun {rerun:.3f}s, '
+              f'journal load {load:.3f}s, seek {seek:.3f}s')
@@ -0,0 +1,57 @@
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+
+CORRIDORS = {
+    'spaces': ' ',
+    'arrows': '{}',
+    'mixed': '   {}',
+}
+
+
+def corridor(pattern, arrow, length):
+    return (pattern.format(arrow) * length)[:length]
+
+
+def layout(pattern, width, height):
+    lines = ['&>' + corridor(pattern, '>', width - 3) + 'v']
+    for y in range(height - 3):
+        line = [' '] * width
+        line[1] = corridor(pattern, '^', height - 3)[y]
+        line[-1] = corridor(pattern, 'v', height - 3)[y]
+        lines.append(''.join(line))
+    lines.append(' |' + corridor(pattern, '<', width - 6) + ':-1<')
+    lines.append(' @')
+    return lines
+
+
+def step_by_step(playfield):
+    successors = playfield.successors()
+    return successors, [1] * len(successors)
+
+
+def measure(lines, iterations, skips):
+    interpreter = Interpreter()
+    interpreter.program = lines
+    interpreter.input_data.feed(str(iterations))
+    if not skips:
+        playfield = interpreter.playfield
+        playfield.skips = lambda: step_by_step(playfield)
+    start = time.perf_counter()
+    interpreter.run()
+    return time.perf_counter() - start, interpreter.steps
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--iterations', type=int, default=10000)
+    argparser.add_argument('--width', type=int, default=80)
+    argparser.add_argument('--height', type=int, default=25)
+    args = argparser.parse_args()
+
+    for name, pattern in CORRIDORS.items():
+        lines = layout(pattern, args.width, args.height)
+        plain, steps = measure(lines, args.iterations, False)
+        skipped, _ = measure(lines, args.iterations, True)
+        print(f'{name}: {steps} steps, step by step {plain:.3f}s, '
+              f'run-length {skipped:.3f}s ({plain / skipped:.1f}x)')
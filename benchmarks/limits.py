@@ -0,0 +1,40 @@
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from limits import Limits
+
+COUNTDOWN = ['&>1-:v',
+             ' ^   _@']
+VARIANTS = (
+    ('no limits', None),
+    ('stack depth', lambda: Limits(stack_depth=1000)),
+    ('integer bits', lambda: Limits(integer_bits=64)),
+    ('wrap to 32 bits', lambda: Limits(wrap=True)),
+    ('output size', lambda: Limits(output_size=1000)),
+    ('all limits', lambda: Limits(1000, 64, 1000)),
+)
+
+
+def measure(limits, iterations):
+    interpreter = Interpreter()
+    interpreter.limits = limits
+    interpreter.program = COUNTDOWN
+    interpreter.input_data.feed(str(iterations))
+    start = time.perf_counter()
+    interpreter.run()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--iterations', type=int, default=200000)
+    argparser.add_argument('-r', '--repeat', type=int, default=3)
+    args = argparser.parse_args()
+
+    baseline = None
+    for name, factory in VARIANTS:
+        elapsed = min(measure(factory and factory(), args.iterations)
+                      for _ in range(args.repeat))
+        if baseline is None:
+            baseline = elapsed
+        print(f'{name}: {elapsed:.3f}s ({elapsed / baseline - 1:+.1%})')
@@ -0,0 +1,46 @@
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from lockstep import LockstepRunner
+
+PROGRAMS = {
+    'countdown': ['&>:.1-:v', ' ^     _@'],
+    'digits': ['&>:55+%.55+/:v', ' ^' + ' ' * 11 + '_@'],
+    'factorial': ['&>:1-:v v *_$.@', ' ^    _$>\\:^'],
+}
+
+
+def run_scalar(lines, inputs):
+    outputs = []
+    for data in inputs:
+        interpreter = Interpreter()
+        interpreter.program = lines
+        interpreter.input_data.feed(data)
+        interpreter.run()
+        outputs.append(interpreter.output.getvalue())
+    return outputs
+
+
+def run_lockstep(lines, inputs):
+    return [result['output']
+            for result in LockstepRunner(lines).run(inputs)]
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--instances', type=int, default=1000)
+    argparser.add_argument('--spread', type=int, default=10,
+                           help="number of distinct inputs")
+    args = argparser.parse_args()
+
+    inputs = [str(20 + i % args.spread) for i in range(args.instances)]
+    for name, lines in PROGRAMS.items():
+        start = time.perf_counter()
+        scalar = run_scalar(lines, inputs)
+        middle = time.perf_counter()
+        lockstep = run_lockstep(lines, inputs)
+        end = time.perf_counter()
+        assert scalar == lockstep
+        print(f'{name}: {args.instances} instances, scalar '
+              f'{middle - start:.3f}s, lockstep {end - middle:.3f}s '
+              f'({(middle - start) / (end - middle):.2f}x)')
@@ -0,0 +1,55 @@
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter, Direction
+
+
+def chain_move_pointer(interpreter, x, y, width, height):
+    if interpreter.direction == Direction.RIGHT:
+        x = x + 1 if x != width - 1 else 0
+    elif interpreter.direction == Direction.LEFT:
+        x = x - 1 if x != 0 else width - 1
+    elif interpreter.direction == Direction.UP:
+        y = y - 1 if y != 0 else height - 1
+    else:
+        y = y + 1 if y != height - 1 else 0
+    return x, y
+
+
+def measure_chain(interpreter, moves):
+    width = interpreter.playfield.width
+    height = interpreter.playfield.height
+    x = y = 0
+    start = time.perf_counter()
+    for _ in range(moves):
+        x, y = chain_move_pointer(interpreter, x, y, width, height)
+    return time.perf_counter() - start
+
+
+def measure_table(interpreter, moves):
+    move_pointer = interpreter.move_pointer
+    start = time.perf_counter()
+    for _ in range(moves):
+        move_pointer()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--moves', type=int, default=1000000)
+    args = argparser.parse_args()
+
+    grids = (('wide', 4000, 1, Direction.RIGHT),
+             ('tall', 1, 4000, Direction.DOWN),
+             ('square', 80, 25, Direction.LEFT))
+    for name, width, height, direction in grids:
+        interpreter = Interpreter(width, height)
+        interpreter.program = []
+        interpreter.direction = direction
+        start = time.perf_counter()
+        interpreter.playfield.successors()
+        build = time.perf_counter() - start
+        chain = measure_chain(interpreter, args.moves)
+        table = measure_table(interpreter, args.moves)
+        print(f'{name} {width}x{height}: chain {chain:.3f}s, '
+              f'table {table:.3f}s ({chain / table:.2f}x), '
+              f'table build {build * 1000:.1f}ms')
@@ -0,0 +1,36 @@
+import random
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter, Direction, DIRECTIONS
+
+
+def measure(function, draws):
+    start = time.perf_counter()
+    for _ in range(draws):
+        function()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--draws', type=int, default=1000000)
+    args = argparser.parse_args()
+
+    generator = random.Random(0)
+    interpreter = Interpreter(seed=0)
+    interpreter.program = ['?']
+    variants = (
+        ('choice(list(Direction))',
+         lambda: random.choice(list(Direction))),
+        ('choice(DIRECTIONS)', lambda: generator.choice(DIRECTIONS)),
+        ('DIRECTIONS[randrange(4)]',
+         lambda: DIRECTIONS[generator.randrange(4)]),
+        ('random_direction (bit pool)', interpreter.random_direction),
+    )
+    baseline = None
+    for name, function in variants:
+        elapsed = measure(function, args.draws)
+        baseline = baseline or elapsed
+        print(f'{name}: {elapsed:.3f}s, '
+              f'{args.draws / elapsed / 1e6:.2f}M/s '
+              f'({baseline / elapsed:.2f}x)')
@@ -0,0 +1,61 @@
+import asyncio
+import statistics
+import time
+from argparse import ArgumentParser
+from server import serve
+
+SUM = ['0>&:#v_$.@',
+       ' ^  +<']
+
+
+async def client(port, numbers):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for n in numbers:
+        writer.write(f'{n}\n'.encode())
+    writer.write(b'0\n')
+    await writer.drain()
+    writer.write_eof()
+    output = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return time.perf_counter() - start, output
+
+
+async def load_test(sessions, concurrency, numbers, slice_steps):
+    server = await serve(SUM, '127.0.0.1', 0, slice_steps)
+    port = server.sockets[0].getsockname()[1]
+    semaphore = asyncio.Semaphore(concurrency)
+    expected = f'{sum(numbers)} '.encode()
+
+    async def limited():
+        async with semaphore:
+            return await client(port, numbers)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(limited() for _ in range(sessions)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+
+    latencies = sorted(latency for latency, _ in results)
+    failures = sum(output != expected for _, output in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f'{sessions} sessions, {concurrency} concurrent: '
+          f'{sessions / elapsed:.0f} sessions/s, failures {failures}')
+    print(f'latency p50 {quantiles[49] * 1000:.2f}ms, '
+          f'p95 {quantiles[94] * 1000:.2f}ms, '
+          f'p99 {quantiles[98] * 1000:.2f}ms, '
+          f'max {latencies[-1] * 1000:.2f}ms')
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--sessions', type=int, default=2000)
+    argparser.add_argument('-c', '--concurrency', type=int, default=200)
+    argparser.add_argument('--numbers', type=int, default=100,
+                           help="numbers each client sends")
+    argparser.add_argument('--slice', type=int, default=1000)
+    args = argparser.parse_args()
+    asyncio.run(load_test(args.sessions, args.concurrency,
+                          list(range(1, args.numbers + 1)), args.slice))
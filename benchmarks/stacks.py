@@ -0,0 +1,104 @@
+import gc
+import sys
+import time
+import tracemalloc
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from stack import Stack, CompactStack
+
+
+class ListStack:
+    def __init__(self):
+        self.stack = []
+
+    def pop(self):
+        if self.stack:
+            return self.stack.pop()
+        return 0
+
+    def append(self, n):
+        self.stack.append(n)
+
+
+def separate_pops(stack):
+    y, x = stack.pop(), stack.pop()
+    stack.append(x + y)
+
+
+def paired_pop(stack):
+    x, y = stack.pop2()
+    stack.append(x + y)
+
+
+def measure_operations(stack, operation, operations):
+    for value in range(1000, 1100):
+        stack.append(value)
+    start = time.perf_counter()
+    for _ in range(operations):
+        stack.append(1)
+        operation(stack)
+    return time.perf_counter() - start
+
+
+def measure_interpreter(stack, operations):
+    interpreter = Interpreter(stack=stack)
+    interpreter.program = ['11+$']
+    interpreter.compile()
+    start = time.perf_counter()
+    interpreter.execute(operations * 4)
+    return time.perf_counter() - start
+
+
+def measure_memory(stack, values):
+    tracemalloc.start()
+    try:
+        for value in range(1000, 1000 + values):
+            stack.append(value)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_allocations(stack, operations):
+    gc.collect()
+    gc.disable()
+    tracemalloc.start()
+    try:
+        blocks = sys.getallocatedblocks()
+        memory = tracemalloc.get_traced_memory()[0]
+        for _ in range(operations):
+            stack.append(1000)
+            stack.append(1)
+            paired_pop(stack)
+        return (sys.getallocatedblocks() - blocks,
+                tracemalloc.get_traced_memory()[0] - memory)
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--operations', type=int, default=1000000)
+    argparser.add_argument('--values', type=int, default=100000)
+    args = argparser.parse_args()
+
+    for name, stack_class, operation in (
+            ('list, two pops', ListStack, separate_pops),
+            ('Stack.pop2', Stack, paired_pop),
+            ('CompactStack.pop2', CompactStack, paired_pop)):
+        elapsed = measure_operations(stack_class(), operation,
+                                     args.operations)
+        print(f'{name:18} {elapsed / args.operations * 1e9:7.1f} ns/op')
+    for stack_class in (Stack, CompactStack):
+        elapsed = measure_interpreter(stack_class(), args.operations)
+        print(f'{stack_class.__name__:18} '
+              f'{elapsed / args.operations * 1e9:7.1f} ns per 11+$ loop')
+    for stack_class in (Stack, CompactStack):
+        memory = measure_memory(stack_class(), args.values)
+        print(f'{stack_class.__name__:18} {memory / args.values:7.1f} '
+              f'bytes per value on the stack')
+    for stack_class in (Stack, CompactStack):
+        blocks, memory = measure_allocations(stack_class(), args.values)
+        print(f'{stack_class.__name__:18} {blocks / args.values:7.2f} '
+              f'blocks and {memory / args.values:.1f} bytes kept per +')
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROGRAM = '"!ih",,,@'
+BUDGET = 62.0
+COMMANDS = {
+    'import interpreter': ['-c', 'import interpreter'],
+    'main.py': ['main.py', '{program}', '-o', '-'],
+    'main.py --cache': ['main.py', '{program}', '-o', '-', '--cache',
+                        '{cache}'],
+    'main.py --jit': ['main.py', '{program}', '-o', '-', '--jit'],
+}
+
+
+def parse_importtime(stderr):
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name[1:].startswith(' '):
+            imports.append((name.strip(), int(cumulative)))
+    return imports
+
+
+def measure(arguments, repeat):
+    best = None
+    imports = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        process = subprocess.run([sys.executable, '-X', 'importtime']
+                                 + arguments, cwd=ROOT, capture_output=True,
+                                 text=True, check=True)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+            imports = parse_importtime(process.stderr)
+    return best, imports
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--repeat', type=int, default=10)
+    argparser.add_argument('--top', type=int, default=5,
+                           help="number of slowest top-level imports to show")
+    argparser.add_argument('--budget', type=float, default=BUDGET,
+                           help="exit with code 1 if plain main.py takes "
+                                "longer than this number of milliseconds "
+                                "(default: %(default)s, the startup time of "
+                                "the original interpreter)")
+    args = argparser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        program = os.path.join(directory, 'hi.bf')
+        with open(program, 'w') as f:
+            f.write(PROGRAM)
+        cache = os.path.join(directory, 'results.sqlite')
+        results = {}
+        for name, arguments in COMMANDS.items():
+            elapsed, imports = measure(
+                [argument.format(program=program, cache=cache)
+                 for argument in arguments],
+                args.repeat)
+            results[name] = elapsed
+            total = sum(cumulative for _, cumulative in imports)
+            print(f'{name}: {elapsed * 1000:.1f} ms, '
+                  f'imports {total / 1000:.1f} ms')
+            slowest = sorted(imports, key=lambda item: item[1], reverse=True)
+            for module, cumulative in slowest[:args.top]:
+                print(f'  {module} {cumulative / 1000:.1f} ms')
+    if results['main.py'] * 1000 > args.budget:
+        print(f'main.py exceeds the budget of {args.budget:.1f} ms')
+        sys.exit(1)
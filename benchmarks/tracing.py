@@ -0,0 +1,37 @@
+import os
+import tempfile
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from jit import JitInterpreter
+from benchmarks.dispatch import COUNTDOWN, reference_run, prepare, measure
+
+FACTORIAL = ['vv    <>v *<',
+             '&>:1-:|$>\\:|',
+             '>^    >^@.$<']
+
+
+def best_of(repeat, loop, interpreter_class, program, argument):
+    return min(measure(loop, prepare(interpreter_class, program, argument))
+               for _ in range(repeat))
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--iterations', type=int, default=100000)
+    argparser.add_argument('-r', '--repeat', type=int, default=5,
+                           help="time each engine this many times and keep "
+                                "the best run")
+    args = argparser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    for name, program, argument in (('countdown', COUNTDOWN, args.iterations),
+                                    ('factorial', FACTORIAL, 1000)):
+        reference = best_of(args.repeat, reference_run, Interpreter, program,
+                            argument)
+        compiled = best_of(args.repeat, Interpreter.run, Interpreter, program,
+                           argument)
+        traced = best_of(args.repeat, JitInterpreter.run, JitInterpreter,
+                         program, argument)
+        print(f'{name}: reference {reference:.3f}s, '
+              f'compiled {compiled:.3f}s ({reference / compiled:.2f}x), '
+              f'jit {traced:.3f}s ({reference / traced:.2f}x)')
@@ -0,0 +1,64 @@
+import io
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+from interpreter import Interpreter
+from playfield import Playfield
+from sinks import MemorySink
+from transpiler import transpile, load
+from exceptions import CompileError
+from benchmarks.corpus import WORKLOADS
+
+
+def interpreted(workload):
+    interpreter = Interpreter()
+    interpreter.program = workload.lines
+    interpreter.input_data.feed(workload.input_data)
+    start = time.perf_counter()
+    interpreter.run()
+    return time.perf_counter() - start
+
+
+def compiled(namespace, workload):
+    stream = io.BytesIO(workload.input_data.encode())
+    start = time.perf_counter()
+    namespace['run'](MemorySink().append, stream)
+    return time.perf_counter() - start
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def best(function, repeat):
+    return min(function() for _ in range(repeat))
+
+
+if __name__ == '__main__':
+    argparser = ArgumentParser()
+    argparser.add_argument('-n', '--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    for workload in WORKLOADS:
+        try:
+            transpile(Playfield.from_lines(workload.lines))
+        except CompileError:
+            print(f'{workload.name}: modifies its own code, not compiled')
+            continue
+        program_file = os.path.join(directory, f'{workload.name}.bf')
+        with open(program_file, 'w') as f:
+            f.write('\n'.join(workload.lines))
+        cold = best(lambda: timed(load, program_file, use_cache=False),
+                    args.repeat)
+        load(program_file)
+        warm = best(lambda: timed(load, program_file), args.repeat)
+        namespace = load(program_file)
+        reference = best(lambda: interpreted(workload), args.repeat)
+        native = best(lambda: compiled(namespace, workload), args.repeat)
+        print(f'{workload.name}: interpreter {reference:.4f}s, '
+              f'compiled {native:.4f}s ({reference / native:.2f}x), '
+              f'compile {cold * 1000:.1f} ms, cached {warm * 1000:.2f} ms')
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import sqlite3
+from interpreter import Status, is_pure
+from sinks import Sink
+
+FORMAT_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def default_path():
+    root = os.environ.get('XDG_CACHE_HOME',
+                          os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(root, 'befunge', 'results.sqlite')
+
+
+def cache_key(interpreter):
+    playfield = interpreter.playfield
+    digest = hashlib.sha256()
+    digest.update(json.dumps([FORMAT_VERSION, playfield.width,
+                              playfield.height, interpreter.position,
+                              int(interpreter.direction),
+                              interpreter.quote_mode,
+                              list(interpreter.stack),
+                              ''.join(interpreter.commands)]).encode())
+    digest.update(playfield.cells.tobytes())
+    digest.update(interpreter.input_data.data[interpreter.input_data.cursor:])
+    return digest.hexdigest()
+
+
+class TeeSink(Sink):
+    def __init__(self, sink, max_size):
+        super().__init__(sink.buffer_size, sink.flush_every)
+        self.sink = sink
+        self.chunks = []
+        self.size = 0
+        self.max_size = max_size
+
+    def write(self, text):
+        if self.chunks is not None:
+            self.size += len(text)
+            if self.size > self.max_size:
+                self.chunks = None
+            else:
+                self.chunks.append(text)
+        self.sink.append(text)
+
+    def getvalue(self):
+        self.flush()
+        if self.chunks is None:
+            return None
+        return "".join(self.chunks)
+
+
+class ResultCache:
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path if path is not None else default_path()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                        exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '
+            'output TEXT, state TEXT, size INTEGER, used INTEGER)')
+        self.connection.execute(
+            'CREATE INDEX IF NOT EXISTS results_used ON results (used)')
+
+    def get(self, key):
+        row = self.connection.execute(
+            'SELECT output, state FROM results WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute(
+                'UPDATE results SET used = ? WHERE key = ?',
+                (self.tick(), key))
+        return row[0], json.loads(row[1])
+
+    def put(self, key, output, state):
+        state = json.dumps(state)
+        size = len(output.encode()) + len(state)
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                (key, output, state, size, self.tick()))
+            self.evict()
+
+    def tick(self):
+        return self.connection.execute(
+            'SELECT COALESCE(MAX(used), 0) + 1 FROM results').fetchone()[0]
+
+    def evict(self):
+        total = 0
+        stale = []
+        for key, size in self.connection.execute(
+                'SELECT key, size FROM results ORDER BY used DESC'):
+            total += size
+            if total > self.max_bytes:
+                stale.append((key,))
+        self.connection.executemany('DELETE FROM results WHERE key = ?',
+                                    stale)
+
+    def size(self):
+        return self.connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def run(self, interpreter, max_steps=None, timeout=None):
+        if interpreter.halted or not is_pure(interpreter.playfield):
+            return interpreter.run(max_steps, timeout)
+        key = cache_key(interpreter)
+        cached = self.get(key)
+        if cached is not None:
+            output, state = cached
+            if max_steps is None or state['steps'] <= max_steps:
+                self.hits += 1
+                interpreter.restore(dict(state, steps=interpreter.steps
+                                         + state['steps']))
+                interpreter.output.append(output)
+                interpreter.output.flush()
+                return Status.HALTED
+        self.misses += 1
+        sink = interpreter.output
+        interpreter.output = TeeSink(sink, self.max_bytes)
+        steps = interpreter.steps
+        interpreter.impure = False
+        try:
+            status = interpreter.run(max_steps, timeout)
+        finally:
+            output = interpreter.output.getvalue()
+            interpreter.output = sink
+        if status == Status.HALTED and not interpreter.impure \
+                and output is not None:
+            state = interpreter.snapshot()
+            state['steps'] -= steps
+            state.pop('random', None)
+            self.put(key, output, state)
+        return status
@@ -0,0 +1,201 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from interpreter import Direction
+from playfield import Playfield
+from exceptions import CheckpointError
+
+MAGIC = b'BFST'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHBBIIQQQQQQQQd')
+BIGINT = struct.Struct('<QI')
+QUOTE_MODE = 1
+HALTED = 2
+GAUSS = 4
+NARROW = 8
+RANDOM = 16
+RANDOM_STATE_LENGTH = 625
+ALIGNMENT = 8
+LITTLE_ENDIAN = sys.byteorder == 'little'
+NATIVE_CELLS = array('l').itemsize == 8
+NOT_A_CHECKPOINT = "Файл {} не является сохранённым состоянием интерпретатора."
+NOT_SUPPORTED = "Сохранение состояния поддерживается только для обычного поля."
+
+
+def padding(size):
+    return bytes(-size % ALIGNMENT)
+
+
+def little_endian(values):
+    if not LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def from_little_endian(values, data):
+    values.frombytes(data)
+    if not LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def pack_cells(cells, mappable):
+    if not isinstance(cells, array) or cells.itemsize != 8:
+        cells = array('q', cells)
+    wide = little_endian(cells)
+    if mappable:
+        return wide, False
+    high = bytearray(wide)
+    del high[::8]
+    if high.count(0) != len(high):
+        return wide, False
+    return wide[::8], True
+
+
+def unpack_cells(data, count, narrow):
+    if narrow:
+        wide = bytearray(8 * count)
+        wide[::8] = data
+        data = wide
+    if NATIVE_CELLS:
+        return from_little_endian(array('l'), data)
+    return array('l', from_little_endian(array('q'), data))
+
+
+def pack_stack(values):
+    try:
+        return array('q', values), []
+    except OverflowError:
+        packed = array('q')
+        bigints = []
+        for i, value in enumerate(values):
+            if -2 ** 63 <= value < 2 ** 63:
+                packed.append(value)
+            else:
+                packed.append(0)
+                bigints.append((i, value))
+        return packed, bigints
+
+
+def save(interpreter, path, mappable=False):
+    playfield = interpreter.playfield
+    if not isinstance(playfield, Playfield):
+        raise CheckpointError(NOT_SUPPORTED)
+    interpreter.output.flush()
+    stack, bigints = pack_stack(interpreter.stack.stack)
+    data = interpreter.input_data.data[interpreter.input_data.cursor:]
+    cells, narrow = pack_cells(playfield.cells, mappable)
+    flags = QUOTE_MODE * interpreter.quote_mode + HALTED * interpreter.halted \
+        + NARROW * narrow
+    internal = None
+    gauss = 0.0
+    if interpreter.random is not None:
+        flags |= RANDOM
+        version, internal, random_gauss = interpreter.random.getstate()
+        if random_gauss is not None:
+            flags |= GAUSS
+            gauss = random_gauss
+    chunks = [HEADER.pack(MAGIC, FORMAT_VERSION, flags,
+                          interpreter.direction, playfield.width,
+                          playfield.height, interpreter.position,
+                          interpreter.steps, len(stack), len(bigints),
+                          len(data), interpreter.input_data.offset,
+                          interpreter.random_bits, interpreter.random_count,
+                          gauss)]
+    chunks.append(cells)
+    chunks.append(padding(len(cells)))
+    chunks.append(little_endian(stack))
+    for i, value in bigints:
+        encoded = value.to_bytes((value.bit_length() + 8) // 8, 'little',
+                                 signed=True)
+        chunks.append(BIGINT.pack(i, len(encoded)) + encoded)
+    chunks.append(data)
+    if internal is not None:
+        chunks.append(padding(sum(map(len, chunks))))
+        chunks.append(little_endian(array('I', internal)))
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.writelines(chunks)
+    os.replace(temporary, path)
+
+
+def load(interpreter, path, use_mmap=False):
+    with open(path, 'rb') as f:
+        if use_mmap:
+            data = memoryview(mmap.mmap(f.fileno(), 0,
+                                        access=mmap.ACCESS_COPY))
+        else:
+            data = memoryview(f.read())
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise CheckpointError(NOT_A_CHECKPOINT.format(path))
+    magic, version, flags, direction, width, height, position, steps, \
+        stack_size, bigint_count, input_size, input_offset, random_bits, \
+        random_count, gauss = HEADER.unpack_from(data)
+    if version != FORMAT_VERSION:
+        raise CheckpointError(NOT_A_CHECKPOINT.format(path))
+    offset = HEADER.size
+    narrow = bool(flags & NARROW)
+    end = offset + (1 if narrow else 8) * width * height
+    if use_mmap and not narrow and LITTLE_ENDIAN and NATIVE_CELLS:
+        cells = data[offset:end].cast('l')
+    else:
+        cells = unpack_cells(data[offset:end], width * height, narrow)
+    end += -end % ALIGNMENT
+    offset, end = end, end + 8 * stack_size
+    stack = from_little_endian(array('q'), data[offset:end])
+    offset = end
+    if bigint_count:
+        stack = stack.tolist()
+        for _ in range(bigint_count):
+            i, size = BIGINT.unpack_from(data, offset)
+            offset += BIGINT.size
+            stack[i] = int.from_bytes(data[offset:offset + size], 'little',
+                                      signed=True)
+            offset += size
+    input_data = bytes(data[offset:offset + input_size])
+    offset += input_size
+    if flags & RANDOM:
+        offset += -offset % ALIGNMENT
+        internal = from_little_endian(
+            array('I'), data[offset:offset + 4 * RANDOM_STATE_LENGTH])
+        interpreter.generator().setstate(
+            (3, tuple(internal), gauss if flags & GAUSS else None))
+    else:
+        interpreter.random = None
+    interpreter.random_bits = random_bits
+    interpreter.random_count = random_count
+
+    interpreter.playfield = Playfield(0, 0)
+    interpreter.playfield.width = width
+    interpreter.playfield.height = height
+    interpreter.playfield.cells = cells
+    interpreter.code = None
+    interpreter.position = position
+    interpreter.direction = Direction(direction)
+    interpreter.quote_mode = bool(flags & QUOTE_MODE)
+    interpreter.stack.load(stack)
+    interpreter.steps = steps
+    interpreter.halted = bool(flags & HALTED)
+    interpreter.impure = False
+    interpreter.input_data.data = input_data
+    interpreter.input_data.cursor = 0
+    stream = interpreter.input_data.stream
+    if stream is not None and stream.seekable():
+        stream.seek(input_offset)
+    interpreter.input_data.offset = input_offset
+
+
+class Checkpointer:
+    def __init__(self, path, every, steps=0, mappable=False):
+        self.path = path
+        self.every = every
+        self.last = steps
+        self.mappable = mappable
+
+    def update(self, interpreter):
+        if interpreter.steps - self.last >= self.every:
+            save(interpreter, self.path, self.mappable)
+            self.last = interpreter.steps
@@ -0,0 +1,241 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from interpreter import Interpreter, Direction, Status, OPCODES, UNKNOWN
+from exceptions import ReadError, Halt, ResourceLimitError
+
+SPLIT = UNKNOWN + 1
+SHARED_SYMBOLS = 'p&~'
+SHARED = {ord(symbol) for symbol in SHARED_SYMBOLS}
+
+
+class InstructionPointer:
+    def __init__(self, number, position, direction, stack, quote_mode=False):
+        self.number = number
+        self.position = position
+        self.direction = direction
+        self.stack = stack
+        self.quote_mode = quote_mode
+
+
+class ConcurrentInterpreter(Interpreter):
+    opcodes = {**OPCODES, ord('t'): SPLIT}
+    commands = {**Interpreter.commands, 't': ('split',)}
+
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.ips = []
+        self.current = 0
+        self.created = 0
+        self.spawned = None
+
+    @Interpreter.program.setter
+    def program(self, lines):
+        Interpreter.program.fset(self, lines)
+        self.ips = []
+
+    def pointer(self):
+        ip = InstructionPointer(self.created, self.position, self.direction,
+                                self.stack.stack, self.quote_mode)
+        self.created += 1
+        return ip
+
+    def load(self, ip):
+        self.position = ip.position
+        self.direction = ip.direction
+        self.stack.stack = ip.stack
+        self.quote_mode = ip.quote_mode
+
+    def save(self, ip):
+        ip.position = self.position
+        ip.direction = self.direction
+        ip.stack = self.stack.stack
+        ip.quote_mode = self.quote_mode
+
+    def split(self):
+        direction = Direction((self.direction + 2) % 4)
+        child = InstructionPointer(
+            self.created,
+            self.playfield.successors()[self.position * 4 + direction],
+            direction, self.stack.stack[:])
+        self.created += 1
+        if self.spawned is not None:
+            self.spawned.append((self.output.written + self.output.buffered,
+                                 child))
+        else:
+            self.ips.insert(self.current, child)
+            self.current += 1
+
+    def execute(self, steps):
+        if not self.ips:
+            self.ips = [self.pointer()]
+            self.current = 0
+        ips = self.ips
+        code = self.code
+        successors = self.playfield.successors()
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        tick = 0
+        try:
+            while tick < steps:
+                ip = ips[self.current]
+                try:
+                    if self.quote_mode:
+                        quote_handlers[code[self.position]]()
+                    else:
+                        handlers[code[self.position]]()
+                except Halt:
+                    tick += 1
+                    del ips[self.current]
+                    if not ips:
+                        raise
+                    if self.current >= len(ips):
+                        self.current = 0
+                    self.load(ips[self.current])
+                    continue
+                self.position = successors[self.position * 4
+                                           + self.direction]
+                tick += 1
+                if len(ips) > 1:
+                    self.save(ip)
+                    self.current += 1
+                    if self.current >= len(ips):
+                        self.current = 0
+                    self.load(ips[self.current])
+        except (Halt, ReadError, ResourceLimitError):
+            self.steps += tick
+            raise
+        self.steps += tick
+
+    def snapshot(self):
+        if self.ips:
+            self.save(self.ips[self.current])
+        state = super().snapshot()
+        state['ips'] = [[ip.number, ip.position, int(ip.direction),
+                         ip.quote_mode, list(ip.stack)] for ip in self.ips]
+        state['current'] = self.current
+        return state
+
+    def restore(self, state):
+        super().restore(state)
+        self.ips = [InstructionPointer(number, position, Direction(direction),
+                                       stack, quote_mode)
+                    for number, position, direction, quote_mode, stack
+                    in state.get('ips', [])]
+        self.current = state.get('current', 0)
+        self.created = max((ip.number + 1 for ip in self.ips), default=0)
+        if self.ips:
+            self.load(self.ips[self.current])
+
+
+class Task:
+    def __init__(self, state, path=()):
+        self.state = state
+        self.path = path
+        self.budget = None
+        self.status = None
+        self.output = ''
+        self.steps = 0
+        self.children = []
+
+    def merged_output(self):
+        parts = []
+        start = 0
+        for offset, child in self.children:
+            parts += [self.output[start:offset], child.merged_output()]
+            start = offset
+        parts.append(self.output[start:])
+        return ''.join(parts)
+
+    def tasks(self):
+        yield self
+        for _, child in self.children:
+            yield from child.tasks()
+
+
+def is_independent(playfield):
+    return SHARED.isdisjoint(playfield.cells)
+
+
+def pointer_seed(seed, path):
+    if seed is None or not path:
+        return seed
+    return hash((seed, path))
+
+
+def run_pointer(lines, width, height, seed, state, max_steps, deadline):
+    timeout = None if deadline is None \
+        else max(deadline - time.monotonic(), 0)
+    interpreter = ConcurrentInterpreter(width, height, seed=seed)
+    interpreter.program = lines
+    interpreter.position, interpreter.direction, stack = state
+    interpreter.stack.load(stack)
+    interpreter.spawned = []
+    status = interpreter.run(max_steps, timeout)
+    return (status, interpreter.output.getvalue(), interpreter.steps,
+            [(offset, (child.position, child.direction, child.stack))
+             for offset, child in interpreter.spawned])
+
+
+def run_parallel(interpreter, workers=None, max_steps=None, timeout=None):
+    if not is_independent(interpreter.playfield):
+        return interpreter.run(max_steps, timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    lines = [''.join(row) for row in interpreter.program]
+    root = Task((interpreter.position, interpreter.direction,
+                 list(interpreter.stack)))
+    root.budget = max_steps
+    with ProcessPoolExecutor(workers) as executor:
+        def remaining_time():
+            if deadline is None:
+                return None
+            return max(deadline - time.monotonic(), 0)
+
+        def submit(task):
+            if task.budget == 0:
+                task.status = Status.BUDGET_EXHAUSTED
+            elif remaining_time() == 0:
+                task.status = Status.TIMED_OUT
+            else:
+                pending[executor.submit(
+                    run_pointer, lines, interpreter.width,
+                    interpreter.height,
+                    pointer_seed(interpreter.seed, task.path), task.state,
+                    task.budget, deadline)] = task
+
+        pending = {}
+        submit(root)
+        while pending:
+            done, _ = wait(pending, remaining_time(),
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                for future in list(pending):
+                    if future.cancel():
+                        pending.pop(future).status = Status.TIMED_OUT
+                done, _ = wait(pending)
+            for future in done:
+                task = pending.pop(future)
+                task.status, task.output, task.steps, spawned = \
+                    future.result()
+                budget = None
+                if task.budget is not None:
+                    budget = task.budget - task.steps
+                for i, (offset, state) in enumerate(spawned):
+                    child = Task(state, task.path + (len(task.children),))
+                    if budget is not None:
+                        child.budget = budget // (len(spawned) - i)
+                        budget -= child.budget
+                    task.children.append((offset, child))
+                    submit(child)
+    tasks = list(root.tasks())
+    interpreter.output.append(root.merged_output())
+    interpreter.output.flush()
+    interpreter.steps += sum(task.steps for task in tasks)
+    statuses = {task.status for task in tasks}
+    if statuses == {Status.HALTED}:
+        interpreter.halted = True
+        interpreter.ips = []
+        return Status.HALTED
+    if Status.TIMED_OUT in statuses:
+        return Status.TIMED_OUT
+    return Status.BUDGET_EXHAUSTED
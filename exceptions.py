@@ -1,2 +1,29 @@
 class ReadError(Exception):
     pass
+
+
+class PlayfieldSizeError(Exception):
+    pass
+
+
+class Halt(Exception):
+    pass
+
+
+class CheckpointError(Exception):
+    pass
+
+
+class CompileError(Exception):
+    pass
+
+
+class ResourceLimitError(Exception):
+    def __init__(self, message, resource=None, limit=None):
+        super().__init__(message)
+        self.resource = resource
+        self.limit = limit
+
+
+class JournalError(Exception):
+    pass
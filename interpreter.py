@@ -1,63 +1,128 @@
-import random
-from enum import Enum
-from queue import Queue
+import sys
+import time
+from array import array
+from enum import Enum, IntEnum
+from functools import partial
 from stack import Stack
-from exceptions import ReadError
+from playfield import Playfield, to_symbol
+from sinks import MemorySink
+from sources import InputBuffer
+from exceptions import ReadError, Halt, ResourceLimitError
 
 
-class Direction(Enum):
-    RIGHT = 0,
-    DOWN = 1,
-    LEFT = 2,
+class Direction(IntEnum):
+    RIGHT = 0
+    DOWN = 1
+    LEFT = 2
     UP = 3
 
 
+class Status(Enum):
+    HALTED = 'halted'
+    NEEDS_INPUT = 'needs-input'
+    BUDGET_EXHAUSTED = 'budget-exhausted'
+    TIMED_OUT = 'timeout'
+    LIMIT_EXCEEDED = 'limit-exceeded'
+
+
+COMMAND_SYMBOLS = '><^v "@_|?:\\$#pg+-*/%!`&~.,'
+OPCODES = {ord(str(digit)): digit for digit in range(10)}
+OPCODES.update({ord(symbol): 10 + i
+                for i, symbol in enumerate(COMMAND_SYMBOLS)})
+UNKNOWN = 10 + len(COMMAND_SYMBOLS)
+QUOTE = OPCODES[ord('"')]
+DIRECTIONS = tuple(Direction)
+RANDOM_BATCH = 32
+IMPURE_SYMBOLS = '?&~'
+IMPURE = {ord(symbol) for symbol in IMPURE_SYMBOLS}
+IMPURE_OPCODES = {OPCODES[value] for value in IMPURE}
+CHECK_INTERVAL = 10000
+
+
+def is_pure(playfield):
+    return IMPURE.isdisjoint(playfield.cells)
+
+
 class Interpreter:
-    def __init__(self):
-        self.program = []
-        self.input_data = Queue()
+    playfield_class = Playfield
+    opcodes = OPCODES
+    commands = {
+        '>': ('change_direction', Direction.RIGHT),
+        '<': ('change_direction', Direction.LEFT),
+        '^': ('change_direction', Direction.UP),
+        'v': ('change_direction', Direction.DOWN),
+        ' ': ('nothing',),
+        '"': ('change_mode',),
+        '@': ('exit',),
+        '_': ('check_horizontal_direction',),
+        '|': ('check_vertical_direction',),
+        '?': ('random_direction',),
+        ':': ('copy_stack_top',),
+        '\\': ('swap',),
+        '$': ('drop',),
+        '#': ('skip_cell',),
+        'p': ('put',),
+        'g': ('get',),
+        '+': ('add',),
+        '-': ('sub',),
+        '*': ('mul',),
+        '/': ('div',),
+        '%': ('mod',),
+        '!': ('invert',),
+        '`': ('greater',),
+        '&': ('input_number',),
+        '~': ('input_char',),
+        '.': ('print_number',),
+        ',': ('print_char',)
+    }
+
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        self.width = width
+        self.height = height
+        self.playfield = self.playfield_class(0, 0)
+        self.input_data = InputBuffer()
         self.quote_mode = False
 
-        self.xpos = 0
-        self.ypos = 0
+        self.position = 0
+        self.steps = 0
+        self.halted = False
+        self.impure = False
 
         self.direction = Direction.RIGHT
-        self.stack = Stack()
-        self.output = []
-
-        self.commands = {
-            '>': (self.change_direction, Direction.RIGHT),
-            '<': (self.change_direction, Direction.LEFT),
-            '^': (self.change_direction, Direction.UP),
-            'v': (self.change_direction, Direction.DOWN),
-            ' ': (lambda x: x, 1),
-            '"': (self.change_mode,),
-            '@': (self.exit,),
-            '_': (self.check_horizontal_direction,),
-            '|': (self.check_vertical_direction,),
-            '?': (self.change_direction, random.choice(list(Direction))),
-            ':': (self.copy_stack_top,),
-            '\\': (self.swap,),
-            '$': (self.drop,),
-            '#': (self.skip_cell,),
-            'p': (self.put,),
-            'g': (self.get,),
-            '+': (self.add,),
-            '-': (self.sub,),
-            '*': (self.mul,),
-            '/': (self.div,),
-            '%': (self.mod,),
-            '!': (self.invert,),
-            '`': (self.greater,),
-            '&': (self.input_number,),
-            '~': (self.input_char,),
-            '.': (self.print_number,),
-            ',': (self.print_char,)
-        }
+        self.stack = stack if stack is not None else Stack()
+        self.seed = seed
+        self.random = None
+        self.random_bits = 0
+        self.random_count = 0
+        self.output = output if output is not None else MemorySink()
+        self.limits = None
+        self.limit_error = None
+
+        self.code = None
+        self.handlers = None
+        self.quote_handlers = None
+
+    def nothing(self):
+        pass
 
     def change_direction(self, direction):
         self.direction = direction
 
+    def generator(self):
+        if self.random is None:
+            import random
+            self.random = random.Random(self.seed)
+        return self.random
+
+    def random_direction(self):
+        if not self.random_count:
+            self.random_bits = self.generator().getrandbits(2 * RANDOM_BATCH)
+            self.random_count = RANDOM_BATCH
+        self.random_count -= 1
+        self.direction = DIRECTIONS[self.random_bits & 3]
+        self.random_bits >>= 2
+
     def check_vertical_direction(self):
         if self.stack.pop() == 0:
             self.direction = Direction.DOWN
@@ -71,15 +136,10 @@ class Interpreter:
             self.direction = Direction.LEFT
 
     def copy_stack_top(self):
-        value = self.stack.pop()
-        self.stack.append(value)
-        self.stack.append(value)
+        self.stack.dup()
 
     def swap(self):
-        first = self.stack.pop()
-        second = self.stack.pop()
-        self.stack.append(first)
-        self.stack.append(second)
+        self.stack.swap()
 
     def drop(self):
         self.stack.pop()
@@ -88,35 +148,39 @@ class Interpreter:
         self.move_pointer()
 
     def put(self):
-        y, x, value = self.stack.pop(), self.stack.pop(), self.stack.pop()
-        if 0 <= y < len(self.program) and 0 <= x < len(self.program[y]):
-            self.program[y][x] = chr(value)
+        x, y = self.stack.pop2()
+        self.write_cell(x, y, self.stack.pop())
+
+    def write_cell(self, x, y, value):
+        if self.playfield.put(x, y, value):
+            opcode = self.opcodes.get(value, UNKNOWN)
+            if opcode in IMPURE_OPCODES:
+                self.impure = True
+            if self.code is not None:
+                self.code[y * self.playfield.width + x] = opcode
 
     def get(self):
-        y, x = self.stack.pop(), self.stack.pop()
-        if 0 <= y < len(self.program) and 0 <= x < len(self.program[y]):
-            self.stack.append(ord(self.program[y][x]))
-        else:
-            self.stack.append(0)
+        x, y = self.stack.pop2()
+        self.stack.append(self.playfield.get(x, y))
 
     def add(self):
-        y, x = self.stack.pop(), self.stack.pop()
+        x, y = self.stack.pop2()
         self.stack.append(x + y)
 
     def sub(self):
-        y, x = self.stack.pop(), self.stack.pop()
+        x, y = self.stack.pop2()
         self.stack.append(x - y)
 
     def mul(self):
-        y, x = self.stack.pop(), self.stack.pop()
+        x, y = self.stack.pop2()
         self.stack.append(x * y)
 
     def div(self):
-        y, x = self.stack.pop(), self.stack.pop()
+        x, y = self.stack.pop2()
         self.stack.append(x // y)
 
     def mod(self):
-        y, x = self.stack.pop(), self.stack.pop()
+        x, y = self.stack.pop2()
         self.stack.append(x % y)
 
     def invert(self):
@@ -124,24 +188,18 @@ class Interpreter:
         self.stack.append(1 if value == 0 else 0)
 
     def greater(self):
-        first = self.stack.pop()
-        second = self.stack.pop()
-        self.stack.append(1 if second > first else 0)
+        x, y = self.stack.pop2()
+        self.stack.append(1 if x > y else 0)
 
     def input_number(self):
-        if self.input_data.empty():
-            raise ReadError("Входные данные введены не полностью.")
-        n = self.input_data.get()
+        n = self.input_data.read_token()
         try:
             self.stack.append(int(n))
         except ValueError:
-            print(f'{n} is not int')
+            print(f'{n.decode(errors="replace")} is not int')
 
     def input_char(self):
-        if self.input_data.empty():
-            raise ReadError("Входные данные введены не полностью.")
-        else:
-            self.stack.append(ord(self.input_data.get()))
+        self.stack.append(self.input_data.read_char())
 
     def print_number(self):
         self.output.append(str(self.stack.pop()) + " ")
@@ -153,56 +211,257 @@ class Interpreter:
         self.quote_mode = not self.quote_mode
 
     def exit(self):
-        with open('output.txt', 'w') as f:
-            f.write("".join(map(str, self.output)))
-        exit()
+        raise Halt()
+
+    @property
+    def program(self):
+        return self.playfield.rows()
+
+    @program.setter
+    def program(self, lines):
+        self.playfield = self.playfield_class.from_lines(lines, self.width,
+                                                         self.height)
+        self.code = None
+        self.halted = False
+        self.impure = False
 
     def load_file(self, program_file, input_file=None):
         try:
             with open(program_file) as f:
-                for line in f:
-                    self.program.append(list(line.rstrip()))
-            if input_file is not None:
-                with open(input_file) as f:
-                    for s in f.readline().split():
-                        self.input_data.put(s)
+                self.program = [line.rstrip() for line in f]
+            if input_file == '-':
+                self.input_data = InputBuffer(sys.stdin.buffer)
+            elif input_file is not None:
+                self.input_data = InputBuffer(open(input_file, 'rb'))
         except OSError as e:
             raise FileNotFoundError(e.filename)
 
+    @property
+    def xpos(self):
+        if not self.playfield.width:
+            return 0
+        return self.position % self.playfield.width
+
+    @xpos.setter
+    def xpos(self, x):
+        self.position = self.ypos * self.playfield.width + x
+
+    @property
+    def ypos(self):
+        if not self.playfield.width:
+            return 0
+        return self.position // self.playfield.width
+
+    @ypos.setter
+    def ypos(self, y):
+        self.position = y * self.playfield.width + self.xpos
+
     def move_pointer(self):
-        if self.direction == Direction.RIGHT:
-            self.xpos = (self.xpos + 1
-                         if self.xpos != len(self.program[self.ypos]) - 1
-                         else 0)
-        elif self.direction == Direction.LEFT:
-            self.xpos = (self.xpos - 1
-                         if self.xpos != 0
-                         else len(self.program[self.ypos]) - 1)
-        elif self.direction == Direction.UP:
-            self.ypos = (self.ypos - 1
-                         if self.ypos != 0 else len(self.program) - 1)
-        else:
-            self.ypos = (self.ypos + 1
-                         if self.ypos != len(self.program) - 1 else 0)
+        self.position = self.playfield.successors()[self.position * 4
+                                                    + self.direction]
+
+    def current_cell(self):
+        return self.playfield.cells[self.position]
 
     def execute_command(self):
-        symbol = self.program[self.ypos][self.xpos]
-        if symbol.isdigit():
-            self.stack.append(int(symbol))
-        elif self.quote_mode and symbol != '"':
-            self.stack.append(ord(symbol))
+        value = self.current_cell()
+        if self.quote_mode and value != 34:
+            self.stack.append(value)
+        elif 48 <= value <= 57:
+            self.stack.append(value - 48)
         else:
-            command = self.commands[symbol]
-            if len(command) == 1:
-                command[0]()
+            name, *args = self.commands[to_symbol(value)]
+            getattr(self, name)(*args)
+
+    def push_symbol(self):
+        self.stack.append(self.current_cell())
+
+    def unknown_command(self):
+        raise KeyError(to_symbol(self.current_cell()))
+
+    def compile_code(self):
+        return bytearray(self.opcodes.get(value, UNKNOWN)
+                         for value in self.playfield.cells)
+
+    def compile(self):
+        self.code = self.compile_code()
+        self.handlers = [None] * (max(UNKNOWN, *self.opcodes.values()) + 1)
+        for digit in range(10):
+            self.handlers[digit] = partial(self.stack.append, digit)
+        for symbol, (name, *args) in self.commands.items():
+            self.handlers[self.opcodes[ord(symbol)]] = partial(
+                getattr(self, name), *args)
+        self.handlers[UNKNOWN] = self.unknown_command
+        self.quote_handlers = ([self.push_symbol] * len(self.handlers))
+        self.quote_handlers[QUOTE] = self.change_mode
+        if self.limits is not None:
+            self.limits.install(self)
+
+    def execute(self, steps):
+        code = self.code
+        successors = self.playfield.successors()
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        literals = self.playfield.literals
+        literal = self.playfield.literal
+        extend = self.stack.extend
+        bulk = self.limits is None or self.limits.plain is None
+        fast = tick = 0
+        if self.steps >= CHECK_INTERVAL:
+            targets, weights = self.playfield.skips()
+            fast = steps - max(self.playfield.width, self.playfield.height)
+        try:
+            while tick < fast:
+                if self.quote_mode and not bulk:
+                    quote_handlers[code[self.position]]()
+                    self.position = successors[self.position * 4
+                                               + self.direction]
+                    tick += 1
+                elif self.quote_mode:
+                    index = self.position * 4 + self.direction
+                    codes, self.position = literals.get(index) \
+                        or literal(index)
+                    if codes:
+                        extend(codes)
+                        tick += len(codes)
+                    else:
+                        quote_handlers[QUOTE]()
+                        self.position = successors[index]
+                        tick += 1
+                else:
+                    handlers[code[self.position]]()
+                    index = self.position * 4 + self.direction
+                    self.position = targets[index]
+                    tick += weights[index]
+            while tick < steps:
+                if self.quote_mode and not bulk:
+                    quote_handlers[code[self.position]]()
+                elif self.quote_mode:
+                    index = self.position * 4 + self.direction
+                    codes, target = literals.get(index) or literal(index)
+                    if len(codes) > steps - tick:
+                        codes = codes[:steps - tick]
+                        target = self.position
+                        for _ in codes:
+                            target = successors[target * 4 + self.direction]
+                    if codes:
+                        extend(codes)
+                        self.position = target
+                        tick += len(codes)
+                        continue
+                    quote_handlers[QUOTE]()
+                else:
+                    handlers[code[self.position]]()
+                self.position = successors[self.position * 4
+                                           + self.direction]
+                tick += 1
+        except Halt:
+            self.steps += tick + 1
+            raise
+        except (ReadError, ResourceLimitError):
+            self.steps += tick
+            raise
+        self.steps += tick
+
+    def step(self, n=1):
+        if self.halted:
+            return Status.HALTED
+        if self.code is None:
+            self.compile()
+        try:
+            if self.limits is None:
+                self.execute(n)
             else:
-                command[0](command[1])
-
-    def run(self):
+                while n > 0:
+                    chunk = self.limits.steps(self, n)
+                    self.execute(chunk)
+                    n -= chunk
+        except Halt:
+            self.halted = True
+            self.output.flush()
+            return Status.HALTED
+        except ReadError:
+            return Status.NEEDS_INPUT
+        except ResourceLimitError as e:
+            self.limit_error = e
+            self.output.flush()
+            return Status.LIMIT_EXCEEDED
+        return Status.BUDGET_EXHAUSTED
+
+    def run(self, max_steps=None, timeout=None, cache=None, checkpoint=None):
+        if cache is not None:
+            return cache.run(self, max_steps, timeout)
+        self.compile()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        limit = None if max_steps is None else self.steps + max_steps
         while True:
-            try:
-                self.execute_command()
-            except ReadError as e:
-                print(e)
-                return
-            self.move_pointer()
+            steps = CHECK_INTERVAL
+            if limit is not None:
+                steps = min(steps, limit - self.steps)
+            status = self.step(steps)
+            if checkpoint is not None:
+                checkpoint.update(self)
+            if status != Status.BUDGET_EXHAUSTED:
+                return status
+            if limit is not None and self.steps >= limit:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return Status.TIMED_OUT
+
+    def snapshot(self):
+        self.output.flush()
+        data = self.input_data.data[self.input_data.cursor:]
+        state = {
+            **self.space_snapshot(),
+            'direction': int(self.direction),
+            'quote_mode': self.quote_mode,
+            'stack': list(self.stack),
+            'steps': self.steps,
+            'halted': self.halted,
+            'input': data.decode('latin-1'),
+        }
+        if self.random is not None:
+            state['random'] = [self.random.getstate(), self.random_bits,
+                               self.random_count]
+        return state
+
+    def save_state(self, path, mappable=False):
+        from checkpoint import save
+        save(self, path, mappable)
+
+    def load_state(self, path, use_mmap=False):
+        from checkpoint import load
+        load(self, path, use_mmap)
+
+    def memory_usage(self):
+        from limits import memory_usage
+        return memory_usage(self)
+
+    def space_snapshot(self):
+        return {
+            'width': self.playfield.width,
+            'height': self.playfield.height,
+            'cells': self.playfield.cells.tolist(),
+            'position': self.position,
+        }
+
+    def restore_space(self, state):
+        self.playfield = Playfield(state['width'], state['height'])
+        self.playfield.cells = array('l', state['cells'])
+        self.position = state['position']
+
+    def restore(self, state):
+        self.restore_space(state)
+        self.code = None
+        self.direction = Direction(state['direction'])
+        self.quote_mode = state['quote_mode']
+        self.stack.load(state['stack'])
+        self.steps = state['steps']
+        self.halted = state['halted']
+        self.impure = False
+        self.input_data.data = state['input'].encode('latin-1')
+        self.input_data.cursor = 0
+        if 'random' in state:
+            (version, internal, gauss), self.random_bits, \
+                self.random_count = state['random']
+            self.generator().setstate((version, tuple(internal), gauss))
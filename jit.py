@@ -0,0 +1,243 @@
+from interpreter import Interpreter, Direction
+from analysis import Analysis
+from playfield import to_symbol
+from exceptions import Halt
+
+MAX_TRACE_LENGTH = 512
+MAX_INVALIDATIONS = 4
+TERMINALS = set('?@p&~')
+BRANCHES = {
+    '_': (Direction.LEFT, Direction.RIGHT),
+    '|': (Direction.UP, Direction.DOWN),
+}
+DIGITS = set('0123456789')
+BINARY_OPERATIONS = {
+    '+': '{} + {}',
+    '-': '{} - {}',
+    '*': '{} * {}',
+    '/': '{} // {}',
+    '%': '{} % {}',
+    '`': '1 if {} > {} else 0',
+}
+TURNS = {
+    '>': Direction.RIGHT,
+    '<': Direction.LEFT,
+    '^': Direction.UP,
+    'v': Direction.DOWN,
+}
+
+
+def empty_trace(stack, interpreter):
+    pass
+
+
+empty_trace.ticks = 0
+empty_trace.dispatch = True
+
+
+class TraceBuilder:
+    def __init__(self):
+        self.lines = []
+        self.values = []
+        self.temporaries = 0
+
+    def temporary(self, expression):
+        name = f't{self.temporaries}'
+        self.temporaries += 1
+        self.lines.append(f'{name} = {expression}')
+        return name
+
+    def push(self, value):
+        self.values.append(value)
+
+    def pop(self):
+        if self.values:
+            return self.values.pop()
+        return self.temporary('s.pop() if s else 0')
+
+    def binary(self, symbol):
+        y, x = self.pop(), self.pop()
+        expression = BINARY_OPERATIONS[symbol].format(x, y)
+        if x.lstrip('-').isdigit() and y.lstrip('-').isdigit() \
+                and (symbol not in '/%' or int(y) != 0):
+            self.push(str(eval(expression)))
+        else:
+            self.push(self.temporary(expression))
+
+    def drop(self):
+        if self.values:
+            self.values.pop()
+        else:
+            self.lines.append('if s: s.pop()')
+
+    def call(self, template, *arguments):
+        self.lines.append(template.format(*arguments))
+
+    def source(self, exits, quote_mode=False, condition=None):
+        lines = list(self.lines)
+        if len(self.values) == 1:
+            lines.append(f's.append({self.values[0]})')
+        elif self.values:
+            lines.append(f's.extend(({", ".join(self.values)},))')
+        if quote_mode:
+            lines.append('interpreter.quote_mode = True')
+        if condition is None:
+            lines.extend(self.exit(*exits[0]))
+        else:
+            lines.append(f'if {condition}:')
+            lines.extend('    ' + line for line in self.exit(*exits[0]))
+            lines.extend(self.exit(*exits[1]))
+        body = '\n    '.join(lines)
+        return f'def trace(s, interpreter):\n    {body}\n'
+
+    @staticmethod
+    def exit(position, direction):
+        return [f'interpreter.position = {position}',
+                f'interpreter.direction = Direction.{direction.name}',
+                'return']
+
+
+class JitInterpreter(Interpreter):
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.traces = {}
+        self.trace_cells = {}
+        self.invalidations = {}
+        self.compilations = 0
+        self.analysis = None
+
+    def write_cell(self, x, y, value):
+        super().write_cell(x, y, value)
+        if self.analysis is not None and not self.analysis.writes:
+            self.traces.clear()
+        elif self.playfield.contains(x, y):
+            cell = y * self.playfield.width + x
+            keys = self.trace_cells.pop(cell, ())
+            if keys:
+                self.invalidations[cell] = self.invalidations.get(cell, 0) + 1
+            for key in keys:
+                self.traces.pop(key, None)
+
+    def record(self, position, direction):
+        key = (position, direction)
+        playfield = self.playfield
+        successors = playfield.successors()
+        builder = TraceBuilder()
+        visited = set()
+        covered = []
+        quote_mode = False
+        condition = None
+        invalidations = self.invalidations
+        while len(covered) < MAX_TRACE_LENGTH \
+                and (position, direction, quote_mode) not in visited \
+                and invalidations.get(position, 0) < MAX_INVALIDATIONS:
+            value = playfield.cells[position]
+            symbol = to_symbol(value)
+            if not quote_mode and (symbol in TERMINALS or symbol != ' '
+                                   and symbol not in DIGITS
+                                   and symbol not in self.commands):
+                break
+            visited.add((position, direction, quote_mode))
+            covered.append(position)
+            if not quote_mode and symbol in BRANCHES:
+                condition = builder.pop()
+                break
+            if symbol == '"':
+                quote_mode = not quote_mode
+            elif quote_mode:
+                builder.push(str(value))
+            elif symbol in DIGITS:
+                builder.push(symbol)
+            elif symbol in TURNS:
+                direction = TURNS[symbol]
+            elif symbol == '#':
+                position = successors[position * 4 + direction]
+            elif symbol in BINARY_OPERATIONS:
+                builder.binary(symbol)
+            elif symbol == ':':
+                value = builder.pop()
+                builder.push(value)
+                builder.push(value)
+            elif symbol == '\\':
+                first, second = builder.pop(), builder.pop()
+                builder.push(first)
+                builder.push(second)
+            elif symbol == '$':
+                builder.drop()
+            elif symbol == '!':
+                builder.push(builder.temporary(
+                    f'1 if {builder.pop()} == 0 else 0'))
+            elif symbol == 'g':
+                y_value, x_value = builder.pop(), builder.pop()
+                builder.push(builder.temporary(
+                    f'playfield.get({x_value}, {y_value})'))
+            elif symbol == '.':
+                builder.call("interpreter.output.append(str({}) + ' ')",
+                             builder.pop())
+            elif symbol == ',':
+                builder.call('interpreter.output.append(chr({}))',
+                             builder.pop())
+            position = successors[position * 4 + direction]
+
+        if not covered:
+            trace = empty_trace
+        else:
+            if condition is None:
+                source = builder.source([(position, direction)], quote_mode)
+            else:
+                exits = [(successors[position * 4 + branch], branch)
+                         for branch in BRANCHES[symbol]]
+                source = builder.source(exits, condition=condition)
+            namespace = {'playfield': playfield,
+                         'Direction': Direction}
+            exec(compile(source, f'<trace {key}>', 'exec'), namespace)
+            self.compilations += 1
+            trace = namespace['trace']
+            trace.ticks = len(covered)
+            trace.dispatch = condition is None and not quote_mode
+        self.traces[key] = trace
+        if self.analysis is None or self.analysis.writes:
+            for cell in covered:
+                self.trace_cells.setdefault(cell, set()).add(key)
+        return trace
+
+    def compile(self):
+        super().compile()
+        self.traces.clear()
+        self.trace_cells.clear()
+        self.invalidations.clear()
+        self.analysis = Analysis(self.playfield, (self.position,
+                                                  self.direction,
+                                                  self.quote_mode))
+
+    def execute(self, steps):
+        code = self.code
+        successors = self.playfield.successors()
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        traces = self.traces
+        stack = self.stack.stack
+        executed = 0
+        try:
+            while executed < steps:
+                if self.quote_mode:
+                    quote_handlers[code[self.position]]()
+                else:
+                    trace = traces.get((self.position, self.direction))
+                    if trace is None:
+                        trace = self.record(self.position, self.direction)
+                    if trace.ticks + trace.dispatch <= steps - executed:
+                        trace(stack, self)
+                        executed += trace.ticks
+                        if not trace.dispatch:
+                            continue
+                    handlers[code[self.position]]()
+                executed += 1
+                self.position = successors[self.position * 4
+                                           + self.direction]
+        except Halt:
+            executed += 1
+            raise
+        finally:
+            self.steps += executed
@@ -0,0 +1,526 @@
+import cmd
+from argparse import ArgumentParser
+from array import array
+from bisect import bisect_right
+from interpreter import Interpreter, Direction, Status, UNKNOWN
+from playfield import Playfield, to_symbol
+from limits import Limits
+from exceptions import ReadError, Halt, JournalError, ResourceLimitError
+
+MAGIC = b'BFJR'
+FORMAT_VERSION = 2
+SNAPSHOT_INTERVAL = 1000000
+BUFFER_SIZE = 65536
+CHAR = 4
+NUMBER = 5
+EOF = 6
+PUT = 7
+SNAPSHOT = 8
+END = 9
+RECORDED_SYMBOLS = '?&~p'
+LIMIT_FIELDS = ('stack_depth', 'integer_bits', 'output_size')
+WRAP = 8
+NOT_A_JOURNAL = "Файл {} не является журналом выполнения."
+MISMATCH = "Программа разошлась с журналом на шаге {}."
+JOURNAL_ENDED = "Журнал закончился на шаге {}."
+HELP = """\
+seek N     перейти к шагу N
+step [N]   выполнить N шагов (по умолчанию 1) и показать вывод
+where      номер шага, клетка, направление
+stack      содержимое стека, вершина справа
+field      поле программы
+events [N] следующие N записанных событий (по умолчанию 10)
+quit       выход"""
+
+argparser = ArgumentParser(prog='main.py replay')
+argparser.add_argument('journal', help="path to the journal written with "
+                                       "--record")
+argparser.add_argument('-c', '--command', action='append',
+                       help="run this command instead of reading commands "
+                            "from standard input, can be repeated")
+
+
+def write_varint(buffer, value):
+    while value > 0x7f:
+        buffer.append(value & 0x7f | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def write_signed(buffer, value):
+    write_varint(buffer, 2 * value if value >= 0 else -2 * value - 1)
+
+
+class Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def byte(self):
+        value = self.data[self.offset]
+        self.offset += 1
+        return value
+
+    def varint(self):
+        value = shift = 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def signed(self):
+        value = self.varint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+    def bytes(self, size):
+        value = bytes(self.data[self.offset:self.offset + size])
+        self.offset += size
+        return value
+
+
+class JournalWriter:
+    def __init__(self, path, every=SNAPSHOT_INTERVAL):
+        self.path = path
+        self.every = every
+        self.file = None
+        self.buffer = bytearray()
+        self.last_step = 0
+        self.last_snapshot = 0
+
+    def start(self, interpreter):
+        if self.file is None:
+            self.file = open(self.path, 'wb')
+            playfield = interpreter.playfield
+            self.buffer += MAGIC
+            write_varint(self.buffer, FORMAT_VERSION)
+            write_varint(self.buffer, playfield.width)
+            write_varint(self.buffer, playfield.height)
+            self.write_limits(interpreter.limits)
+            for value in playfield.cells:
+                write_signed(self.buffer, value)
+        self.snapshot(interpreter)
+
+    def write_limits(self, limits):
+        if limits is None:
+            write_varint(self.buffer, 0)
+            return
+        values = [getattr(limits, name) for name in LIMIT_FIELDS]
+        flags = WRAP * limits.wrap
+        for bit, value in enumerate(values):
+            if value is not None:
+                flags |= 1 << bit
+        write_varint(self.buffer, flags)
+        for value in values:
+            if value is not None:
+                write_varint(self.buffer, value)
+
+    def record(self, kind, step):
+        self.buffer.append(kind)
+        write_varint(self.buffer, step - self.last_step)
+        self.last_step = step
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.flush()
+
+    def random(self, step, direction):
+        self.record(direction, step)
+
+    def char(self, step, value):
+        self.record(CHAR, step)
+        write_varint(self.buffer, value)
+
+    def number(self, step, token):
+        self.record(NUMBER, step)
+        write_varint(self.buffer, len(token))
+        self.buffer += token
+
+    def eof(self, step):
+        self.record(EOF, step)
+
+    def put(self, step, x, y, value):
+        self.record(PUT, step)
+        write_signed(self.buffer, x)
+        write_signed(self.buffer, y)
+        write_signed(self.buffer, value)
+
+    def snapshot(self, interpreter):
+        self.record(SNAPSHOT, interpreter.steps)
+        write_varint(self.buffer, interpreter.position)
+        self.buffer.append(interpreter.direction
+                           | interpreter.quote_mode << 2)
+        write_varint(self.buffer, len(interpreter.stack))
+        for value in interpreter.stack:
+            write_signed(self.buffer, value)
+        write_varint(self.buffer, interpreter.output.written
+                     + interpreter.output.buffered)
+        self.last_snapshot = interpreter.steps
+        self.flush()
+
+    def remaining(self, steps):
+        return max(self.last_snapshot + self.every - steps, 1)
+
+    def update(self, interpreter):
+        if interpreter.steps - self.last_snapshot >= self.every:
+            self.snapshot(interpreter)
+
+    def finish(self, interpreter, status):
+        self.record(END, interpreter.steps)
+        status = status.value.encode()
+        write_varint(self.buffer, len(status))
+        self.buffer += status
+        self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer.clear()
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+class Snapshot:
+    def __init__(self, step, event, position, direction, quote_mode, stack,
+                 output):
+        self.step = step
+        self.event = event
+        self.position = position
+        self.direction = direction
+        self.quote_mode = quote_mode
+        self.stack = stack
+        self.output = output
+
+
+def read_limits(reader):
+    flags = reader.varint()
+    if not flags:
+        return None
+    values = [reader.varint() if flags & 1 << bit else None
+              for bit in range(len(LIMIT_FIELDS))]
+    return Limits(*values, bool(flags & WRAP))
+
+
+def read_journal(path):
+    with open(path, 'rb') as f:
+        reader = Reader(f.read())
+    if reader.bytes(len(MAGIC)) != MAGIC \
+            or reader.varint() != FORMAT_VERSION:
+        raise JournalError(NOT_A_JOURNAL.format(path))
+    width, height = reader.varint(), reader.varint()
+    limits = read_limits(reader)
+    cells = array('l', (reader.signed() for _ in range(width * height)))
+    events, snapshots, end = [], [], None
+    step = 0
+    while reader.offset < len(reader.data):
+        try:
+            kind = reader.byte()
+            step += reader.varint()
+            if kind < CHAR:
+                events.append((step, kind, Direction(kind)))
+            elif kind == CHAR:
+                events.append((step, kind, reader.varint()))
+            elif kind == NUMBER:
+                events.append((step, kind, reader.bytes(reader.varint())))
+            elif kind == EOF:
+                events.append((step, kind, None))
+            elif kind == PUT:
+                events.append((step, kind, (reader.signed(), reader.signed(),
+                                            reader.signed())))
+            elif kind == SNAPSHOT:
+                position, flags = reader.varint(), reader.byte()
+                stack = [reader.signed() for _ in range(reader.varint())]
+                snapshots.append(Snapshot(step, len(events), position,
+                                          Direction(flags & 3),
+                                          bool(flags & 4), stack,
+                                          reader.varint()))
+            elif kind == END:
+                end = (step, Status(reader.bytes(reader.varint()).decode()))
+            else:
+                raise JournalError(NOT_A_JOURNAL.format(path))
+        except IndexError:
+            break
+    if not snapshots:
+        raise JournalError(NOT_A_JOURNAL.format(path))
+    return width, height, limits, cells, events, snapshots, end
+
+
+class JournalInterpreter(Interpreter):
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.current_step = 0
+        self.recorded = bytearray(UNKNOWN + 1)
+        for symbol in RECORDED_SYMBOLS:
+            self.recorded[self.opcodes[ord(symbol)]] = 1
+
+    def execute_command(self):
+        self.current_step = self.steps
+        super().execute_command()
+
+    def execute(self, steps):
+        code = self.code
+        successors = self.playfield.successors()
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        recorded = self.recorded
+        tick = 0
+        try:
+            for tick in range(steps):
+                if self.quote_mode:
+                    quote_handlers[code[self.position]]()
+                else:
+                    opcode = code[self.position]
+                    if recorded[opcode]:
+                        self.current_step = self.steps + tick
+                    handlers[opcode]()
+                self.position = successors[self.position * 4
+                                           + self.direction]
+        except Halt:
+            self.steps += tick + 1
+            raise
+        except (ReadError, JournalError, ResourceLimitError):
+            self.steps += tick
+            raise
+        self.steps += steps
+
+
+class RecordingInterpreter(JournalInterpreter):
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.journal = None
+
+    def random_direction(self):
+        super().random_direction()
+        self.journal.random(self.current_step, self.direction)
+
+    def input_char(self):
+        try:
+            value = self.input_data.read_char()
+        except ReadError:
+            self.journal.eof(self.current_step)
+            raise
+        self.journal.char(self.current_step, value)
+        self.stack.append(value)
+
+    def input_number(self):
+        try:
+            n = self.input_data.read_token()
+        except ReadError:
+            self.journal.eof(self.current_step)
+            raise
+        self.journal.number(self.current_step, n)
+        try:
+            self.stack.append(int(n))
+        except ValueError:
+            print(f'{n.decode(errors="replace")} is not int')
+
+    def put(self):
+        x, y = self.stack.pop2()
+        value = self.stack.pop()
+        self.journal.put(self.current_step, x, y, value)
+        self.write_cell(x, y, value)
+
+    def step(self, n=1):
+        status = super().step(min(n, self.journal.remaining(self.steps)))
+        if status == Status.BUDGET_EXHAUSTED:
+            self.journal.update(self)
+        return status
+
+    def run(self, max_steps=None, timeout=None, cache=None, checkpoint=None):
+        self.journal.start(self)
+        try:
+            status = super().run(max_steps, timeout, None, checkpoint)
+            self.journal.finish(self, status)
+        finally:
+            self.journal.flush()
+        return status
+
+
+class ReplayInterpreter(JournalInterpreter):
+    def __init__(self, path, output=None):
+        super().__init__(output=output)
+        self.width, self.height, self.limits, self.cells, self.events, \
+            self.snapshots, self.end = read_journal(path)
+        self.snapshot_steps = [snapshot.step for snapshot in self.snapshots]
+        self.cursor = 0
+        self.restore_snapshot(self.snapshots[0])
+
+    def next_event(self, *kinds):
+        if self.cursor >= len(self.events):
+            raise JournalError(JOURNAL_ENDED.format(self.current_step))
+        step, kind, value = self.events[self.cursor]
+        if step != self.current_step or kind not in kinds:
+            raise JournalError(MISMATCH.format(self.current_step))
+        self.cursor += 1
+        return kind, value
+
+    def random_direction(self):
+        _, self.direction = self.next_event(*Direction)
+
+    def input_char(self):
+        kind, value = self.next_event(CHAR, EOF)
+        if kind == EOF:
+            raise ReadError()
+        self.stack.append(value)
+
+    def input_number(self):
+        kind, n = self.next_event(NUMBER, EOF)
+        if kind == EOF:
+            raise ReadError()
+        try:
+            self.stack.append(int(n))
+        except ValueError:
+            print(f'{n.decode(errors="replace")} is not int')
+
+    def put(self):
+        x, y = self.stack.pop2()
+        value = self.stack.pop()
+        if self.next_event(PUT)[1] != (x, y, value):
+            raise JournalError(MISMATCH.format(self.current_step))
+        self.write_cell(x, y, value)
+
+    def restore_snapshot(self, snapshot):
+        self.playfield = Playfield(self.width, self.height)
+        self.playfield.cells = array('l', self.cells)
+        for _, kind, value in self.events[:snapshot.event]:
+            if kind == PUT:
+                self.playfield.put(*value)
+        self.code = None
+        self.position = snapshot.position
+        self.direction = snapshot.direction
+        self.quote_mode = snapshot.quote_mode
+        self.stack.load(snapshot.stack)
+        self.steps = snapshot.step
+        self.halted = False
+        self.cursor = snapshot.event
+        self.output.flush()
+        self.output.written = snapshot.output
+
+    def forward(self, steps):
+        if self.end is not None:
+            step, status = self.end
+            if status in (Status.NEEDS_INPUT, Status.LIMIT_EXCEEDED):
+                step += 1
+            steps = min(steps, step - self.steps)
+        if self.halted:
+            return Status.HALTED
+        return self.run(steps)
+
+    def seek(self, step):
+        snapshot = self.snapshots[max(bisect_right(self.snapshot_steps,
+                                                   step) - 1, 0)]
+        if step < self.steps or snapshot.step > self.steps:
+            self.restore_snapshot(snapshot)
+        return self.forward(step - self.steps)
+
+
+class ReplayShell(cmd.Cmd):
+    prompt = '(befunge) '
+
+    def __init__(self, interpreter, stdin=None, stdout=None):
+        super().__init__(stdin=stdin, stdout=stdout)
+        self.interpreter = interpreter
+        if stdin is not None:
+            self.use_rawinput = False
+
+    def say(self, *lines):
+        for line in lines:
+            self.stdout.write(f'{line}\n')
+
+    def report(self, status):
+        interpreter = self.interpreter
+        if status == Status.HALTED:
+            self.say(f'Программа завершилась на шаге {interpreter.steps}.')
+        elif status == Status.NEEDS_INPUT:
+            self.say(f'На шаге {interpreter.steps} закончились входные '
+                     f'данные.')
+        elif status == Status.LIMIT_EXCEEDED:
+            self.say(f'На шаге {interpreter.steps}: '
+                     f'{interpreter.limit_error}')
+        self.do_where('')
+
+    def perform(self, action):
+        try:
+            return action()
+        except (JournalError, ValueError) as e:
+            self.say(e)
+
+    def do_seek(self, argument):
+        status = self.perform(lambda: self.interpreter.seek(int(argument)))
+        if status is not None:
+            self.report(status)
+
+    def do_step(self, argument):
+        output = self.interpreter.output
+        start = len(output.getvalue())
+        status = self.perform(lambda: self.interpreter.forward(
+            int(argument or 1)))
+        printed = output.getvalue()[start:]
+        if printed:
+            self.say(f'вывод: {printed!r}')
+        if status is not None:
+            self.report(status)
+
+    def do_where(self, argument):
+        interpreter = self.interpreter
+        mode = ', режим строки' if interpreter.quote_mode else ''
+        self.say(f'шаг {interpreter.steps}, клетка ({interpreter.xpos}, '
+                 f'{interpreter.ypos}) '
+                 f'{to_symbol(interpreter.current_cell())!r}, '
+                 f'{interpreter.direction.name}{mode}')
+
+    def do_stack(self, argument):
+        self.say(' '.join(map(str, self.interpreter.stack)) or 'стек пуст')
+
+    def do_field(self, argument):
+        self.say(*map(''.join, self.interpreter.program))
+
+    def do_events(self, argument):
+        interpreter = self.interpreter
+        count = int(argument) if argument.isdigit() else 10
+        names = {CHAR: '~', NUMBER: '&', EOF: 'конец ввода', PUT: 'p'}
+        for step, kind, value in interpreter.events[
+                interpreter.cursor:interpreter.cursor + count]:
+            if kind < CHAR:
+                value = value.name
+            elif kind == NUMBER:
+                value = value.decode(errors='replace')
+            self.say(f'{step}: {names.get(kind, "?")} {value}')
+
+    def do_help(self, argument):
+        self.say(HELP)
+
+    def do_quit(self, argument):
+        return True
+
+    do_EOF = do_quit
+
+    def default(self, line):
+        self.say(f'Неизвестная команда: {line}')
+
+    def emptyline(self):
+        pass
+
+
+def main(argv):
+    args = argparser.parse_args(argv)
+    try:
+        interpreter = ReplayInterpreter(args.journal)
+    except FileNotFoundError as e:
+        print(f"{e.filename} not found")
+        return
+    except JournalError as e:
+        print(e)
+        return
+    shell = ReplayShell(interpreter)
+    if args.command:
+        for command in args.command:
+            shell.onecmd(command)
+    else:
+        shell.cmdloop()
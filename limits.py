@@ -0,0 +1,143 @@
+import operator
+import sys
+from exceptions import ResourceLimitError
+
+WRAP_BITS = 32
+MIN_CHUNK = 250
+STACK_EXCEEDED = "Глубина стека превысила {}."
+BITS_EXCEEDED = "Число не помещается в {} бит."
+OUTPUT_EXCEEDED = "Вывод превысил {} символов."
+OPERATIONS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.floordiv,
+    '%': operator.mod,
+}
+
+
+class Limits:
+    def __init__(self, stack_depth=None, integer_bits=None, output_size=None,
+                 wrap=False):
+        if wrap and integer_bits is None:
+            integer_bits = WRAP_BITS
+        self.stack_depth = stack_depth
+        self.integer_bits = integer_bits
+        self.output_size = output_size
+        self.wrap = wrap
+        self.peak_stack = 0
+        self.plain = None
+
+    def steps(self, interpreter, steps):
+        depth = len(interpreter.stack)
+        if depth > self.peak_stack:
+            self.peak_stack = depth
+        if self.stack_depth is None:
+            return steps
+        if depth > self.stack_depth:
+            raise ResourceLimitError(STACK_EXCEEDED.format(self.stack_depth),
+                                     'stack', self.stack_depth)
+        chunk = (self.stack_depth - depth) // 2
+        if chunk < MIN_CHUNK:
+            self.check_stack(interpreter)
+            return steps
+        self.uncheck_stack(interpreter)
+        return min(steps, chunk)
+
+    def checked(self, stack, handler):
+        limit = self.stack_depth
+
+        def apply():
+            handler()
+            if len(stack) > limit:
+                self.peak_stack = len(stack)
+                raise ResourceLimitError(STACK_EXCEEDED.format(limit),
+                                         'stack', limit)
+        return apply
+
+    def check_stack(self, interpreter):
+        if self.plain is None:
+            handlers = interpreter.handlers
+            quote_handlers = interpreter.quote_handlers
+            self.plain = handlers[:], quote_handlers[:]
+            for table in (handlers, quote_handlers):
+                table[:] = [handler and self.checked(interpreter.stack,
+                                                     handler)
+                            for handler in table]
+
+    def uncheck_stack(self, interpreter):
+        if self.plain is not None:
+            interpreter.handlers[:], interpreter.quote_handlers[:] = \
+                self.plain
+            self.plain = None
+
+    def bound(self, value):
+        half = 1 << (self.integer_bits - 1)
+        if -half <= value < half:
+            return value
+        if self.wrap:
+            return (value + half) % (2 * half) - half
+        raise ResourceLimitError(BITS_EXCEEDED.format(self.integer_bits),
+                                 'bits', self.integer_bits)
+
+    def arithmetic(self, stack, operation):
+        half = 1 << (self.integer_bits - 1)
+        bound = self.bound
+
+        def apply():
+            x, y = stack.pop2()
+            value = operation(x, y)
+            if not -half <= value < half:
+                value = bound(value)
+            stack.append(value)
+        return apply
+
+    def input_number(self, interpreter):
+        stack = interpreter.stack
+
+        def read():
+            depth = len(stack)
+            interpreter.input_number()
+            if len(stack) > depth:
+                stack.append(self.bound(stack.pop()))
+        return read
+
+    def printer(self, interpreter, format_value):
+        stack = interpreter.stack
+        size = self.output_size
+
+        def write():
+            text = format_value(stack.pop())
+            output = interpreter.output
+            if output.written + output.buffered + len(text) > size:
+                raise ResourceLimitError(OUTPUT_EXCEEDED.format(size),
+                                         'output', size)
+            output.append(text)
+        return write
+
+    def install(self, interpreter):
+        self.plain = None
+        handlers = interpreter.handlers
+        opcodes = interpreter.opcodes
+        if self.integer_bits is not None:
+            for symbol, operation in OPERATIONS.items():
+                handlers[opcodes[ord(symbol)]] = self.arithmetic(
+                    interpreter.stack, operation)
+            handlers[opcodes[ord('&')]] = self.input_number(interpreter)
+        if self.output_size is not None:
+            handlers[opcodes[ord('.')]] = self.printer(
+                interpreter, lambda value: str(value) + ' ')
+            handlers[opcodes[ord(',')]] = self.printer(interpreter, chr)
+
+
+def memory_usage(interpreter):
+    output = interpreter.output
+    usage = {
+        'playfield': interpreter.playfield.memory(),
+        'stack': interpreter.stack.memory(),
+        'output': sum(map(sys.getsizeof, output.buffer))
+        + sum(map(sys.getsizeof, getattr(output, 'chunks', ()))),
+        'input': sys.getsizeof(interpreter.input_data.data),
+    }
+    usage['total'] = sum(usage.values())
+    return usage
@@ -0,0 +1,311 @@
+from interpreter import Interpreter, Direction, Status, OPCODES, UNKNOWN, \
+    QUOTE
+from playfield import Playfield, to_symbol
+from analysis import Analysis
+from exceptions import ReadError
+
+BINARY_OPERATIONS = {
+    '+': lambda x, y: x + y,
+    '-': lambda x, y: x - y,
+    '*': lambda x, y: x * y,
+    '/': lambda x, y: x // y,
+    '%': lambda x, y: x % y,
+}
+TURNS = {
+    '>': Direction.RIGHT,
+    '<': Direction.LEFT,
+    '^': Direction.UP,
+    'v': Direction.DOWN,
+}
+
+
+class Group:
+    def __init__(self, lanes, columns, position, direction, quote_mode):
+        self.lanes = lanes
+        self.columns = columns
+        self.position = position
+        self.direction = direction
+        self.quote_mode = quote_mode
+
+    def key(self):
+        return (self.position, self.direction, self.quote_mode,
+                len(self.columns))
+
+    def push(self, column):
+        self.columns.append(column)
+
+    def pop(self):
+        if self.columns:
+            return self.columns.pop()
+        return [0] * len(self.lanes)
+
+    def select(self, indices):
+        if len(indices) == len(self.lanes):
+            return self
+        return Group([self.lanes[i] for i in indices],
+                     [[column[i] for i in indices]
+                      for column in self.columns],
+                     self.position, self.direction, self.quote_mode)
+
+    def merge(self, other):
+        self.lanes += other.lanes
+        self.columns = [column + other_column for column, other_column
+                        in zip(self.columns, other.columns)]
+
+
+class LockstepRunner:
+    def __init__(self, lines, seed=None):
+        self.lines = lines
+        self.seed = seed
+        self.playfield = Playfield.from_lines(lines)
+        self.vectorized = not Analysis(self.playfield).writes
+        self.interpreters = []
+        self.results = []
+        self.handlers = {OPCODES[ord(str(digit))]: self.digit(digit)
+                         for digit in range(10)}
+        self.handlers.update({OPCODES[ord(symbol)]: self.binary(operation)
+                              for symbol, operation
+                              in BINARY_OPERATIONS.items()})
+        self.handlers.update({OPCODES[ord(symbol)]: self.turn(direction)
+                              for symbol, direction in TURNS.items()})
+        commands = {
+            ' ': self.nothing,
+            '"': self.change_mode,
+            '@': self.exit,
+            '_': self.check_horizontal_direction,
+            '|': self.check_vertical_direction,
+            '?': self.random_direction,
+            ':': self.copy_stack_top,
+            '\\': self.swap,
+            '$': self.drop,
+            '#': self.skip_cell,
+            'g': self.get,
+            '!': self.invert,
+            '`': self.greater,
+            '&': self.input_number,
+            '~': self.input_char,
+            '.': self.print_number,
+            ',': self.print_char,
+        }
+        self.handlers.update({OPCODES[ord(symbol)]: handler
+                              for symbol, handler in commands.items()})
+
+    def digit(self, value):
+        def push(group, tick):
+            group.push([value] * len(group.lanes))
+        return push
+
+    def binary(self, operation):
+        def apply(group, tick):
+            y, x = group.pop(), group.pop()
+            try:
+                group.push(list(map(operation, x, y)))
+            except ZeroDivisionError as e:
+                for lane, value in zip(group.lanes, y):
+                    if not value:
+                        self.fail(lane, e, tick)
+                survivors = [i for i, value in enumerate(y) if value]
+                group = group.select(survivors)
+                group.push([operation(x[i], y[i]) for i in survivors])
+                return [group]
+        return apply
+
+    def turn(self, direction):
+        def change_direction(group, tick):
+            group.direction = direction
+        return change_direction
+
+    def nothing(self, group, tick):
+        pass
+
+    def change_mode(self, group, tick):
+        group.quote_mode = True
+
+    def exit(self, group, tick):
+        for lane in group.lanes:
+            self.finish(lane, Status.HALTED.value, tick + 1)
+        return []
+
+    def check_horizontal_direction(self, group, tick):
+        return self.partition(group, [
+            Direction.LEFT if value else Direction.RIGHT
+            for value in group.pop()])
+
+    def check_vertical_direction(self, group, tick):
+        return self.partition(group, [
+            Direction.UP if value else Direction.DOWN
+            for value in group.pop()])
+
+    def random_direction(self, group, tick):
+        directions = []
+        for lane in group.lanes:
+            interpreter = self.interpreters[lane]
+            interpreter.random_direction()
+            directions.append(interpreter.direction)
+        return self.partition(group, directions)
+
+    def copy_stack_top(self, group, tick):
+        if group.columns:
+            group.push(group.columns[-1])
+        else:
+            group.push([0] * len(group.lanes))
+            group.push([0] * len(group.lanes))
+
+    def swap(self, group, tick):
+        columns = group.columns
+        while len(columns) < 2:
+            columns.insert(0, [0] * len(group.lanes))
+        columns[-2], columns[-1] = columns[-1], columns[-2]
+
+    def drop(self, group, tick):
+        group.pop()
+
+    def skip_cell(self, group, tick):
+        group.position = self.successors[group.position * 4
+                                         + group.direction]
+
+    def get(self, group, tick):
+        y, x = group.pop(), group.pop()
+        group.push(list(map(self.playfield.get, x, y)))
+
+    def invert(self, group, tick):
+        group.push([0 if value else 1 for value in group.pop()])
+
+    def greater(self, group, tick):
+        y, x = group.pop(), group.pop()
+        group.push([1 if a > b else 0 for a, b in zip(x, y)])
+
+    def input_number(self, group, tick):
+        read, values, skipped = [], [], []
+        for i, lane in enumerate(group.lanes):
+            try:
+                token = self.interpreters[lane].input_data.read_token()
+            except ReadError:
+                self.finish(lane, Status.NEEDS_INPUT.value, tick)
+                continue
+            try:
+                values.append(int(token))
+                read.append(i)
+            except ValueError:
+                print(f'{token.decode(errors="replace")} is not int')
+                skipped.append(i)
+        pushed = group.select(read)
+        skipped = group.select(skipped)
+        pushed.push(values)
+        return [pushed, skipped]
+
+    def input_char(self, group, tick):
+        read, values = [], []
+        for i, lane in enumerate(group.lanes):
+            try:
+                values.append(
+                    self.interpreters[lane].input_data.read_char())
+                read.append(i)
+            except ReadError:
+                self.finish(lane, Status.NEEDS_INPUT.value, tick)
+        group = group.select(read)
+        group.push(values)
+        return [group]
+
+    def print_number(self, group, tick):
+        for lane, value in zip(group.lanes, group.pop()):
+            self.interpreters[lane].output.append(str(value) + ' ')
+
+    def print_char(self, group, tick):
+        printed = []
+        for i, (lane, value) in enumerate(zip(group.lanes, group.pop())):
+            try:
+                self.interpreters[lane].output.append(chr(value))
+                printed.append(i)
+            except (ValueError, OverflowError) as e:
+                self.fail(lane, e, tick)
+        return [group.select(printed)]
+
+    def unknown_command(self, group, tick):
+        error = KeyError(to_symbol(self.playfield.cells[group.position]))
+        for lane in group.lanes:
+            self.fail(lane, error, tick)
+        return []
+
+    def partition(self, group, directions):
+        if len(set(directions)) == 1:
+            group.direction = directions[0]
+            return [group]
+        groups = []
+        for direction in set(directions):
+            selected = group.select([i for i, value in enumerate(directions)
+                                     if value == direction])
+            selected.direction = direction
+            groups.append(selected)
+        return groups
+
+    def finish(self, lane, status, steps, error=None):
+        interpreter = self.interpreters[lane]
+        interpreter.steps = steps
+        interpreter.halted = status == Status.HALTED.value
+        self.results[lane] = {'status': status,
+                              'output': interpreter.output.getvalue(),
+                              'error': error, 'steps': steps}
+
+    def fail(self, lane, error, steps):
+        self.finish(lane, 'error', steps, f'{type(error).__name__}: {error}')
+
+    def execute(self, group, tick):
+        if group.quote_mode:
+            if self.code[group.position] == QUOTE:
+                group.quote_mode = False
+            else:
+                group.push([self.playfield.cells[group.position]]
+                           * len(group.lanes))
+            return [group]
+        handler = self.handlers.get(self.code[group.position],
+                                    self.unknown_command)
+        groups = handler(group, tick)
+        return [group] if groups is None else groups
+
+    def run_scalar(self, max_steps):
+        for lane, interpreter in enumerate(self.interpreters):
+            interpreter.program = self.lines
+            try:
+                status = interpreter.run(max_steps)
+            except Exception as e:
+                self.fail(lane, e, interpreter.steps)
+            else:
+                self.finish(lane, status.value, interpreter.steps)
+
+    def run(self, inputs, max_steps=None):
+        self.interpreters = []
+        for data in inputs:
+            interpreter = Interpreter(seed=self.seed)
+            interpreter.playfield = self.playfield
+            interpreter.input_data.feed(data)
+            self.interpreters.append(interpreter)
+        self.results = [None] * len(self.interpreters)
+        if not self.vectorized:
+            self.run_scalar(max_steps)
+            return self.results
+        self.code = bytearray(OPCODES.get(value, UNKNOWN)
+                              for value in self.playfield.cells)
+        self.successors = self.playfield.successors()
+        groups = [Group(list(range(len(self.interpreters))), [], 0,
+                        Direction.RIGHT, False)] if self.interpreters else []
+        tick = 0
+        while groups and (max_steps is None or tick < max_steps):
+            moved = {}
+            for group in groups:
+                for successor in self.execute(group, tick):
+                    if not successor.lanes:
+                        continue
+                    successor.position = self.successors[
+                        successor.position * 4 + successor.direction]
+                    key = successor.key()
+                    if key in moved:
+                        moved[key].merge(successor)
+                    else:
+                        moved[key] = successor
+            groups = list(moved.values())
+            tick += 1
+        for group in groups:
+            for lane in group.lanes:
+                self.finish(lane, Status.BUDGET_EXHAUSTED.value, tick)
+        return self.results
@@ -1,22 +1,283 @@
+import os
+import sys
 from argparse import ArgumentParser
-from interpreter import Interpreter
+from interpreter import Interpreter, Status, is_pure
+from sinks import FileSink, StdoutSink, DEFAULT_BUFFER_SIZE
+from sources import INPUT_EXHAUSTED
+from exceptions import PlayfieldSizeError, CheckpointError
+
+PROFILE_FORMATS = ('text', 'ansi', 'csv', 'json')
+
+
+def build_parser():
+    argparser = ArgumentParser()
+    argparser.add_argument('program_file',
+                           help="path to Befunge executable code file")
+    argparser.add_argument('-i', '--input_file', required=False,
+                           help="path to file with additional args that are "
+                                "separated by whitespace, '-' for standard "
+                                "input")
+    argparser.add_argument('-o', '--output', default='output.txt',
+                           help="path to output file, '-' for standard "
+                                "output (default: output.txt)")
+    argparser.add_argument('--buffer-size', type=int,
+                           default=DEFAULT_BUFFER_SIZE,
+                           help="number of output characters buffered before "
+                                "they are written")
+    argparser.add_argument('--flush-every', type=int,
+                           help="write buffered output after every N output "
+                                "commands")
+    argparser.add_argument('--width', type=int,
+                           help="playfield width, by default the length of "
+                                "the longest program line (80 in Befunge-93)")
+    argparser.add_argument('--height', type=int,
+                           help="playfield height, by default the number of "
+                                "program lines (25 in Befunge-93)")
+    argparser.add_argument('--max-steps', type=int,
+                           help="stop the program after this number of steps")
+    argparser.add_argument('--timeout', type=float,
+                           help="stop the program after this number of "
+                                "seconds")
+    argparser.add_argument('--max-stack', type=int,
+                           help="stop the program when the stack holds more "
+                                "than this number of values")
+    argparser.add_argument('--max-bits', type=int,
+                           help="stop the program when a result of "
+                                "arithmetic or an input number does not fit "
+                                "in a signed integer of this many bits")
+    argparser.add_argument('--wrap', action='store_true',
+                           help="wrap arithmetic results to --max-bits "
+                                "(default: 32) like the reference Befunge-93 "
+                                "instead of stopping")
+    argparser.add_argument('--max-output', type=int,
+                           help="stop the program before its output exceeds "
+                                "this number of characters")
+    argparser.add_argument('--seed', type=int,
+                           help="seed for the random directions of ?, makes "
+                                "runs reproducible")
+    argparser.add_argument('--analyze', action='store_true',
+                           help="print the static control-flow analysis of "
+                                "the program (dead cells, loops without side "
+                                "effects, constant folds, use of p) instead "
+                                "of running it")
+    argparser.add_argument('--cache',
+                           help="keep the results of programs without ?, & "
+                                "and ~ in this SQLite file and reuse them on "
+                                "later runs (default: no cache)")
+    argparser.add_argument('--cache-size', type=int, default=64,
+                           help="cache size limit in megabytes, least "
+                                "recently used results are evicted (default: "
+                                "64)")
+    argparser.add_argument('--checkpoint',
+                           help="path to a binary file with the interpreter "
+                                "state, saved when the program stops before "
+                                "halting")
+    argparser.add_argument('--checkpoint-every', type=int,
+                           help="also save the state every N steps")
+    argparser.add_argument('--resume', action='store_true',
+                           help="continue from the state saved in "
+                                "--checkpoint if the file exists, appending "
+                                "to the output")
+    argparser.add_argument('--mmap', action='store_true',
+                           help="save the playfield as 8-byte cells and "
+                                "memory-map it on --resume instead of "
+                                "reading it, so it is not copied")
+    argparser.add_argument('--compact-stack', action='store_true',
+                           help="keep the stack in a machine integer array, "
+                                "switching to Python integers on overflow: "
+                                "8 bytes per value instead of about 40, but "
+                                "slower on most programs (not compatible "
+                                "with --jit)")
+    engine = argparser.add_mutually_exclusive_group()
+    engine.add_argument('--jit', action='store_true',
+                        help="compile straight-line paths of the program "
+                             "into Python functions while running")
+    engine.add_argument('--profile', action='store_true',
+                        help="count executions per cell and per command and "
+                             "print a heat map of the playfield after the "
+                             "run")
+    engine.add_argument('--sparse', action='store_true',
+                        help="keep the playfield in tiles allocated on first "
+                             "write: p and g work at any coordinates and the "
+                             "pointer wraps around the bounding box of the "
+                             "written cells")
+    engine.add_argument('--concurrent', action='store_true',
+                        help="support the t command that starts a new "
+                             "instruction pointer with a copy of the stack, "
+                             "pointers take turns executing one command each")
+    engine.add_argument('--record',
+                        help="write a journal of ? directions, input reads "
+                             "and p writes with periodic snapshots to this "
+                             "file, to inspect the run later with 'main.py "
+                             "replay'")
+    argparser.add_argument('--record-every', type=int,
+                           help="with --record, save a snapshot every N "
+                                "steps (default: 1000000)")
+    argparser.add_argument('--workers', type=int,
+                           help="with --concurrent, run every pointer to the "
+                                "end in a pool of N processes when the "
+                                "program has no p, & and ~, output is merged "
+                                "as if each new pointer ran to the end "
+                                "before its parent continued; --max-steps "
+                                "counts the steps of all pointers")
+    argparser.add_argument('--profile-format', choices=PROFILE_FORMATS,
+                           default='text',
+                           help="format of the profile: text heat map, ANSI "
+                                "colored playfield, CSV or JSON (default: "
+                                "text)")
+    argparser.add_argument('--profile-output', default='-',
+                           help="path to profile file, '-' for standard "
+                                "output (default)")
+    return argparser
 
-argparser = ArgumentParser()
-argparser.add_argument('program_file',
-                       help="path to Befunge executable code file")
-argparser.add_argument('-i', '--input_file', required=False,
-                       help="path to file with additional args that are "
-                            "separated by space")
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['batch']:
+        import batch
+        batch.main(sys.argv[2:])
+        exit()
+    if sys.argv[1:2] == ['compile']:
+        import transpiler
+        transpiler.main(sys.argv[2:])
+        exit()
+    if sys.argv[1:2] == ['replay']:
+        import journal
+        journal.main(sys.argv[2:])
+        exit()
+    if sys.argv[1:2] == ['serve']:
+        import server
+        server.main(sys.argv[2:])
+        exit()
+
+    argparser = build_parser()
     args = argparser.parse_args()
+    if args.jit and args.compact_stack:
+        argparser.error("argument --compact-stack: not allowed with "
+                        "argument --jit")
+    if args.sparse and args.analyze:
+        argparser.error("argument --analyze: not allowed with "
+                        "argument --sparse")
+    if args.checkpoint is None:
+        for name in ('checkpoint_every', 'resume', 'mmap'):
+            if getattr(args, name):
+                argparser.error(f"argument --{name.replace('_', '-')}: "
+                                f"requires argument --checkpoint")
+    elif args.sparse or args.concurrent:
+        engine_name = 'sparse' if args.sparse else 'concurrent'
+        argparser.error(f"argument --checkpoint: not allowed with "
+                        f"argument --{engine_name}")
+    if args.workers is not None and not args.concurrent:
+        argparser.error("argument --workers: requires argument --concurrent")
+    if args.record_every is not None and args.record is None:
+        argparser.error("argument --record-every: requires argument --record")
+    limited = args.max_stack is not None or args.max_bits is not None \
+        or args.wrap or args.max_output is not None
+    if limited and (args.jit or args.workers is not None):
+        engine_name = 'jit' if args.jit else 'workers'
+        argparser.error(f"resource limits: not allowed with "
+                        f"argument --{engine_name}")
+    resume = args.resume and os.path.exists(args.checkpoint)
     program_file = args.program_file
     input_file = args.input_file
 
-    bi = Interpreter()
+    if args.output == '-':
+        output = StdoutSink(args.buffer_size, args.flush_every)
+    else:
+        output = FileSink(args.output, args.buffer_size, args.flush_every,
+                          'a' if resume else 'w')
+    interpreter_class = Interpreter
+    if args.jit:
+        from jit import JitInterpreter
+        interpreter_class = JitInterpreter
+    elif args.profile:
+        from profiler import ProfilingInterpreter
+        interpreter_class = ProfilingInterpreter
+    elif args.sparse:
+        from sparse import SparseInterpreter
+        interpreter_class = SparseInterpreter
+    elif args.concurrent:
+        from concurrency import ConcurrentInterpreter
+        interpreter_class = ConcurrentInterpreter
+    elif args.record is not None:
+        from journal import RecordingInterpreter
+        interpreter_class = RecordingInterpreter
+    stack = None
+    if args.compact_stack:
+        from stack import CompactStack
+        stack = CompactStack()
+    bi = interpreter_class(args.width, args.height, output, stack, args.seed)
+    if limited:
+        from limits import Limits
+        bi.limits = Limits(args.max_stack, args.max_bits, args.max_output,
+                           args.wrap)
+    if args.record is not None:
+        from journal import JournalWriter, SNAPSHOT_INTERVAL
+        bi.journal = JournalWriter(args.record,
+                                   args.record_every or SNAPSHOT_INTERVAL)
     try:
         bi.load_file(program_file, input_file)
     except FileNotFoundError as e:
         print(f"{e} not found")
         exit()
-    bi.run()
+    except PlayfieldSizeError as e:
+        print(e)
+        exit()
+    if resume:
+        try:
+            bi.load_state(args.checkpoint, args.mmap)
+        except CheckpointError as e:
+            print(e)
+            exit()
+    if args.analyze:
+        from analysis import Analysis
+        print(*Analysis(bi.playfield).report(), sep='\n')
+        exit()
+    cache = None
+    if args.cache is not None and not args.profile and not args.sparse \
+            and args.checkpoint is None and args.workers is None \
+            and not limited and args.record is None \
+            and is_pure(bi.playfield):
+        import sqlite3
+        from cache import ResultCache
+        try:
+            cache = ResultCache(args.cache, args.cache_size * 1024 * 1024)
+        except (OSError, sqlite3.Error):
+            pass
+    checkpoint = None
+    if args.checkpoint_every:
+        from checkpoint import Checkpointer
+        checkpoint = Checkpointer(args.checkpoint, args.checkpoint_every,
+                                  bi.steps, args.mmap)
+    try:
+        if args.workers is not None:
+            from concurrency import run_parallel
+            status = run_parallel(bi, args.workers, args.max_steps,
+                                  args.timeout)
+        else:
+            status = bi.run(args.max_steps, args.timeout, cache, checkpoint)
+        if args.checkpoint is not None and status != Status.HALTED:
+            bi.save_state(args.checkpoint, args.mmap)
+        if status == Status.NEEDS_INPUT:
+            print(INPUT_EXHAUSTED)
+        elif status == Status.BUDGET_EXHAUSTED:
+            print(f"Программа остановлена после {bi.steps} шагов.")
+        elif status == Status.LIMIT_EXCEEDED:
+            print(bi.limit_error)
+        elif status == Status.TIMED_OUT:
+            print(f"Программа остановлена по времени после {bi.steps} "
+                  f"шагов.")
+    finally:
+        output.close()
+        bi.input_data.close()
+        if cache is not None:
+            cache.close()
+        if args.record is not None:
+            bi.journal.close()
+    if args.profile:
+        from profiler import render
+        profile = render(bi, args.profile_format)
+        if args.profile_output == '-':
+            sys.stdout.write(profile)
+        else:
+            with open(args.profile_output, 'w') as f:
+                f.write(profile)
@@ -0,0 +1,263 @@
+import sys
+from array import array
+from exceptions import PlayfieldSizeError
+
+SPACE = ord(' ')
+QUOTE = ord('"')
+ARROWS = tuple(map(ord, '>v<^'))
+SKIPPED = {SPACE, QUOTE, *ARROWS}
+STANDARD_WIDTH = 80
+STANDARD_HEIGHT = 25
+DELTAS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+TILE_BITS = 5
+TILE_SIZE = 1 << TILE_BITS
+TILE_MASK = TILE_SIZE - 1
+
+
+def to_symbol(value):
+    if 0 <= value < 0x110000:
+        return chr(value)
+    return '�'
+
+
+class Playfield:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = array('l', [SPACE]) * (width * height)
+        self.successor_table = None
+        self.successor_geometry = None
+        self.skip_targets = None
+        self.skip_weights = None
+        self.literals = {}
+        self.literal_cells = {}
+
+    @classmethod
+    def from_lines(cls, lines, width=None, height=None):
+        lines = [[ord(symbol) for symbol in line] for line in lines]
+        if width is None:
+            width = max(map(len, lines), default=0)
+        if height is None:
+            height = len(lines)
+        if len(lines) > height or any(len(line) > width for line in lines):
+            raise PlayfieldSizeError(
+                f"Программа не помещается в поле {width}x{height}.")
+        playfield = cls(width, height)
+        for y, line in enumerate(lines):
+            playfield.cells[y * width:y * width + len(line)] = \
+                array('l', line)
+        return playfield
+
+    def contains(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x, y):
+        if self.contains(x, y):
+            return self.cells[y * self.width + x]
+        return 0
+
+    def put(self, x, y, value):
+        if self.contains(x, y):
+            position = y * self.width + x
+            previous = self.cells[position]
+            self.cells[position] = value
+            if previous != value:
+                for index in self.literal_cells.pop(position, ()):
+                    self.literals.pop(index, None)
+            if self.skip_targets is not None and previous != value \
+                    and (previous in SKIPPED or value in SKIPPED):
+                self.update_skips(position)
+            return True
+        return False
+
+    def memory(self):
+        size = sys.getsizeof(self.cells)
+        for table in (self.successor_table, self.skip_targets,
+                      self.skip_weights):
+            if table is not None:
+                size += sys.getsizeof(table)
+        return size
+
+    def successors(self):
+        if self.successor_geometry != (self.width, self.height):
+            width, height = self.width, self.height
+            self.successor_table = [
+                (y + dy) % height * width + (x + dx) % width
+                for y in range(height)
+                for x in range(width)
+                for dx, dy in DELTAS
+            ]
+            self.successor_geometry = (width, height)
+        return self.successor_table
+
+    def skip_line(self, positions, direction):
+        cells = self.cells
+        targets, weights = self.skip_targets, self.skip_weights
+        arrow = ARROWS[direction]
+        length = len(positions)
+        following = None
+        for i in range(2 * length - 1, -1, -1):
+            position = positions[i % length]
+            if i < length:
+                index = position * 4 + direction
+                if cells[position] == QUOTE:
+                    targets[index] = positions[(i + 1) % length]
+                    weights[index] = 1
+                elif following is None or following - i > length:
+                    targets[index] = position
+                    weights[index] = length
+                else:
+                    targets[index] = positions[following % length]
+                    weights[index] = following - i
+            if cells[position] != SPACE and cells[position] != arrow:
+                following = i
+
+    def skips(self):
+        if self.skip_targets is None \
+                or len(self.skip_targets) != 4 * len(self.cells):
+            self.skip_targets = [0] * (4 * len(self.cells))
+            self.skip_weights = [0] * (4 * len(self.cells))
+            for y in range(self.height):
+                self.skip_row(y)
+            for x in range(self.width):
+                self.skip_column(x)
+        return self.skip_targets, self.skip_weights
+
+    def update_skips(self, position):
+        successors = self.successors()
+        cells = self.cells
+        targets, weights = self.skip_targets, self.skip_weights
+        for direction in range(4):
+            backward = (direction + 2) % 4
+            passed = (SPACE, ARROWS[direction])
+            run = [position]
+            previous = successors[position * 4 + backward]
+            while cells[previous] in passed and previous != position:
+                run.append(previous)
+                previous = successors[previous * 4 + backward]
+            if previous == position:
+                if direction % 2:
+                    self.skip_column(position % self.width)
+                else:
+                    self.skip_row(position // self.width)
+                continue
+            run.append(previous)
+            for cell in run:
+                index = cell * 4 + direction
+                following = successors[index]
+                if cells[cell] == QUOTE or cells[following] not in passed:
+                    targets[index] = following
+                    weights[index] = 1
+                else:
+                    targets[index] = targets[following * 4 + direction]
+                    weights[index] = weights[following * 4 + direction] + 1
+
+    def skip_row(self, y):
+        row = range(y * self.width, (y + 1) * self.width)
+        self.skip_line(row, 0)
+        self.skip_line(row[::-1], 2)
+
+    def skip_column(self, x):
+        column = range(x, len(self.cells), self.width)
+        self.skip_line(column, 1)
+        self.skip_line(column[::-1], 3)
+
+    def literal(self, index):
+        successors = self.successors()
+        position, direction = divmod(index, 4)
+        limit = self.height if direction % 2 else self.width
+        codes = []
+        covered = [position]
+        while self.cells[position] != QUOTE and len(codes) < limit:
+            codes.append(self.cells[position])
+            position = successors[position * 4 + direction]
+            covered.append(position)
+        literal = (codes, position)
+        opening = successors[index - direction + (direction + 2) % 4]
+        if self.cells[opening] == QUOTE:
+            self.literals[index] = literal
+            for cell in covered:
+                self.literal_cells.setdefault(cell, set()).add(index)
+        return literal
+
+    def line(self, y):
+        start = y * self.width
+        return "".join(map(to_symbol,
+                           self.cells[start:start + self.width])).rstrip()
+
+    def rows(self):
+        return [list(self.line(y)) for y in range(self.height)]
+
+
+class SparsePlayfield:
+    def __init__(self, width, height):
+        self.tiles = {}
+        self.left = self.top = 0
+        self.right = max(width, 1)
+        self.bottom = max(height, 1)
+
+    @classmethod
+    def from_lines(cls, lines, width=None, height=None):
+        playfield = cls(width or 0, height or 0)
+        for y, line in enumerate(lines):
+            for x, symbol in enumerate(line):
+                if symbol != ' ':
+                    playfield.put(x, y, ord(symbol))
+        return playfield
+
+    @property
+    def width(self):
+        return self.right - self.left
+
+    @property
+    def height(self):
+        return self.bottom - self.top
+
+    def contains(self, x, y):
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+    def memory(self):
+        return sys.getsizeof(self.tiles) \
+            + sum(map(sys.getsizeof, self.tiles.values()))
+
+    def get(self, x, y):
+        tile = self.tiles.get((x >> TILE_BITS, y >> TILE_BITS))
+        if tile is None:
+            return SPACE
+        return tile[(y & TILE_MASK) << TILE_BITS | x & TILE_MASK]
+
+    def put(self, x, y, value):
+        key = (x >> TILE_BITS, y >> TILE_BITS)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if value == SPACE:
+                return True
+            tile = self.tiles[key] = array('l', [SPACE]) * TILE_SIZE ** 2
+        tile[(y & TILE_MASK) << TILE_BITS | x & TILE_MASK] = value
+        if value != SPACE and not self.contains(x, y):
+            self.left = min(self.left, x)
+            self.top = min(self.top, y)
+            self.right = max(self.right, x + 1)
+            self.bottom = max(self.bottom, y + 1)
+        return True
+
+    def next(self, x, y, direction):
+        dx, dy = DELTAS[direction]
+        x += dx
+        y += dy
+        if x >= self.right:
+            x = self.left
+        elif x < self.left:
+            x = self.right - 1
+        if y >= self.bottom:
+            y = self.top
+        elif y < self.top:
+            y = self.bottom - 1
+        return x, y
+
+    def line(self, y):
+        return "".join(to_symbol(self.get(x, y))
+                       for x in range(self.left, self.right)).rstrip()
+
+    def rows(self):
+        return [list(self.line(y)) for y in range(self.top, self.bottom)]
@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import math
+from array import array
+from collections import Counter
+from interpreter import Interpreter, COMMAND_SYMBOLS, UNKNOWN, QUOTE
+from playfield import to_symbol
+from exceptions import ReadError, Halt, ResourceLimitError
+
+STRING_PUSH = UNKNOWN + 1
+OPCODE_NAMES = ([str(digit) for digit in range(10)] + list(COMMAND_SYMBOLS)
+                + ['unknown', 'string'])
+SHADES = ' .:-=+*#%@'
+HEAT_COLORS = (17, 19, 21, 27, 33, 39, 45, 51, 48, 46, 82, 118, 154, 190,
+               226, 220, 214, 208, 202, 196)
+FORMATS = ('text', 'ansi', 'csv', 'json')
+
+
+class ProfilingInterpreter(Interpreter):
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.reset_profile()
+
+    def reset_profile(self):
+        self.cell_counts = array('q', bytes(8 * len(self.playfield.cells)))
+        self.opcode_counts = [0] * (STRING_PUSH + 1)
+        self.max_stack_depth = len(self.stack)
+        self.puts = Counter()
+        self.gets = Counter()
+
+    def compile(self):
+        super().compile()
+        self.quote_opcodes = [STRING_PUSH] * len(self.handlers)
+        self.quote_opcodes[QUOTE] = QUOTE
+        if len(self.cell_counts) != len(self.playfield.cells):
+            self.reset_profile()
+
+    def put(self):
+        x, y = self.stack.pop2()
+        self.puts[x, y] += 1
+        self.write_cell(x, y, self.stack.pop())
+
+    def get(self):
+        x, y = self.stack.pop2()
+        self.gets[x, y] += 1
+        self.stack.append(self.playfield.get(x, y))
+
+    def execute(self, steps):
+        code = self.code
+        successors = self.playfield.successors()
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        cell_counts = self.cell_counts
+        opcode_counts = self.opcode_counts
+        quote_opcodes = self.quote_opcodes
+        stack = self.stack
+        max_depth = self.max_stack_depth
+        tick = 0
+        try:
+            for tick in range(steps):
+                position = self.position
+                opcode = code[position]
+                cell_counts[position] += 1
+                if self.quote_mode:
+                    opcode_counts[quote_opcodes[opcode]] += 1
+                    quote_handlers[opcode]()
+                else:
+                    opcode_counts[opcode] += 1
+                    handlers[opcode]()
+                if len(stack.stack) > max_depth:
+                    max_depth = len(stack.stack)
+                self.position = successors[self.position * 4
+                                           + self.direction]
+        except Halt:
+            self.steps += tick + 1
+            raise
+        except (ReadError, ResourceLimitError):
+            self.steps += tick
+            raise
+        finally:
+            self.max_stack_depth = max_depth
+        self.steps += steps
+
+    def hot_cells(self, n=10):
+        width = self.playfield.width
+        ranked = sorted(range(len(self.cell_counts)),
+                        key=self.cell_counts.__getitem__, reverse=True)
+        return [(position % width, position // width,
+                 self.cell_counts[position])
+                for position in ranked[:n] if self.cell_counts[position]]
+
+    def profile(self):
+        width = self.playfield.width
+        return {
+            'width': width,
+            'height': self.playfield.height,
+            'steps': self.steps,
+            'cells': [self.cell_counts[y * width:(y + 1) * width].tolist()
+                      for y in range(self.playfield.height)],
+            'opcodes': {name: count for name, count
+                        in zip(OPCODE_NAMES, self.opcode_counts) if count},
+            'max_stack_depth': self.max_stack_depth,
+            'puts': [[x, y, count] for (x, y), count in self.puts.items()],
+            'gets': [[x, y, count] for (x, y), count in self.gets.items()],
+        }
+
+
+def heat_level(count, highest, levels):
+    if count == 0:
+        return 0
+    if highest == 1:
+        return levels
+    return 1 + int(math.log(count) / math.log(highest) * (levels - 1))
+
+
+def summary(interpreter):
+    lines = [f'steps: {interpreter.steps}',
+             f'max stack depth: {interpreter.max_stack_depth}',
+             f'p: {sum(interpreter.puts.values())} '
+             f'({len(interpreter.puts)} cells), '
+             f'g: {sum(interpreter.gets.values())} '
+             f'({len(interpreter.gets)} cells)',
+             'opcodes:']
+    ranked = sorted(zip(OPCODE_NAMES, interpreter.opcode_counts),
+                    key=lambda item: item[1], reverse=True)
+    lines += [f'  {name!r:10} {count}' for name, count in ranked if count]
+    lines.append('hot cells:')
+    lines += [f'  ({x}, {y}) {count}'
+              for x, y, count in interpreter.hot_cells()]
+    return lines
+
+
+def render_text(interpreter):
+    cells = interpreter.cell_counts
+    width = interpreter.playfield.width
+    highest = max(cells, default=0)
+    lines = []
+    for y in range(interpreter.playfield.height):
+        row = cells[y * width:(y + 1) * width]
+        lines.append(''.join(
+            SHADES[heat_level(count, highest, len(SHADES) - 1)]
+            for count in row).rstrip())
+    lines.append(f'scale: {SHADES!r}, max {highest}')
+    return '\n'.join(lines + summary(interpreter)) + '\n'
+
+
+def render_ansi(interpreter):
+    cells = interpreter.cell_counts
+    playfield = interpreter.playfield
+    highest = max(cells, default=0)
+    lines = []
+    for y in range(playfield.height):
+        line = []
+        for x in range(playfield.width):
+            position = y * playfield.width + x
+            symbol = to_symbol(playfield.cells[position])
+            if not symbol.isprintable():
+                symbol = '?'
+            level = heat_level(cells[position], highest, len(HEAT_COLORS))
+            if level:
+                line.append(f'\x1b[30;48;5;{HEAT_COLORS[level - 1]}m'
+                            f'{symbol}\x1b[0m')
+            else:
+                line.append(symbol)
+        lines.append(''.join(line))
+    return '\n'.join(lines + summary(interpreter)) + '\n'
+
+
+def render_csv(interpreter):
+    playfield = interpreter.playfield
+    text = io.StringIO()
+    writer = csv.writer(text, lineterminator='\n')
+    writer.writerow(['x', 'y', 'symbol', 'count', 'puts', 'gets'])
+    for position, count in enumerate(interpreter.cell_counts):
+        x, y = position % playfield.width, position // playfield.width
+        writer.writerow([x, y, to_symbol(playfield.cells[position]), count,
+                         interpreter.puts[x, y], interpreter.gets[x, y]])
+    return text.getvalue()
+
+
+def render_json(interpreter):
+    return json.dumps(interpreter.profile()) + '\n'
+
+
+RENDERERS = dict(zip(FORMATS, (render_text, render_ansi, render_csv,
+                               render_json)))
+
+
+def render(interpreter, format='text'):
+    return RENDERERS[format](interpreter)
@@ -0,0 +1,59 @@
+import asyncio
+from argparse import ArgumentParser
+from async_interpreter import AsyncInterpreter, DEFAULT_SLICE
+
+argparser = ArgumentParser(prog='main.py serve')
+argparser.add_argument('program_file',
+                       help="path to Befunge executable code file")
+argparser.add_argument('--host', default='127.0.0.1')
+argparser.add_argument('--port', type=int, default=8765)
+argparser.add_argument('--slice', type=int, default=DEFAULT_SLICE,
+                       help="number of steps a session runs before "
+                            "yielding to other sessions")
+argparser.add_argument('--max-steps', type=int,
+                       help="step limit for every session")
+argparser.add_argument('--timeout', type=float,
+                       help="time limit in seconds for every session")
+
+
+def session_handler(lines, slice_steps=DEFAULT_SLICE, max_steps=None,
+                    timeout=None):
+    async def handle(reader, writer):
+        interpreter = AsyncInterpreter(reader, writer, slice_steps)
+        try:
+            interpreter.program = lines
+            await interpreter.run(max_steps, timeout)
+        except ConnectionError:
+            pass
+        except Exception as e:
+            writer.write(f'\n{type(e).__name__}: {e}\n'.encode())
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    return handle
+
+
+async def serve(lines, host, port, slice_steps=DEFAULT_SLICE,
+                max_steps=None, timeout=None):
+    handler = session_handler(lines, slice_steps, max_steps, timeout)
+    return await asyncio.start_server(handler, host, port)
+
+
+async def serve_forever(args):
+    with open(args.program_file) as f:
+        lines = [line.rstrip() for line in f]
+    server = await serve(lines, args.host, args.port, args.slice,
+                         args.max_steps, args.timeout)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv):
+    args = argparser.parse_args(argv)
+    try:
+        asyncio.run(serve_forever(args))
+    except KeyboardInterrupt:
+        pass
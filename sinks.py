@@ -0,0 +1,92 @@
+import sys
+
+DEFAULT_BUFFER_SIZE = 8192
+
+
+class Sink:
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, flush_every=None):
+        self.buffer_size = buffer_size
+        self.flush_every = flush_every
+        self.buffer = []
+        self.buffered = 0
+        self.writes = 0
+        self.written = 0
+
+    def append(self, text):
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.buffer_size:
+            self.flush()
+        elif self.flush_every is not None:
+            self.writes += 1
+            if self.writes >= self.flush_every:
+                self.flush()
+
+    def flush(self):
+        if self.buffer:
+            text = "".join(self.buffer)
+            self.buffer.clear()
+            self.write(text)
+            self.written += len(text)
+        self.buffered = 0
+        self.writes = 0
+
+    def write(self, text):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+
+class FileSink(Sink):
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_every=None, mode='w'):
+        super().__init__(buffer_size, flush_every)
+        self.path = path
+        self.mode = mode
+        self.file = None
+        self.closed = False
+
+    def write(self, text):
+        if self.file is None:
+            self.file = open(self.path, self.mode)
+        self.file.write(text)
+        self.file.flush()
+
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        if self.file is None:
+            self.file = open(self.path, self.mode)
+        self.file.close()
+        self.closed = True
+
+
+class StdoutSink(Sink):
+    def write(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+
+class MemorySink(Sink):
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE, flush_every=None):
+        super().__init__(buffer_size, flush_every)
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+    def getvalue(self):
+        self.flush()
+        return "".join(self.chunks)
+
+
+class CallbackSink(Sink):
+    def __init__(self, callback, buffer_size=DEFAULT_BUFFER_SIZE,
+                 flush_every=None):
+        super().__init__(buffer_size, flush_every)
+        self.callback = callback
+
+    def write(self, text):
+        self.callback(text)
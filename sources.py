@@ -0,0 +1,59 @@
+import re
+from exceptions import ReadError
+
+DEFAULT_CHUNK_SIZE = 65536
+TOKEN = re.compile(rb'\s*(\S+)')
+INPUT_EXHAUSTED = "Входные данные введены не полностью."
+
+
+class InputBuffer:
+    def __init__(self, stream=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.data = b''
+        self.cursor = 0
+        self.offset = 0
+        # False while more data may still be fed, see AsyncInterpreter.
+        self.eof = True
+
+    def feed(self, data):
+        if isinstance(data, str):
+            data = data.encode()
+        self.data = self.data[self.cursor:] + data
+        self.cursor = 0
+
+    def fill(self):
+        if self.stream is None:
+            return False
+        read = getattr(self.stream, 'read1', self.stream.read)
+        chunk = read(self.chunk_size)
+        if not chunk:
+            self.close()
+            return False
+        self.offset += len(chunk)
+        self.feed(chunk)
+        return True
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def read_char(self):
+        if self.cursor >= len(self.data) and not self.fill():
+            raise ReadError(INPUT_EXHAUSTED)
+        value = self.data[self.cursor]
+        self.cursor += 1
+        return value
+
+    def read_token(self):
+        while True:
+            match = TOKEN.match(self.data, self.cursor)
+            if match is not None and match.end() < len(self.data):
+                break
+            if not self.fill():
+                if match is None or not self.eof:
+                    raise ReadError(INPUT_EXHAUSTED)
+                break
+        self.cursor = match.end()
+        return match.group(1)
@@ -0,0 +1,103 @@
+from array import array
+from interpreter import Interpreter, OPCODES, UNKNOWN, IMPURE_OPCODES
+from playfield import SparsePlayfield, SPACE, TILE_BITS, TILE_SIZE, TILE_MASK
+from exceptions import ReadError, Halt, ResourceLimitError
+
+SPACE_OPCODE = OPCODES[SPACE]
+
+
+class SparseInterpreter(Interpreter):
+    playfield_class = SparsePlayfield
+
+    def __init__(self, width=None, height=None, output=None, stack=None,
+                 seed=None):
+        super().__init__(width, height, output, stack, seed)
+        self.x = self.y = 0
+
+    @property
+    def xpos(self):
+        return self.x
+
+    @xpos.setter
+    def xpos(self, x):
+        self.x = x
+
+    @property
+    def ypos(self):
+        return self.y
+
+    @ypos.setter
+    def ypos(self, y):
+        self.y = y
+
+    def move_pointer(self):
+        self.x, self.y = self.playfield.next(self.x, self.y, self.direction)
+
+    def current_cell(self):
+        return self.playfield.get(self.x, self.y)
+
+    def write_cell(self, x, y, value):
+        self.playfield.put(x, y, value)
+        opcode = OPCODES.get(value, UNKNOWN)
+        if opcode in IMPURE_OPCODES:
+            self.impure = True
+        if self.code is None:
+            return
+        key = (x >> TILE_BITS, y >> TILE_BITS)
+        tile = self.code.get(key)
+        if tile is None:
+            if opcode == SPACE_OPCODE:
+                return
+            tile = self.code[key] = bytearray([SPACE_OPCODE]) * TILE_SIZE ** 2
+        tile[(y & TILE_MASK) << TILE_BITS | x & TILE_MASK] = opcode
+
+    def compile_code(self):
+        return {key: bytearray(OPCODES.get(value, UNKNOWN) for value in tile)
+                for key, tile in self.playfield.tiles.items()}
+
+    def execute(self, steps):
+        code = self.code
+        handlers = self.handlers
+        quote_handlers = self.quote_handlers
+        next_cell = self.playfield.next
+        tick = 0
+        try:
+            for tick in range(steps):
+                x, y = self.x, self.y
+                tile = code.get((x >> TILE_BITS, y >> TILE_BITS))
+                if tile is None:
+                    opcode = SPACE_OPCODE
+                else:
+                    opcode = tile[(y & TILE_MASK) << TILE_BITS | x & TILE_MASK]
+                if self.quote_mode:
+                    quote_handlers[opcode]()
+                else:
+                    handlers[opcode]()
+                self.x, self.y = next_cell(self.x, self.y, self.direction)
+        except Halt:
+            self.steps += tick + 1
+            raise
+        except (ReadError, ResourceLimitError):
+            self.steps += tick
+            raise
+        self.steps += steps
+
+    def space_snapshot(self):
+        playfield = self.playfield
+        return {
+            'bounds': [playfield.left, playfield.top, playfield.right,
+                       playfield.bottom],
+            'tiles': [[tx, ty, tile.tolist()]
+                      for (tx, ty), tile in playfield.tiles.items()],
+            'x': self.x,
+            'y': self.y,
+        }
+
+    def restore_space(self, state):
+        self.playfield = SparsePlayfield(0, 0)
+        self.playfield.left, self.playfield.top, self.playfield.right, \
+            self.playfield.bottom = state['bounds']
+        self.playfield.tiles = {(tx, ty): array('l', tile)
+                                for tx, ty, tile in state['tiles']}
+        self.x = state['x']
+        self.y = state['y']
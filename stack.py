@@ -1,14 +1,96 @@
+import sys
+from array import array
+
+
 class Stack:
     def __init__(self):
         self.stack = []
 
     def __iter__(self):
-        return self.stack
+        return iter(self.stack)
+
+    def __len__(self):
+        return len(self.stack)
 
     def pop(self):
-        if self.stack:
+        try:
             return self.stack.pop()
-        return 0
+        except IndexError:
+            return 0
+
+    def pop2(self):
+        stack = self.stack
+        try:
+            top = stack.pop()
+        except IndexError:
+            return 0, 0
+        try:
+            return stack.pop(), top
+        except IndexError:
+            return 0, top
+
+    def memory(self):
+        if isinstance(self.stack, array):
+            return sys.getsizeof(self.stack)
+        return sys.getsizeof(self.stack) + sum(map(sys.getsizeof, self.stack))
+
+    def peek(self):
+        try:
+            return self.stack[-1]
+        except IndexError:
+            return 0
 
     def append(self, n):
-        self.stack.append(n)
\ No newline at end of file
+        self.stack.append(n)
+
+    def extend(self, values):
+        self.stack.extend(values)
+
+    def dup(self):
+        stack = self.stack
+        try:
+            stack.append(stack[-1])
+        except IndexError:
+            stack.append(0)
+            stack.append(0)
+
+    def swap(self):
+        stack = self.stack
+        try:
+            stack[-2], stack[-1] = stack[-1], stack[-2]
+        except IndexError:
+            while len(stack) < 2:
+                stack.insert(0, 0)
+            stack[-2], stack[-1] = stack[-1], stack[-2]
+
+    def load(self, values):
+        self.stack[:] = values
+
+
+class CompactStack(Stack):
+    def __init__(self):
+        self.stack = array('q')
+
+    def append(self, n):
+        try:
+            self.stack.append(n)
+        except (OverflowError, TypeError):
+            self.stack = list(self.stack)
+            self.stack.append(n)
+
+    def extend(self, values):
+        if not isinstance(values, list):
+            values = list(values)
+        try:
+            values = array('q', values)
+        except (OverflowError, TypeError):
+            self.stack = list(self.stack)
+        self.stack.extend(values)
+
+    def load(self, values):
+        if not isinstance(values, list):
+            values = list(values)
+        try:
+            self.stack = array('q', values)
+        except (OverflowError, TypeError):
+            self.stack = list(values)
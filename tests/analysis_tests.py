@@ -0,0 +1,60 @@
+import unittest
+from analysis import Analysis
+from interpreter import Direction
+from playfield import Playfield
+
+
+def analyze(*lines):
+    return Analysis(Playfield.from_lines(lines))
+
+
+class AnalysisTests(unittest.TestCase):
+    def test_dead_cells(self):
+        analysis = analyze('1.@5', '  7 ')
+        self.assertEqual(analysis.dead_cells, [3, 6])
+        self.assertEqual(analysis.reachable_cells, {0, 1, 2})
+
+    def test_branches_reach_both_sides(self):
+        analysis = analyze('v  ', '_.@', '  7')
+        self.assertEqual(analysis.reachable_cells, {0, 3, 4, 5})
+        self.assertEqual(analysis.dead_cells, [8])
+
+    def test_writes(self):
+        self.assertFalse(analyze('12+.@').writes)
+        self.assertTrue(analyze('v', '>000p@').writes)
+        self.assertFalse(analyze('"p"@').writes)
+        self.assertFalse(analyze('@p').writes)
+
+    def test_reads(self):
+        self.assertTrue(analyze('&.@').reads)
+        self.assertFalse(analyze('1.@&').reads)
+
+    def test_infinite_loop_without_side_effects(self):
+        analysis = analyze('>1v', '^ <')
+        self.assertEqual(len(analysis.loops), 1)
+        self.assertEqual(len(analysis.loops[0]), 6)
+        self.assertEqual(analyze('>1.v', '^  <').loops, [])
+
+    def test_constant_folds(self):
+        analysis = analyze('12+3*.@')
+        self.assertEqual([value for _, value in analysis.folds], [3, 9])
+        self.assertEqual(analyze('&2+.@').folds, [])
+        self.assertEqual(analyze('10/.@').folds, [])
+
+    def test_basic_blocks(self):
+        analysis = analyze('v  ', '_.@')
+        self.assertEqual(analysis.blocks, [
+            [(0, Direction.RIGHT, False), (3, Direction.DOWN, False)],
+            [(4, Direction.RIGHT, False), (5, Direction.RIGHT, False)],
+            [(5, Direction.LEFT, False)],
+        ])
+
+    def test_start_state(self):
+        playfield = Playfield.from_lines(['@ p'])
+        self.assertFalse(Analysis(playfield).writes)
+        self.assertTrue(Analysis(playfield,
+                                 (2, Direction.RIGHT, False)).writes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from interpreter import Status
+from async_interpreter import AsyncInterpreter
+from server import serve
+
+SUM = ['0>&:#v_$.@',
+       ' ^  +<']
+
+
+class Writer:
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+class AsyncInterpreterTests(unittest.TestCase):
+    def session(self, lines, *chunks, timeout=None, max_steps=None):
+        async def run():
+            server = await serve(lines, '127.0.0.1', 0, 100,
+                                 max_steps, timeout)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            for chunk in chunks:
+                writer.write(chunk)
+                await writer.drain()
+                await asyncio.sleep(0.01)
+            writer.write_eof()
+            output = await reader.read()
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return output
+        return asyncio.run(run())
+
+    def test_session(self):
+        self.assertEqual(self.session(SUM, b'1 2 3 0\n'), b'6 ')
+
+    def test_input_split_between_packets(self):
+        self.assertEqual(self.session(SUM, b'1', b'2\n', b'30 0'), b'42 ')
+
+    def test_end_of_input(self):
+        self.assertEqual(self.session(['&&+.@'], b'5'), b'')
+
+    def test_output_streams_before_halt(self):
+        self.assertEqual(self.session(['>1.v', '^  <'], max_steps=40),
+                         b'1 ' * 5)
+
+    def test_sessions_share_event_loop(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_eof()
+            endless = AsyncInterpreter(reader, Writer(), 100)
+            endless.program = ['>v', '^<']
+            quick = AsyncInterpreter(reader, Writer(), 100)
+            quick.program = ['99*>1-:v', '   ^   _@']
+            finished = []
+
+            async def track(name, interpreter, timeout):
+                status = await interpreter.run(timeout=timeout)
+                finished.append(name)
+                return status
+
+            statuses = await asyncio.gather(track('endless', endless, 0.5),
+                                            track('quick', quick, None))
+            return finished, statuses
+        finished, statuses = asyncio.run(run())
+        self.assertEqual(finished, ['quick', 'endless'])
+        self.assertEqual(statuses, [Status.TIMED_OUT, Status.HALTED])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import json
+import unittest
+from batch import run_job, run_batch
+
+
+class BatchTests(unittest.TestCase):
+    def test_halted_job(self):
+        result = run_job({'id': 'sum', 'program': '&&+.@', 'input': '2 3'})
+        self.assertEqual(result['id'], 'sum')
+        self.assertEqual(result['status'], 'halted')
+        self.assertEqual(result['output'], '5 ')
+
+    def test_step_limit(self):
+        result = run_job({'program': '>1.v\n^  <', 'max_steps': 13})
+        self.assertEqual(result['status'], 'budget-exhausted')
+        self.assertEqual(result['output'], '1 1 ')
+
+    def test_time_limit(self):
+        result = run_job({'program': '>v\n^<', 'timeout': 0.05})
+        self.assertEqual(result['status'], 'timeout')
+
+    def test_needs_input(self):
+        result = run_job({'program': '&.@'})
+        self.assertEqual(result['status'], 'needs-input')
+
+    def test_error(self):
+        result = run_job({'program': '10/.@'})
+        self.assertEqual(result['status'], 'error')
+        self.assertIn('ZeroDivisionError', result['error'])
+
+    def test_seed(self):
+        job = {'program': 'v>1.v\n>?2.v\n >3.v\n^   <', 'max_steps': 500,
+               'seed': 5}
+        self.assertEqual(run_job(job)['output'], run_job(job)['output'])
+
+    def test_results_keep_manifest_order(self):
+        jobs = [{'id': n, 'program': f'{n}.@'} for n in range(10)]
+        results = io.StringIO()
+        run_batch(jobs, results, workers=2)
+        lines = [json.loads(line) for line in results.getvalue().split('\n')
+                 if line]
+        self.assertEqual([line['output'] for line in lines],
+                         [f'{n} ' for n in range(10)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from cache import ResultCache, TeeSink, is_pure
+from interpreter import Interpreter, Status
+from playfield import Playfield
+from sinks import MemorySink
+
+SQUARES = ['0>:1+:*.:9`#@_1+:v',
+           ' ^               <']
+
+
+class CacheTests(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResultCache(':memory:')
+
+    def tearDown(self):
+        self.cache.close()
+
+    def run_program(self, lines, *args):
+        interpreter = Interpreter()
+        interpreter.program = lines
+        status = interpreter.run(*args, cache=self.cache)
+        return interpreter, status
+
+    def test_purity(self):
+        self.assertTrue(is_pure(Playfield.from_lines(['12+.@'])))
+        for program in ('?@', '&.@', '~.@'):
+            self.assertFalse(is_pure(Playfield.from_lines([program])))
+
+    def test_cached_result(self):
+        first, status = self.run_program(SQUARES)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 1))
+        second, status = self.run_program(SQUARES)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(second.output.getvalue(), first.output.getvalue())
+        self.assertEqual(second.steps, first.steps)
+        self.assertEqual(second.snapshot(), first.snapshot())
+        self.assertIsNone(second.random)
+
+    def test_impure_programs_are_not_cached(self):
+        self.run_program(['1.@?'])
+        self.run_program(['1.@?'])
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+    def test_written_impure_command_is_not_cached(self):
+        for _ in range(2):
+            interpreter, status = self.run_program(['"?"40p@ '])
+            self.assertEqual(status, Status.HALTED)
+        self.assertEqual(self.cache.hits, 0)
+        self.assertEqual(self.cache.size(), 0)
+
+    def test_step_limit(self):
+        first, _ = self.run_program(SQUARES)
+        _, status = self.run_program(SQUARES, first.steps - 1)
+        self.assertEqual(status, Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.cache.hits, 0)
+        _, status = self.run_program(SQUARES, first.steps)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_step_limit_after_some_steps(self):
+        def resume(*args):
+            interpreter = Interpreter()
+            interpreter.program = SQUARES
+            interpreter.step(5)
+            return interpreter, interpreter.run(*args, cache=self.cache)
+
+        first, _ = resume()
+        remaining = first.steps - 5
+        second, status = resume(remaining - 1)
+        self.assertEqual(status, Status.BUDGET_EXHAUSTED)
+        self.assertEqual(second.steps, first.steps - 1)
+        self.assertEqual(self.cache.hits, 0)
+        second, status = resume(remaining)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(second.steps, first.steps)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_input_is_part_of_key(self):
+        interpreter = Interpreter()
+        interpreter.program = ['1.@']
+        interpreter.input_data.feed('5')
+        interpreter.run(cache=self.cache)
+        self.run_program(['1.@'])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_lru_eviction(self):
+        self.cache.max_bytes = 400
+        for digit in '12345':
+            self.run_program([digit + '.@'])
+        self.run_program(['1.@'])
+        self.assertLessEqual(self.cache.size(), 400)
+        self.assertEqual(self.cache.hits, 0)
+        self.run_program(['5.@'])
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_tee_drops_output_over_limit(self):
+        sink = MemorySink()
+        tee = TeeSink(sink, 5)
+        tee.append('abc')
+        tee.flush()
+        tee.append('def')
+        self.assertIsNone(tee.getvalue())
+        self.assertEqual(sink.getvalue(), 'abcdef')
+
+    def test_output_larger_than_cache_is_not_kept(self):
+        self.cache.max_bytes = 10
+        interpreter, status = self.run_program(SQUARES)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(interpreter.output.getvalue(),
+                         '1 4 9 16 25 36 49 64 81 100 121 ')
+        self.assertEqual(self.cache.size(), 0)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_file_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'cache', 'results.sqlite')
+            cache = ResultCache(path)
+            interpreter = Interpreter()
+            interpreter.program = SQUARES
+            interpreter.run(cache=cache)
+            cache.close()
+            cache = ResultCache(path)
+            interpreter = Interpreter()
+            interpreter.program = SQUARES
+            interpreter.run(cache=cache)
+            self.assertEqual(cache.hits, 1)
+            cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
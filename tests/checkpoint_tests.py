@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+from interpreter import Interpreter, Status
+from checkpoint import Checkpointer
+from stack import CompactStack
+from sources import InputBuffer
+from exceptions import CheckpointError
+
+WALK = ['v>1.v', '>?2.v', ' >3.v', '^   <']
+
+
+class CheckpointTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'state.bin')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertRoundTrip(self, interpreter, use_mmap=False, stack=None):
+        interpreter.save_state(self.path, use_mmap)
+        restored = Interpreter(stack=stack)
+        restored.load_state(self.path, use_mmap)
+        self.assertEqual(restored.snapshot(), interpreter.snapshot())
+        return restored
+
+    def test_round_trip(self):
+        interpreter = Interpreter(seed=1)
+        interpreter.program = WALK
+        interpreter.input_data.feed('12 ab')
+        interpreter.step(101)
+        self.assertRoundTrip(interpreter)
+
+    def test_without_random_generator(self):
+        interpreter = Interpreter(seed=1)
+        interpreter.program = ['>1v', '^ <']
+        interpreter.step(50)
+        restored = self.assertRoundTrip(interpreter)
+        self.assertIsNone(interpreter.random)
+        self.assertIsNone(restored.random)
+
+    def test_quote_mode_and_big_integers(self):
+        interpreter = Interpreter()
+        interpreter.program = ['"' + 'x' * 10]
+        interpreter.stack.extend([2 ** 70, -2 ** 64, 5, -(2 ** 63)])
+        interpreter.step(4)
+        self.assertTrue(interpreter.quote_mode)
+        self.assertRoundTrip(interpreter)
+        self.assertRoundTrip(interpreter, stack=CompactStack())
+
+    def test_wide_cells(self):
+        interpreter = Interpreter()
+        interpreter.program = ['01-00p@']
+        interpreter.run()
+        narrow = self.assertRoundTrip(interpreter)
+        self.assertEqual(narrow.playfield.get(0, 0), -1)
+        size = os.path.getsize(self.path)
+        interpreter.write_cell(0, 0, ord('0'))
+        interpreter.save_state(self.path)
+        self.assertLess(os.path.getsize(self.path), size)
+
+    def test_resume_continues_the_run(self):
+        reference = Interpreter(seed=5)
+        reference.program = WALK
+        reference.run(1000)
+        interpreter = Interpreter(seed=5)
+        interpreter.program = WALK
+        interpreter.run(400)
+        interpreter.save_state(self.path)
+        restored = Interpreter()
+        restored.load_state(self.path)
+        restored.run(600)
+        self.assertEqual(interpreter.output.getvalue()
+                         + restored.output.getvalue(),
+                         reference.output.getvalue())
+        self.assertEqual(restored.steps, 1000)
+
+    def test_mmap_is_copy_on_write(self):
+        interpreter = Interpreter()
+        interpreter.program = ['"A"00p.@']
+        restored = self.assertRoundTrip(interpreter, use_mmap=True)
+        self.assertIsInstance(restored.playfield.cells, memoryview)
+        self.assertEqual(restored.run(), Status.HALTED)
+        self.assertEqual(restored.playfield.get(0, 0), ord('A'))
+        again = Interpreter()
+        again.load_state(self.path, use_mmap=True)
+        self.assertEqual(again.playfield.get(0, 0), ord('"'))
+
+    def test_input_stream_position(self):
+        with open(os.path.join(self.directory.name, 'input'), 'wb') as f:
+            f.write(b'1 2 3 4')
+        interpreter = Interpreter()
+        interpreter.program = ['&.&.&.&.@']
+        interpreter.input_data = InputBuffer(open(f.name, 'rb'), chunk_size=2)
+        interpreter.step(4)
+        interpreter.save_state(self.path)
+        interpreter.input_data.close()
+        restored = Interpreter()
+        restored.input_data = InputBuffer(open(f.name, 'rb'), chunk_size=2)
+        restored.load_state(self.path)
+        self.assertEqual(restored.run(), Status.HALTED)
+        restored.input_data.close()
+        self.assertEqual(restored.output.getvalue(), '3 4 ')
+
+    def test_checkpointer(self):
+        interpreter = Interpreter()
+        interpreter.program = ['>1.v', '^  <']
+        interpreter.run(25000, checkpoint=Checkpointer(self.path, 15000))
+        restored = Interpreter()
+        restored.load_state(self.path)
+        self.assertEqual(restored.steps, 20000)
+
+    def test_not_a_checkpoint(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'{"cells": []}')
+        with self.assertRaises(CheckpointError):
+            Interpreter().load_state(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
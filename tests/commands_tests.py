@@ -1,16 +1,21 @@
 import unittest
-from interpreter import Interpreter
+from interpreter import Interpreter, Direction, OPCODES
+from sinks import MemorySink
 from exceptions import ReadError
 
 
 class CommandsTest(unittest.TestCase):
     def setUp(self):
-        self.interpreter = Interpreter()
+        self.interpreter = Interpreter(output=MemorySink())
 
     def move(self):
         self.interpreter.execute_command()
         self.interpreter.move_pointer()
 
+    def test_position_without_program(self):
+        self.assertEqual((self.interpreter.xpos, self.interpreter.ypos),
+                         (0, 0))
+
     def test_up_command(self):
         self.interpreter.program = [['^'], [' '], ['@'], [' ']]
         self.move()
@@ -32,6 +37,13 @@ class CommandsTest(unittest.TestCase):
         self.assertEqual(self.interpreter.ypos, 1)
         self.assertEqual(self.interpreter.xpos, 0)
 
+    def test_down_into_short_line(self):
+        self.interpreter.program = [['>', 'v'], ['@']]
+        for _ in range(3):
+            self.move()
+        self.assertEqual(self.interpreter.ypos, 0)
+        self.assertEqual(self.interpreter.xpos, 1)
+
     def test_left_command(self):
         self.interpreter.program = [['<', '@', ' ']]
         self.move()
@@ -75,6 +87,35 @@ class CommandsTest(unittest.TestCase):
         self.interpreter.change_mode()
         self.assertTrue(self.interpreter.quote_mode)
 
+    def test_random_direction(self):
+        self.interpreter.program = [list('?')]
+        directions = set()
+        for _ in range(100):
+            self.move()
+            directions.add(self.interpreter.direction)
+        self.assertEqual(directions, set(Direction))
+
+    def test_generator_is_created_on_first_use(self):
+        self.assertIsNone(self.interpreter.random)
+        self.interpreter.program = [list('?')]
+        self.move()
+        self.assertIsNotNone(self.interpreter.random)
+
+    def test_dispatch_table_is_shared(self):
+        self.assertIs(Interpreter().commands, Interpreter().commands)
+
+    def test_random_direction_is_seeded(self):
+        sequences = []
+        for _ in range(2):
+            interpreter = Interpreter(seed=7)
+            interpreter.program = [list('?')]
+            sequence = []
+            for _ in range(50):
+                interpreter.execute_command()
+                sequence.append(interpreter.direction)
+            sequences.append(sequence)
+        self.assertEqual(sequences[0], sequences[1])
+
     def test_copy_stack(self):
         self.interpreter.stack.append(1)
         self.interpreter.copy_stack_top()
@@ -108,6 +149,16 @@ class CommandsTest(unittest.TestCase):
         self.interpreter.put()
         self.assertEqual(self.interpreter.program, [['p', '@', 'a']])
 
+    def test_put_recompiles_cell(self):
+        self.interpreter.program = [['p', '@', ' ']]
+        self.interpreter.compile()
+        self.interpreter.stack.append(ord('>'))
+        self.interpreter.stack.append(2)
+        self.interpreter.stack.append(0)
+        self.interpreter.put()
+        self.assertEqual(list(self.interpreter.code),
+                         [OPCODES[ord(symbol)] for symbol in 'p@>'])
+
     def test_get(self):
         self.interpreter.stack.append(2)
         self.interpreter.stack.append(0)
@@ -172,7 +223,7 @@ class CommandsTest(unittest.TestCase):
 
     def test_input_number_if_exits(self):
         self.interpreter.program = [['&', '@']]
-        self.interpreter.input_data.put(3)
+        self.interpreter.input_data.feed('3')
         self.move()
         self.assertEqual(self.interpreter.stack.stack, [3])
 
@@ -181,13 +232,13 @@ class CommandsTest(unittest.TestCase):
             self.interpreter.input_number()
 
     def test_input_number_if_char(self):
-        self.interpreter.input_data.put('a')
+        self.interpreter.input_data.feed('a')
         self.interpreter.input_number()
         self.assertRaises(ValueError)
 
     def test_input_char(self):
         self.interpreter.program = [['~', '@']]
-        self.interpreter.input_data.put('a')
+        self.interpreter.input_data.feed('a')
         self.move()
         self.assertEqual(self.interpreter.stack.stack, [97])
 
@@ -199,13 +250,19 @@ class CommandsTest(unittest.TestCase):
         self.interpreter.program = [['.', '@']]
         self.interpreter.stack.append(5)
         self.move()
-        self.assertEqual(self.interpreter.output, ['5 '])
+        self.assertEqual(self.interpreter.output.getvalue(), '5 ')
 
     def test_print_char(self):
         self.interpreter.program = [[',', '@']]
         self.interpreter.stack.append(97)
         self.move()
-        self.assertEqual(self.interpreter.output, ['a'])
+        self.assertEqual(self.interpreter.output.getvalue(), 'a')
+
+    def test_digit_in_string_mode(self):
+        self.interpreter.program = [list('"7"')]
+        self.move()
+        self.move()
+        self.assertEqual(self.interpreter.stack.stack, [55])
 
     def test_unknown_command(self):
         self.interpreter.program = [['(', '@']]
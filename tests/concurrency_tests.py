@@ -0,0 +1,95 @@
+import json
+import time
+import unittest
+from interpreter import Status
+from concurrency import ConcurrentInterpreter, run_parallel, pointer_seed
+from benchmarks.concurrency import split_lines
+
+SPLIT = ['#@2.t1.@']
+
+
+class ConcurrencyTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = ConcurrentInterpreter()
+
+    def test_round_robin(self):
+        self.interpreter.program = SPLIT
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), '2 0 1 ')
+        self.assertEqual(self.interpreter.steps, 10)
+
+    def test_child_copies_the_stack(self):
+        self.interpreter.program = ['#@:.t7@']
+        self.interpreter.stack.append(5)
+        self.interpreter.run()
+        self.assertEqual(self.interpreter.output.getvalue(), '5 5 ')
+
+    def test_single_pointer_matches_interpreter(self):
+        self.interpreter.program = ['"!ih",,,@']
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), 'hi!')
+        self.assertEqual(self.interpreter.steps, 9)
+
+    def test_snapshot(self):
+        self.interpreter.program = SPLIT
+        self.interpreter.step(6)
+        state = json.loads(json.dumps(self.interpreter.snapshot()))
+        restored = ConcurrentInterpreter()
+        restored.restore(state)
+        restored.run()
+        self.assertEqual(self.interpreter.output.getvalue()
+                         + restored.output.getvalue(), '2 0 1 ')
+        self.assertEqual(restored.steps, 10)
+
+    def test_parallel(self):
+        lines = split_lines(3, '"d"')
+        self.interpreter.program = lines
+        self.assertEqual(run_parallel(self.interpreter, 2), Status.HALTED)
+        reference = ConcurrentInterpreter()
+        reference.program = lines
+        reference.run()
+        self.assertEqual(self.interpreter.output.getvalue(),
+                         reference.output.getvalue())
+        self.assertEqual(self.interpreter.steps, reference.steps)
+
+    def test_parallel_output_order(self):
+        self.interpreter.program = ['1.#vt2.#vt4.@', '   3    5',
+                                    '   .    .', '   @    @']
+        run_parallel(self.interpreter, 2, 100)
+        self.assertEqual(self.interpreter.output.getvalue(), '1 3 2 5 4 ')
+
+    def test_parallel_step_budget(self):
+        self.interpreter.program = ['>v', '^<']
+        self.assertEqual(run_parallel(self.interpreter, 2, 1000),
+                         Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.steps, 1000)
+
+    def test_parallel_fork_loop_budget(self):
+        self.interpreter.program = ['>t v', '^  <']
+        self.assertEqual(run_parallel(self.interpreter, 2, 2000),
+                         Status.BUDGET_EXHAUSTED)
+        self.assertLessEqual(self.interpreter.steps, 2000)
+
+    def test_parallel_timeout(self):
+        self.interpreter.program = ['>v', '^<']
+        start = time.monotonic()
+        self.assertEqual(run_parallel(self.interpreter, 2, timeout=0.2),
+                         Status.TIMED_OUT)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertFalse(self.interpreter.halted)
+
+    def test_pointer_seeds(self):
+        self.assertEqual(pointer_seed(7, ()), 7)
+        self.assertIsNone(pointer_seed(None, (0,)))
+        seeds = {pointer_seed(7, path) for path in ((0,), (1,), (0, 0))}
+        self.assertEqual(len(seeds), 3)
+        self.assertEqual(pointer_seed(7, (0, 1)), pointer_seed(7, (0, 1)))
+
+    def test_parallel_falls_back_with_put(self):
+        self.interpreter.program = ['#@2.t1.@', '00p']
+        self.assertEqual(run_parallel(self.interpreter, 2), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), '2 0 1 ')
+
+
+if __name__ == '__main__':
+    unittest.main()
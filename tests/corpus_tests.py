@@ -0,0 +1,35 @@
+import unittest
+from interpreter import Interpreter, Status
+from jit import JitInterpreter
+from benchmarks.corpus import WORKLOADS
+from benchmarks.harness import prepare
+
+
+class CorpusTest(unittest.TestCase):
+    def test_workloads_halt(self):
+        for workload in WORKLOADS:
+            with self.subTest(workload.name):
+                interpreter = prepare(Interpreter, workload)
+                self.assertEqual(interpreter.run(), Status.HALTED)
+
+    def test_engines_agree(self):
+        for workload in WORKLOADS:
+            with self.subTest(workload.name):
+                reference = prepare(Interpreter, workload)
+                traced = prepare(JitInterpreter, workload)
+                reference.run()
+                traced.run()
+                self.assertEqual(traced.output.getvalue(),
+                                 reference.output.getvalue())
+                self.assertEqual(traced.steps, reference.steps)
+
+    def test_quine(self):
+        workload = next(workload for workload in WORKLOADS
+                        if workload.name == 'quine')
+        interpreter = prepare(Interpreter, workload)
+        interpreter.run()
+        self.assertEqual(interpreter.output.getvalue(), workload.lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
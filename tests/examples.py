@@ -2,7 +2,7 @@ import math
 import pathlib
 import random
 import unittest
-from interpreter import Interpreter
+from interpreter import Interpreter, Status
 
 
 class ExampleTests(unittest.TestCase):
@@ -10,8 +10,7 @@ class ExampleTests(unittest.TestCase):
         self.interpreter = Interpreter()
 
     def tearDown(self):
-        files = [pathlib.Path('test_program.txt'), pathlib.Path('output.txt'),
-                 pathlib.Path('input.txt')]
+        files = [pathlib.Path('test_program.txt'), pathlib.Path('input.txt')]
         for f in files:
             try:
                 f.unlink()
@@ -22,22 +21,18 @@ class ExampleTests(unittest.TestCase):
         with open('test_program.txt', 'w') as f:
             f.write('25*"!dlroW ,olleH" >:#,_@')
         self.interpreter.load_file('test_program.txt')
-        with self.assertRaises(SystemExit):
-            self.interpreter.run()
-        with open('output.txt', 'r') as h:
-            line = h.readline()
-            self.assertEqual(line.rstrip('\n'), 'Hello, World!')
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        line = self.interpreter.output.getvalue()
+        self.assertEqual(line.rstrip('\n'), 'Hello, World!')
 
     def test_fourth_factorial(self):
         with open('test_program.txt', 'w') as f:
             f.write('44* >:1-:v    v ,*25 .:* ,,,,"! = ".:_ @ '
                     '\n    ^    _ $1 > \:                   ^ ')
         self.interpreter.load_file('test_program.txt')
-        with self.assertRaises(SystemExit):
-            self.interpreter.run()
-        with open('output.txt', 'r') as h:
-            lines = h.readlines()
-            self.assertEqual(lines[3].rstrip('\n '), '4 ! = 24')
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        lines = self.interpreter.output.getvalue().splitlines(keepends=True)
+        self.assertEqual(lines[3].rstrip('\n '), '4 ! = 24')
 
     def test_fibonacci_numbers(self):
         with open('test_program.txt', 'w') as f:
@@ -45,12 +40,10 @@ class ExampleTests(unittest.TestCase):
                     '\n             | :-1,,", "p23 p13 <'
                     '\n             > "."::,,,@')
         self.interpreter.load_file('test_program.txt')
-        with self.assertRaises(SystemExit):
-            self.interpreter.run()
-        with open('output.txt', 'r') as h:
-            lines = h.readlines()
-            self.assertEqual(*lines, '1 , 1 , 2 , 3 , 5 , 8 , 13 , 21 , 34 , '
-                                     '55 , 89 , 144 , 233 , ...')
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        lines = self.interpreter.output.getvalue().splitlines(keepends=True)
+        self.assertEqual(*lines, '1 , 1 , 2 , 3 , 5 , 8 , 13 , 21 , 34 , '
+                                 '55 , 89 , 144 , 233 , ...')
 
     def test_random_factorial(self):
         rnd = random.randint(2, 10)
@@ -59,11 +52,9 @@ class ExampleTests(unittest.TestCase):
         with open('input.txt', 'w') as g:
             g.write(str(rnd))
         self.interpreter.load_file('test_program.txt', 'input.txt')
-        with self.assertRaises(SystemExit):
-            self.interpreter.run()
-        with open('output.txt', 'r') as h:
-            line = h.readline()
-            self.assertEqual(line.rstrip(' '), str(math.factorial(rnd)))
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        line = self.interpreter.output.getvalue()
+        self.assertEqual(line.rstrip(' '), str(math.factorial(rnd)))
 
     def test_gcd(self):
         rnd1 = random.randint(2, 200)
@@ -73,11 +64,9 @@ class ExampleTests(unittest.TestCase):
         with open('input.txt', 'w') as g:
             g.write(f'{rnd1} {rnd2}')
         self.interpreter.load_file('test_program.txt', 'input.txt')
-        with self.assertRaises(SystemExit):
-            self.interpreter.run()
-        with open('output.txt', 'r') as h:
-            line = h.readline()
-            self.assertEqual(line.rstrip(' '), str(math.gcd(rnd1, rnd2)))
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        line = self.interpreter.output.getvalue()
+        self.assertEqual(line.rstrip(' '), str(math.gcd(rnd1, rnd2)))
 
 
 if __name__ == '__main__':
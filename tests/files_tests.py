@@ -1,5 +1,6 @@
 import unittest
 from interpreter import Interpreter
+from exceptions import ReadError
 import pathlib
 
 
@@ -35,9 +36,33 @@ class FileTests(unittest.TestCase):
         with open('input.txt', 'w') as f:
             f.write('7 4 a b')
         self.interpreter.load_file('program.txt', 'input.txt')
+        tokens = []
+        with self.assertRaises(ReadError):
+            while True:
+                tokens.append(self.interpreter.input_data.read_token())
         with open('input.txt', 'r') as f:
-            self.assertEqual(f.read(),
-                             " ".join(list(self.interpreter.input_data.queue)))
+            self.assertEqual(f.read().encode(), b" ".join(tokens))
+
+    def test_reading_multiline_input_data(self):
+        with open('program.txt', 'w') as f:
+            f.write('&&+.@')
+        with open('input.txt', 'w') as f:
+            f.write('12\n30\n')
+        self.interpreter.load_file('program.txt', 'input.txt')
+        self.interpreter.input_number()
+        self.interpreter.input_number()
+        self.assertEqual(self.interpreter.stack.stack, [12, 30])
+
+    def test_reading_chars_after_number(self):
+        with open('program.txt', 'w') as f:
+            f.write('&~~@')
+        with open('input.txt', 'w') as f:
+            f.write('7 ab')
+        self.interpreter.load_file('program.txt', 'input.txt')
+        self.interpreter.input_number()
+        self.interpreter.input_char()
+        self.interpreter.input_char()
+        self.assertEqual(self.interpreter.stack.stack, [7, 32, 97])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,99 @@
+import unittest
+from interpreter import Interpreter, Status
+from jit import JitInterpreter, MAX_TRACE_LENGTH
+from benchmarks.corpus import WORKLOADS
+from sinks import MemorySink
+
+
+class JitTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = JitInterpreter(output=MemorySink())
+
+    def run_program(self, *lines):
+        self.interpreter.program = [list(line) for line in lines]
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        return self.interpreter.output.getvalue()
+
+    def test_straight_line_trace(self):
+        self.interpreter.program = [list('12+:*.@')]
+        trace = self.interpreter.record(0, self.interpreter.direction)
+        trace(self.interpreter.stack.stack, self.interpreter)
+        self.assertTrue(trace.dispatch)
+        self.assertEqual(trace.ticks, 6)
+        self.assertEqual(self.interpreter.xpos, 6)
+        self.assertEqual(self.interpreter.output.getvalue(), '9 ')
+
+    def test_branch_ends_trace(self):
+        self.interpreter.program = [list('1_@')]
+        trace = self.interpreter.record(0, self.interpreter.direction)
+        trace(self.interpreter.stack.stack, self.interpreter)
+        self.assertFalse(trace.dispatch)
+        self.assertEqual(trace.ticks, 2)
+        self.assertEqual(self.interpreter.xpos, 0)
+        self.assertEqual(self.interpreter.stack.stack, [])
+
+    def test_string_mode_in_trace(self):
+        self.assertEqual(self.run_program('25*"!iH">:#,_@'), 'Hi!\n')
+
+    def test_string_longer_than_trace(self):
+        literal = 'a' * (MAX_TRACE_LENGTH + 88)
+        self.assertEqual(self.run_program(f'"{literal}",@'), 'a')
+
+    def test_loop(self):
+        self.assertEqual(self.run_program('9>1-:.:v', ' ^     _@'),
+                         '8 7 6 5 4 3 2 1 0 ')
+
+    def test_steps_match_interpreter(self):
+        self.run_program('9>1-:.:v', ' ^     _@')
+        interpreter = Interpreter()
+        interpreter.program = ['9>1-:.:v', ' ^     _@']
+        interpreter.run()
+        self.assertEqual(self.interpreter.steps, interpreter.steps)
+
+    def test_step_budget_matches_interpreter(self):
+        program = ['>1-:v', '^   _@']
+        for steps in (1, 7, 12, 40):
+            with self.subTest(steps):
+                jit = JitInterpreter()
+                jit.program = program
+                jit.stack.append(5)
+                interpreter = Interpreter()
+                interpreter.program = program
+                interpreter.stack.append(5)
+                self.assertEqual(jit.run(steps), interpreter.run(steps))
+                self.assertEqual(jit.steps, interpreter.steps)
+                self.assertEqual(jit.position, interpreter.position)
+                self.assertEqual(jit.stack.stack, interpreter.stack.stack)
+
+    def test_put_invalidates_covered_traces(self):
+        self.interpreter.program = [list('12+.@')]
+        self.interpreter.record(0, self.interpreter.direction)
+        self.interpreter.record(1, self.interpreter.direction)
+        self.interpreter.record(3, self.interpreter.direction)
+        self.interpreter.write_cell(2, 0, ord('*'))
+        self.assertEqual(list(self.interpreter.traces),
+                         [(3, self.interpreter.direction)])
+
+    def test_self_modifying_loop(self):
+        self.assertEqual(self.run_program('>2.    v', '^p07"@"<'), '2 2 ')
+
+    def test_rewritten_cell_stops_retracing(self):
+        workload, = [workload for workload in WORKLOADS
+                     if workload.name == 'self_modifying']
+        reference = Interpreter()
+        reference.program = workload.lines
+        reference.input_data.feed(workload.input_data)
+        reference.run()
+        self.interpreter.program = workload.lines
+        self.interpreter.input_data.feed(workload.input_data)
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.steps, reference.steps)
+        self.assertEqual(self.interpreter.program, reference.program)
+        self.assertLess(self.interpreter.compilations, 50)
+
+    def test_digits_in_string_mode(self):
+        self.assertEqual(self.run_program('"21"..@'), '49 50 ')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import io
+import os
+import tempfile
+import unittest
+from interpreter import Interpreter, Status
+from limits import Limits
+from journal import RecordingInterpreter, ReplayInterpreter, JournalWriter, \
+    ReplayShell
+from exceptions import JournalError
+
+PROGRAM = ['&03p>03g:!#@_1-03pv',
+           '                v2?1v',
+           '    ^     .     < < <',
+           '']
+INPUT = '30'
+
+
+class JournalTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.journal')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, lines, input_data='', seed=0, every=7, max_steps=None,
+               limits=None):
+        interpreter = RecordingInterpreter(seed=seed)
+        interpreter.limits = limits
+        interpreter.program = lines
+        interpreter.input_data.feed(input_data)
+        interpreter.journal = JournalWriter(self.path, every)
+        try:
+            return interpreter, interpreter.run(max_steps)
+        finally:
+            interpreter.journal.close()
+
+    def reference(self, lines, steps, input_data='', seed=0):
+        interpreter = Interpreter(seed=seed)
+        interpreter.program = lines
+        interpreter.input_data.feed(input_data)
+        interpreter.run(steps)
+        return interpreter
+
+    def test_recording_does_not_change_the_run(self):
+        recorded, status = self.record(PROGRAM, INPUT)
+        reference = self.reference(PROGRAM, None, INPUT)
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(recorded.output.getvalue(),
+                         reference.output.getvalue())
+        self.assertEqual(recorded.steps, reference.steps)
+
+    def test_replay_to_the_end(self):
+        recorded, _ = self.record(PROGRAM, INPUT)
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.forward(10 ** 9), Status.HALTED)
+        self.assertEqual(replay.steps, recorded.steps)
+        self.assertEqual(replay.output.getvalue(),
+                         recorded.output.getvalue())
+
+    def test_seek(self):
+        recorded, _ = self.record(PROGRAM, INPUT)
+        replay = ReplayInterpreter(self.path)
+        for step in (90, 3, 41, 42, 150, 7, recorded.steps - 1):
+            with self.subTest(step):
+                replay.seek(step)
+                reference = self.reference(PROGRAM, step, INPUT)
+                self.assertEqual(replay.steps, step)
+                self.assertEqual(replay.position, reference.position)
+                self.assertEqual(replay.direction, reference.direction)
+                self.assertEqual(list(replay.stack), list(reference.stack))
+                self.assertEqual(replay.playfield.cells,
+                                 reference.playfield.cells)
+
+    def test_snapshots_are_periodic(self):
+        recorded, _ = self.record(PROGRAM, INPUT, every=50)
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.snapshot_steps,
+                         list(range(0, recorded.steps, 50)))
+
+    def test_input_exhausted(self):
+        self.record(['&&+.@'], '1')
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.forward(100), Status.NEEDS_INPUT)
+        self.assertEqual(replay.steps, 1)
+
+    def test_step_limit(self):
+        self.record(['>1.v', '^  <'], max_steps=20)
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.forward(100), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(replay.steps, 20)
+
+    def test_wrapped_arithmetic(self):
+        recorded, _ = self.record(['1>:*1+:.v', ' ^      <'], max_steps=200,
+                                  limits=Limits(wrap=True))
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.forward(200), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(replay.output.getvalue(),
+                         recorded.output.getvalue())
+
+    def test_output_limit_after_seek(self):
+        recorded, status = self.record(['>1.v', '^  <'],
+                                       limits=Limits(output_size=10))
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        replay = ReplayInterpreter(self.path)
+        self.assertEqual(replay.forward(100), Status.LIMIT_EXCEEDED)
+        self.assertEqual(replay.steps, recorded.steps)
+        self.assertEqual(replay.seek(10), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(replay.forward(100), Status.LIMIT_EXCEEDED)
+        self.assertEqual(replay.steps, recorded.steps)
+
+    def test_divergent_program(self):
+        self.record(['&.@'], '5')
+        replay = ReplayInterpreter(self.path)
+        replay.playfield.put(0, 0, ord('~'))
+        with self.assertRaises(JournalError):
+            replay.forward(3)
+
+    def test_not_a_journal(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a journal')
+        with self.assertRaises(JournalError):
+            ReplayInterpreter(self.path)
+
+    def test_shell(self):
+        self.record(['12+.@'])
+        output = io.StringIO()
+        shell = ReplayShell(ReplayInterpreter(self.path), io.StringIO(),
+                            output)
+        for command in ('step 3', 'stack', 'step', 'where', 'field'):
+            shell.onecmd(command)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "шаг 3, клетка (3, 0) '.', RIGHT",
+            '3',
+            "вывод: '3 '",
+            "шаг 4, клетка (4, 0) '@', RIGHT",
+            "шаг 4, клетка (4, 0) '@', RIGHT",
+            '12+.@',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
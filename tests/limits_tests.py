@@ -0,0 +1,125 @@
+import unittest
+from interpreter import Interpreter, Status
+from limits import Limits
+from sparse import SparseInterpreter
+from stack import CompactStack
+from batch import run_job
+
+
+class LimitsTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = Interpreter()
+
+    def run_program(self, limits, *lines, input_data=''):
+        self.interpreter.limits = limits
+        self.interpreter.program = lines
+        self.interpreter.input_data.feed(input_data)
+        return self.interpreter.run(1000000)
+
+    def test_stack_depth(self):
+        status = self.run_program(Limits(stack_depth=1000), '>1:v', '^  <')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        self.assertEqual(self.interpreter.limit_error.resource, 'stack')
+        self.assertEqual(len(self.interpreter.stack), 1001)
+
+    def test_stack_near_limit(self):
+        limits = Limits(stack_depth=1004)
+        self.interpreter.stack.extend(range(1000))
+        status = self.run_program(limits, '&>1-:v', ' ^   _@',
+                                  input_data='3000')
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(self.interpreter.steps, 29998)
+        self.assertIsNotNone(limits.plain)
+        self.interpreter.stack.load([])
+        self.assertEqual(limits.steps(self.interpreter, 10000), 502)
+        add = self.interpreter.handlers[self.interpreter.opcodes[ord('+')]]
+        self.assertEqual(add.func, self.interpreter.add)
+
+    def test_string_literal_crossing_limit(self):
+        status = self.run_program(Limits(stack_depth=3), '"abcdefghij"@')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        self.assertEqual(list(self.interpreter.stack), [97, 98, 99, 100])
+        self.assertEqual(self.interpreter.steps, 4)
+
+    def test_step_runs_every_step_in_chunks(self):
+        self.interpreter.limits = Limits(stack_depth=1000)
+        self.interpreter.program = ['>v', '^<']
+        self.assertEqual(self.interpreter.step(2000), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.steps, 2000)
+
+    def test_stack_within_limit(self):
+        status = self.run_program(Limits(stack_depth=3), '123...@')
+        self.assertEqual(status, Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), '3 2 1 ')
+
+    def test_integer_bits(self):
+        status = self.run_program(Limits(integer_bits=64), '1>:*1+v',
+                                  ' ^    <')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        self.assertEqual(self.interpreter.limit_error.resource, 'bits')
+        self.assertLess(self.interpreter.stack.peek().bit_length(), 64)
+
+    def test_input_number_bits(self):
+        status = self.run_program(Limits(integer_bits=8), '&.@',
+                                  input_data='300')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+
+    def test_wrap(self):
+        status = self.run_program(Limits(wrap=True), '1>:*1+:.v',
+                                  ' ^      <')
+        self.assertEqual(status, Status.BUDGET_EXHAUSTED)
+        self.assertTrue(self.interpreter.output.getvalue().startswith(
+            '2 5 26 677 458330 -387008603 '))
+        self.assertTrue(all(-2 ** 31 <= value < 2 ** 31
+                            for value in self.interpreter.stack))
+
+    def test_wrap_input_number(self):
+        self.run_program(Limits(integer_bits=8, wrap=True), '&.@',
+                         input_data='300')
+        self.assertEqual(self.interpreter.output.getvalue(), '44 ')
+
+    def test_output_size(self):
+        status = self.run_program(Limits(output_size=10), '>"a",v', '^    <')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        self.assertEqual(self.interpreter.output.getvalue(), 'a' * 10)
+
+    def test_output_size_of_number(self):
+        status = self.run_program(Limits(output_size=4), '9.99*.@')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+        self.assertEqual(self.interpreter.output.getvalue(), '9 ')
+
+    def test_sparse_interpreter(self):
+        self.interpreter = SparseInterpreter()
+        status = self.run_program(Limits(stack_depth=100), '>1:v', '^  <')
+        self.assertEqual(status, Status.LIMIT_EXCEEDED)
+
+    def test_without_limits_handlers_are_unchanged(self):
+        self.interpreter.program = ['1.@']
+        self.interpreter.compile()
+        add = self.interpreter.handlers[self.interpreter.opcodes[ord('+')]]
+        self.assertEqual(add.func, self.interpreter.add)
+
+    def test_memory_usage(self):
+        self.run_program(None, '>1:v', '^  <')
+        usage = self.interpreter.memory_usage()
+        self.assertEqual(set(usage),
+                         {'playfield', 'stack', 'output', 'input', 'total'})
+        self.assertEqual(usage['total'], usage['playfield'] + usage['stack']
+                         + usage['output'] + usage['input'])
+        self.assertGreater(usage['stack'], 8 * len(self.interpreter.stack))
+
+    def test_compact_stack_memory(self):
+        stack = CompactStack()
+        stack.extend(range(1000))
+        self.assertLess(stack.memory(), 9000)
+
+    def test_batch_job(self):
+        result = run_job({'program': '>1:v\n^  <', 'max_stack': 50})
+        self.assertEqual(result['status'], 'limit-exceeded')
+        self.assertEqual(result['limit'], 'stack')
+        self.assertEqual(result['peak_stack'], 51)
+        self.assertGreater(result['memory'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
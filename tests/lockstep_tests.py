@@ -0,0 +1,63 @@
+import unittest
+from interpreter import Interpreter
+from lockstep import LockstepRunner
+
+FACTORIAL = ['&>:1-:v v *_$.@', ' ^    _$>\\:^']
+WALK = ['v>1.v', '>?2.v', ' >3.v', '^   <']
+
+
+def run_scalar(lines, data, max_steps=None, seed=None):
+    interpreter = Interpreter(seed=seed)
+    interpreter.program = lines
+    interpreter.input_data.feed(data)
+    status = interpreter.run(max_steps)
+    return {'status': status.value, 'output': interpreter.output.getvalue(),
+            'error': None, 'steps': interpreter.steps}
+
+
+class LockstepTests(unittest.TestCase):
+    def assertSameAsScalar(self, lines, inputs, max_steps=None, seed=None):
+        runner = LockstepRunner(lines, seed)
+        results = runner.run(inputs, max_steps)
+        self.assertEqual(results, [run_scalar(lines, data, max_steps, seed)
+                                   for data in inputs])
+        return runner
+
+    def test_diverging_loops(self):
+        runner = self.assertSameAsScalar(FACTORIAL,
+                                         [str(n) for n in range(1, 15)])
+        self.assertTrue(runner.vectorized)
+
+    def test_strings_and_stack_commands(self):
+        self.assertSameAsScalar(['"ba"\\,,:..$1!.0!.45`.@'], ['', ''])
+
+    def test_characters(self):
+        self.assertSameAsScalar(['~:1+!#@_,'], ['hello', 'ab', ''])
+
+    def test_needs_input(self):
+        self.assertSameAsScalar(['&&+.@'], ['2 3', '7', ''])
+
+    def test_step_limit(self):
+        self.assertSameAsScalar(['&>:.1-:v', ' ^     _@'], ['3', '100'], 40)
+
+    def test_random_directions(self):
+        self.assertSameAsScalar(WALK, ['', '', ''], 300, seed=3)
+
+    def test_get(self):
+        self.assertSameAsScalar(['&0g,@'], ['0', '2', '3'])
+
+    def test_errors(self):
+        results = LockstepRunner(['&&/.@']).run(['6 3', '1 0'])
+        self.assertEqual(results[0]['output'], '2 ')
+        self.assertEqual(results[1]['status'], 'error')
+        self.assertIn('ZeroDivisionError', results[1]['error'])
+        results = LockstepRunner(['&x@']).run(['1'])
+        self.assertEqual(results[0]['error'], "KeyError: 'x'")
+
+    def test_put_falls_back_to_scalar(self):
+        runner = self.assertSameAsScalar(['&00p00g.@'], ['65', '66'])
+        self.assertFalse(runner.vectorized)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import random
+import unittest
+from playfield import Playfield
+from exceptions import PlayfieldSizeError
+
+
+class PlayfieldTests(unittest.TestCase):
+    def setUp(self):
+        self.playfield = Playfield.from_lines(['v.<', '>:|', '@'])
+
+    def test_bounding_rectangle(self):
+        self.assertEqual(self.playfield.width, 3)
+        self.assertEqual(self.playfield.height, 3)
+        self.assertEqual(len(self.playfield.cells), 9)
+
+    def test_short_lines_are_padded(self):
+        self.assertEqual(self.playfield.get(1, 2), ord(' '))
+
+    def test_fixed_geometry(self):
+        playfield = Playfield.from_lines(['v.<', '>:|', '@'], 80, 25)
+        self.assertEqual(len(playfield.cells), 80 * 25)
+        self.assertEqual(playfield.get(0, 2), ord('@'))
+        self.assertEqual(playfield.get(79, 24), ord(' '))
+
+    def test_program_too_large(self):
+        with self.assertRaises(PlayfieldSizeError):
+            Playfield.from_lines(['v.<'], 2, 1)
+
+    def test_get_outside(self):
+        self.assertEqual(self.playfield.get(3, 0), 0)
+        self.assertEqual(self.playfield.get(-1, 0), 0)
+
+    def test_put(self):
+        self.assertTrue(self.playfield.put(2, 2, 1000))
+        self.assertEqual(self.playfield.get(2, 2), 1000)
+        self.assertFalse(self.playfield.put(0, 3, 65))
+
+    def test_successors_wrap_around(self):
+        successors = self.playfield.successors()
+        self.assertEqual(successors[2 * 4 + 0], 0)
+        self.assertEqual(successors[6 * 4 + 1], 0)
+        self.assertEqual(successors[3 * 4 + 2], 5)
+        self.assertEqual(successors[1 * 4 + 3], 7)
+
+    def test_successors_rebuilt_only_for_new_geometry(self):
+        successors = self.playfield.successors()
+        self.playfield.put(0, 0, ord('>'))
+        self.assertIs(self.playfield.successors(), successors)
+        self.playfield.width = 1
+        self.assertIsNot(self.playfield.successors(), successors)
+
+    def test_rows(self):
+        self.assertEqual(self.playfield.rows(),
+                         [['v', '.', '<'], ['>', ':', '|'], ['@']])
+
+    def test_skips_jump_over_spaces(self):
+        playfield = Playfield.from_lines(['>  v', '    ', '^  <'])
+        targets, weights = playfield.skips()
+        self.assertEqual((targets[0], weights[0]), (3, 3))
+        self.assertEqual((targets[3 * 4 + 1], weights[3 * 4 + 1]), (11, 2))
+        self.assertEqual((targets[11 * 4 + 2], weights[11 * 4 + 2]), (8, 3))
+
+    def test_skips_pass_arrows_in_their_direction(self):
+        playfield = Playfield.from_lines(['> > >.', '  ^   '])
+        targets, weights = playfield.skips()
+        self.assertEqual((targets[0], weights[0]), (5, 5))
+        self.assertEqual((targets[5 * 4 + 2], weights[5 * 4 + 2]), (4, 1))
+        self.assertEqual((targets[2 * 4 + 1], weights[2 * 4 + 1]), (8, 1))
+        self.assertEqual((targets[2 * 4 + 3], weights[2 * 4 + 3]), (2, 2))
+
+    def test_skips_stop_after_quote(self):
+        playfield = Playfield.from_lines(['"  @'])
+        targets, weights = playfield.skips()
+        self.assertEqual((targets[0], weights[0]), (1, 1))
+
+    def test_skips_follow_put(self):
+        random.seed(1)
+        playfield = Playfield.from_lines(['v  # ', ' "  >', '   ^ ', '@    '])
+        playfield.skips()
+        for _ in range(200):
+            playfield.put(random.randrange(5), random.randrange(4),
+                          ord(random.choice('  "#><^v')))
+            fresh = Playfield(5, 4)
+            fresh.cells = playfield.cells
+            self.assertEqual(playfield.skips(), fresh.skips())
+
+    def test_literal_cache(self):
+        playfield = Playfield.from_lines(['"ab"@'])
+        self.assertEqual(playfield.literal(4), ([97, 98], 3))
+        self.assertIn(4, playfield.literals)
+        self.assertEqual(playfield.literal(8), ([98], 3))
+        self.assertNotIn(8, playfield.literals)
+        playfield.put(2, 0, ord('c'))
+        self.assertNotIn(4, playfield.literals)
+        self.assertEqual(playfield.literal(4), ([97, 99], 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
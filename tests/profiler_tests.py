@@ -0,0 +1,63 @@
+import json
+import unittest
+from interpreter import Interpreter, Status
+from profiler import ProfilingInterpreter, render
+
+HELLO = ['"!dlroW ,olleH">:v',
+         '               |,<',
+         '               @']
+
+
+class ProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = ProfilingInterpreter()
+
+    def test_same_result_as_interpreter(self):
+        reference = Interpreter()
+        for interpreter in (reference, self.interpreter):
+            interpreter.program = HELLO
+            self.assertEqual(interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(),
+                         reference.output.getvalue())
+        self.assertEqual(self.interpreter.steps, reference.steps)
+
+    def test_counters(self):
+        self.interpreter.program = HELLO
+        self.interpreter.run()
+        self.assertEqual(sum(self.interpreter.cell_counts),
+                         self.interpreter.steps)
+        profile = self.interpreter.profile()
+        self.assertEqual(profile['cells'][0][15], 14)
+        self.assertEqual(profile['opcodes']['string'], 13)
+        self.assertEqual(profile['opcodes'][','], 14)
+        self.assertEqual(profile['max_stack_depth'], 14)
+
+    def test_put_and_get_traffic(self):
+        self.interpreter.program = ['55g.10p10g.@']
+        self.interpreter.run()
+        self.assertEqual(self.interpreter.puts, {(1, 0): 1})
+        self.assertEqual(self.interpreter.gets, {(5, 5): 1, (1, 0): 1})
+
+    def test_counts_survive_resume(self):
+        self.interpreter.program = HELLO
+        self.interpreter.step(50)
+        self.interpreter.run()
+        self.assertEqual(sum(self.interpreter.cell_counts),
+                         self.interpreter.steps)
+
+    def test_render(self):
+        self.interpreter.program = HELLO
+        self.interpreter.run()
+        text = render(self.interpreter).splitlines()
+        self.assertEqual(text[0], '.' * 15 + '@@@')
+        self.assertEqual(text[2], ' ' * 15 + '.')
+        rows = render(self.interpreter, 'csv').splitlines()
+        self.assertEqual(rows[0], 'x,y,symbol,count,puts,gets')
+        self.assertEqual(rows[16], '15,0,>,14,0,0')
+        self.assertEqual(json.loads(render(self.interpreter, 'json')),
+                         self.interpreter.profile())
+        self.assertIn('\x1b[', render(self.interpreter, 'ansi'))
+
+
+if __name__ == '__main__':
+    unittest.main()
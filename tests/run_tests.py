@@ -0,0 +1,114 @@
+import json
+import unittest
+from interpreter import Interpreter, Status
+from sinks import MemorySink
+
+LOOP = ['>1.v',
+        '^  <']
+TOGGLE = ['>         1+:2%v',
+          '^        p05">"_" "50p      ']
+
+
+class RunTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = Interpreter(output=MemorySink())
+
+    def test_step(self):
+        self.interpreter.program = ['12+.@']
+        self.assertEqual(self.interpreter.step(3), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.steps, 3)
+        self.assertEqual(self.interpreter.stack.stack, [3])
+        self.assertEqual(self.interpreter.step(10), Status.HALTED)
+        self.assertEqual(self.interpreter.steps, 5)
+        self.assertEqual(self.interpreter.step(), Status.HALTED)
+        self.assertEqual(self.interpreter.steps, 5)
+
+    def test_needs_input_and_resume(self):
+        self.interpreter.program = ['&.@']
+        self.assertEqual(self.interpreter.step(5), Status.NEEDS_INPUT)
+        self.assertEqual(self.interpreter.steps, 0)
+        self.interpreter.input_data.feed('42')
+        self.assertEqual(self.interpreter.step(5), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), '42 ')
+
+    def test_max_steps(self):
+        self.interpreter.program = LOOP
+        self.assertEqual(self.interpreter.run(max_steps=25000),
+                         Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.steps, 25000)
+
+    def test_timeout(self):
+        self.interpreter.program = LOOP
+        self.assertEqual(self.interpreter.run(timeout=0.05), Status.TIMED_OUT)
+
+    def test_snapshot_and_restore(self):
+        self.interpreter.program = ['&>:.1-:v', ' ^     _@']
+        self.interpreter.input_data.feed('5 7')
+        self.interpreter.step(12)
+        state = json.loads(json.dumps(self.interpreter.snapshot()))
+        printed = len(self.interpreter.output.getvalue())
+
+        restored = Interpreter(output=MemorySink())
+        restored.restore(state)
+        self.assertEqual(restored.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(restored.output.getvalue(),
+                         self.interpreter.output.getvalue()[printed:])
+        self.assertEqual(restored.steps, self.interpreter.steps)
+        self.assertEqual(restored.input_data.read_token(), b'7')
+
+    def test_space_skipping_keeps_exact_steps(self):
+        self.interpreter.program = TOGGLE
+        for steps in (1, 7, 100, 9999, 3, 5000, 17, 20000):
+            self.interpreter.step(steps)
+        reference = Interpreter()
+        reference.program = TOGGLE
+        for _ in range(self.interpreter.steps):
+            reference.execute_command()
+            reference.move_pointer()
+        self.assertEqual(self.interpreter.steps, 35127)
+        self.assertEqual(self.interpreter.position, reference.position)
+        self.assertEqual(self.interpreter.direction, reference.direction)
+        self.assertEqual(self.interpreter.stack.stack, reference.stack.stack)
+        self.assertEqual(self.interpreter.program, reference.program)
+
+    def test_string_literal_pushed_at_once(self):
+        self.interpreter.program = ['"ab12"@']
+        self.assertEqual(self.interpreter.step(2), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.stack.stack, [97])
+        self.assertEqual(self.interpreter.step(2), Status.BUDGET_EXHAUSTED)
+        self.assertEqual(self.interpreter.stack.stack, [97, 98, 49])
+        self.assertEqual(self.interpreter.step(10), Status.HALTED)
+        self.assertEqual(self.interpreter.stack.stack, [97, 98, 49, 50])
+        self.assertEqual(self.interpreter.steps, 7)
+
+    def test_string_literal_wraps_around(self):
+        self.interpreter.program = ['b",,@"a']
+        self.interpreter.position = 5
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), 'ba')
+        self.assertEqual(self.interpreter.steps, 7)
+
+    def test_put_changes_string_literal(self):
+        self.interpreter.program = ['"a","b"10p']
+        self.interpreter.run(max_steps=30)
+        self.assertEqual(self.interpreter.output.getvalue(), 'abb')
+
+    def test_snapshot_keeps_random_state(self):
+        walk = ['v>1.v', '>?2.v', ' >3.v', '^   <']
+        interpreter = Interpreter(seed=3)
+        interpreter.program = walk
+        interpreter.step(101)
+        state = json.loads(json.dumps(interpreter.snapshot()))
+        printed = len(interpreter.output.getvalue())
+        interpreter.step(500)
+
+        restored = Interpreter()
+        restored.restore(state)
+        restored.step(500)
+        self.assertEqual(restored.output.getvalue(),
+                         interpreter.output.getvalue()[printed:])
+
+
+if __name__ == '__main__':
+    unittest.main()
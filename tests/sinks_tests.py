@@ -0,0 +1,56 @@
+import pathlib
+import unittest
+from sinks import FileSink, MemorySink, CallbackSink
+
+
+class SinksTests(unittest.TestCase):
+    def tearDown(self):
+        try:
+            pathlib.Path('output.txt').unlink()
+        except FileNotFoundError:
+            pass
+
+    def test_buffer_until_full(self):
+        chunks = []
+        sink = CallbackSink(chunks.append, buffer_size=4)
+        sink.append('ab')
+        self.assertEqual(chunks, [])
+        sink.append('cd')
+        self.assertEqual(chunks, ['abcd'])
+        sink.append('e')
+        sink.close()
+        self.assertEqual(chunks, ['abcd', 'e'])
+        self.assertEqual(sink.written, 5)
+
+    def test_flush_every(self):
+        chunks = []
+        sink = CallbackSink(chunks.append, flush_every=2)
+        for symbol in 'abcde':
+            sink.append(symbol)
+        self.assertEqual(chunks, ['ab', 'cd'])
+
+    def test_memory_sink(self):
+        sink = MemorySink(buffer_size=2)
+        for symbol in 'Hello':
+            sink.append(symbol)
+        self.assertEqual(sink.getvalue(), 'Hello')
+
+    def test_file_sink_streams_before_close(self):
+        sink = FileSink('output.txt', buffer_size=3)
+        sink.append('1 2 ')
+        with open('output.txt') as f:
+            self.assertEqual(f.read(), '1 2 ')
+        sink.append('3 ')
+        sink.close()
+        with open('output.txt') as f:
+            self.assertEqual(f.read(), '1 2 3 ')
+
+    def test_file_sink_created_on_close(self):
+        sink = FileSink('output.txt')
+        sink.close()
+        sink.close()
+        self.assertTrue(pathlib.Path('output.txt').exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import io
+import unittest
+from sources import InputBuffer
+from exceptions import ReadError
+
+
+class InputBufferTests(unittest.TestCase):
+    def test_tokens_across_chunks(self):
+        buffer = InputBuffer(io.BytesIO(b'123 4567\n89'), chunk_size=2)
+        self.assertEqual(buffer.read_token(), b'123')
+        self.assertEqual(buffer.read_token(), b'4567')
+        self.assertEqual(buffer.read_token(), b'89')
+        with self.assertRaises(ReadError):
+            buffer.read_token()
+
+    def test_chars(self):
+        buffer = InputBuffer(io.BytesIO(b'a b\n'), chunk_size=1)
+        self.assertEqual([buffer.read_char() for _ in range(4)],
+                         [97, 32, 98, 10])
+        with self.assertRaises(ReadError):
+            buffer.read_char()
+
+    def test_trailing_whitespace(self):
+        buffer = InputBuffer(io.BytesIO(b' 5 \n\n'))
+        self.assertEqual(buffer.read_token(), b'5')
+        with self.assertRaises(ReadError):
+            buffer.read_token()
+
+    def test_consumed_data_is_released(self):
+        buffer = InputBuffer(io.BytesIO(b'1 ' * 1000), chunk_size=16)
+        for _ in range(1000):
+            buffer.read_token()
+            self.assertLessEqual(len(buffer.data), 32)
+
+    def test_feed(self):
+        buffer = InputBuffer()
+        buffer.feed('-3')
+        self.assertEqual(int(buffer.read_token()), -3)
+
+
+if __name__ == '__main__':
+    unittest.main()
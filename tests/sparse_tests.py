@@ -0,0 +1,88 @@
+import json
+import unittest
+from interpreter import Interpreter, Status
+from sparse import SparseInterpreter
+from playfield import SparsePlayfield, TILE_SIZE
+from benchmarks.corpus import WORKLOADS
+from benchmarks.harness import prepare
+
+
+class SparsePlayfieldTests(unittest.TestCase):
+    def setUp(self):
+        self.playfield = SparsePlayfield.from_lines(['v.<', '>:|', '@'])
+
+    def test_bounding_box(self):
+        self.assertEqual(self.playfield.width, 3)
+        self.assertEqual(self.playfield.height, 3)
+        self.assertEqual(len(self.playfield.tiles), 1)
+
+    def test_unwritten_cells_are_spaces(self):
+        self.assertEqual(self.playfield.get(1, 2), ord(' '))
+        self.assertEqual(self.playfield.get(-100, 10 ** 9), ord(' '))
+
+    def test_put_anywhere(self):
+        self.playfield.put(-1, 10 ** 6, ord('x'))
+        self.assertEqual(self.playfield.get(-1, 10 ** 6), ord('x'))
+        self.assertEqual((self.playfield.left, self.playfield.top,
+                          self.playfield.right, self.playfield.bottom),
+                         (-1, 0, 3, 10 ** 6 + 1))
+        self.assertEqual(len(self.playfield.tiles), 2)
+
+    def test_space_does_not_allocate(self):
+        self.playfield.put(TILE_SIZE * 10, 0, ord(' '))
+        self.assertEqual(len(self.playfield.tiles), 1)
+        self.assertEqual(self.playfield.width, 3)
+
+    def test_wraps_around_bounding_box(self):
+        self.assertEqual(self.playfield.next(2, 0, 0), (0, 0))
+        self.assertEqual(self.playfield.next(0, 0, 2), (2, 0))
+        self.assertEqual(self.playfield.next(0, 0, 3), (0, 2))
+        self.playfield.put(5, 5, ord('x'))
+        self.assertEqual(self.playfield.next(2, 0, 0), (3, 0))
+        self.assertEqual(self.playfield.next(0, 5, 1), (0, 0))
+
+
+class SparseInterpreterTests(unittest.TestCase):
+    def setUp(self):
+        self.interpreter = SparseInterpreter()
+
+    def test_far_put_and_get(self):
+        self.interpreter.program = ['"A"05-"d"55+*p05-"d"55+*g,@']
+        self.assertEqual(self.interpreter.run(), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), 'A')
+        self.assertEqual(self.interpreter.playfield.height, 1001)
+
+    def test_get_unwritten_cell(self):
+        self.interpreter.program = ['99*9g.@']
+        self.interpreter.run()
+        self.assertEqual(self.interpreter.output.getvalue(), '32 ')
+
+    def test_pointer_reaches_written_cells(self):
+        self.interpreter.program = ['"@"50p"."40p"7"30p']
+        self.assertEqual(self.interpreter.run(100), Status.HALTED)
+        self.assertEqual(self.interpreter.output.getvalue(), '7 ')
+
+    def test_snapshot(self):
+        self.interpreter.program = ['"x"05-7p1.05-7g,@']
+        self.interpreter.step(9)
+        state = json.loads(json.dumps(self.interpreter.snapshot()))
+        restored = SparseInterpreter()
+        restored.restore(state)
+        self.assertEqual(restored.run(), Status.HALTED)
+        self.assertEqual(restored.output.getvalue(), '1 x')
+        self.assertEqual(restored.steps, 17)
+
+    def test_same_result_as_interpreter(self):
+        for workload in WORKLOADS:
+            with self.subTest(workload.name):
+                reference = prepare(Interpreter, workload)
+                sparse = prepare(SparseInterpreter, workload)
+                reference.run()
+                sparse.run()
+                self.assertEqual(sparse.output.getvalue(),
+                                 reference.output.getvalue())
+                self.assertEqual(sparse.steps, reference.steps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from stack import Stack
+from stack import Stack, CompactStack
+from interpreter import Interpreter
 
 
 class MyTestCase(unittest.TestCase):
@@ -33,6 +34,86 @@ class MyTestCase(unittest.TestCase):
         self.stack.append('#')
         self.assertListEqual(self.stack.stack, ['#', '#'])
 
+    def test_pop2(self):
+        self.stack.append(1)
+        self.stack.append(2)
+        self.stack.append(3)
+        self.assertEqual(self.stack.pop2(), (2, 3))
+        self.assertEqual(self.stack.pop2(), (0, 1))
+        self.assertEqual(self.stack.pop2(), (0, 0))
+        self.assertListEqual(self.stack.stack, [])
+
+    def test_peek(self):
+        self.assertEqual(self.stack.peek(), 0)
+        self.stack.append(5)
+        self.assertEqual(self.stack.peek(), 5)
+        self.assertListEqual(self.stack.stack, [5])
+
+    def test_dup(self):
+        self.stack.dup()
+        self.assertListEqual(self.stack.stack, [0, 0])
+        self.stack.append(7)
+        self.stack.dup()
+        self.assertListEqual(self.stack.stack, [0, 0, 7, 7])
+
+    def test_swap(self):
+        self.stack.swap()
+        self.assertListEqual(self.stack.stack, [0, 0])
+        self.stack.stack.clear()
+        self.stack.append(4)
+        self.stack.swap()
+        self.assertListEqual(self.stack.stack, [4, 0])
+        self.stack.append(9)
+        self.stack.swap()
+        self.assertListEqual(self.stack.stack, [4, 9, 0])
+
+
+class CompactStackTests(unittest.TestCase):
+    def setUp(self):
+        self.stack = CompactStack()
+
+    def test_operations(self):
+        self.assertEqual(self.stack.pop(), 0)
+        self.stack.append(3)
+        self.stack.dup()
+        self.stack.append(4)
+        self.stack.swap()
+        self.assertEqual(list(self.stack), [3, 4, 3])
+        self.assertEqual(self.stack.pop2(), (4, 3))
+        self.assertEqual(len(self.stack), 1)
+
+    def test_bigint_fallback(self):
+        self.stack.append(1)
+        self.stack.append(2 ** 70)
+        self.assertIsInstance(self.stack.stack, list)
+        self.assertEqual(self.stack.pop2(), (1, 2 ** 70))
+
+    def test_extend_bigint_fallback(self):
+        self.stack.append(1)
+        self.stack.extend([2, 3, 2 ** 70, 4])
+        self.assertEqual(list(self.stack), [1, 2, 3, 2 ** 70, 4])
+        self.stack.extend([5])
+        self.assertEqual(list(self.stack), [1, 2, 3, 2 ** 70, 4, 5])
+
+    def test_extend_iterator_bigint_fallback(self):
+        self.stack.append(1)
+        self.stack.extend(iter([2, 2 ** 70, 3]))
+        self.assertEqual(list(self.stack), [1, 2, 2 ** 70, 3])
+        self.stack.load(iter([4, 2 ** 70, 5]))
+        self.assertEqual(list(self.stack), [4, 2 ** 70, 5])
+
+    def test_load(self):
+        self.stack.load([1, 2, 3])
+        self.assertEqual(list(self.stack), [1, 2, 3])
+        self.stack.load([2 ** 64])
+        self.assertEqual(list(self.stack), [2 ** 64])
+
+    def test_interpreter(self):
+        interpreter = Interpreter(stack=CompactStack())
+        interpreter.program = ['99*:*:*:*:*.@']
+        interpreter.run()
+        self.assertEqual(interpreter.output.getvalue(), f'{81 ** 16} ')
+
 
 if __name__ == '__main__':
     unittest.main()
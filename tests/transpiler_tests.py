@@ -0,0 +1,130 @@
+import io
+import os
+import tempfile
+import unittest
+from interpreter import Interpreter, Status
+from playfield import Playfield
+from sinks import MemorySink
+from transpiler import transpile, load, run, save_cached
+from exceptions import CompileError
+from benchmarks.corpus import WORKLOADS
+
+EXAMPLES = [
+    (['25*"!dlroW ,olleH" >:#,_@'], ''),
+    (['44* >:1-:v    v ,*25 .:* ,,,,"! = ".:_ @ ',
+      '    ^    _ $1 > \\:                   ^ '], ''),
+    (['031p132p 94+ > 31g 32g :. + 32g v',
+      '             | :-1,,", "p23 p13 <',
+      '             > "."::,,,@'], ''),
+    (['vv    <>v *<', '&>:1-:|$>\\:|', '>^    >^@.$<'], '7'),
+    (['#v&<     @.$< ', ':<\\g05%p05:_^#'], '84 36'),
+]
+
+
+def compiled_run(lines, input_data='', seed=None):
+    namespace = {}
+    exec(transpile(Playfield.from_lines(lines)), namespace)
+    output = MemorySink()
+    namespace['run'](output.append, io.BytesIO(input_data.encode()), seed)
+    return output.getvalue()
+
+
+def interpreted_run(lines, input_data='', seed=None):
+    interpreter = Interpreter(seed=seed)
+    interpreter.program = lines
+    interpreter.input_data.feed(input_data)
+    status = interpreter.run()
+    return status, interpreter.output.getvalue()
+
+
+class TranspilerTests(unittest.TestCase):
+    def test_examples(self):
+        for lines, input_data in EXAMPLES:
+            with self.subTest(lines[0]):
+                status, output = interpreted_run(lines, input_data)
+                self.assertEqual(status, Status.HALTED)
+                self.assertEqual(compiled_run(lines, input_data), output)
+
+    def test_corpus(self):
+        for workload in WORKLOADS:
+            if workload.name == 'self_modifying':
+                continue
+            with self.subTest(workload.name):
+                self.assertEqual(
+                    compiled_run(workload.lines, workload.input_data),
+                    interpreted_run(workload.lines, workload.input_data)[1])
+
+    def test_random_directions_follow_seed(self):
+        lines = ['v>1.@', '>?2.@', ' >3.@', ' 4', ' .', ' @']
+        for seed in range(8):
+            self.assertEqual(compiled_run(lines, seed=seed),
+                             interpreted_run(lines, seed=seed)[1])
+
+    def test_input(self):
+        lines = ['&&+.~,~,@']
+        self.assertEqual(compiled_run(lines, '2 x 3 ab'),
+                         interpreted_run(lines, '2 x 3 ab')[1])
+        with self.assertRaises(EOFError):
+            compiled_run(lines, '1')
+
+    def test_constant_self_modification(self):
+        workload = next(workload for workload in WORKLOADS
+                        if workload.name == 'self_modifying')
+        with self.assertRaises(CompileError):
+            transpile(Playfield.from_lines(workload.lines))
+
+    def test_dynamic_self_modification(self):
+        namespace = {}
+        exec(transpile(Playfield.from_lines(['"@"&0p1.@'])), namespace)
+        with self.assertRaises(namespace['CodeModified']):
+            namespace['run'](MemorySink().append, io.BytesIO(b'6'))
+        self.assertEqual(compiled_run(['"@"&0p1.@'], '12'), '1 ')
+
+    def test_unknown_command(self):
+        with self.assertRaises(KeyError):
+            compiled_run(['1a.@'])
+
+    def test_bytecode_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            program_file = os.path.join(directory, 'hello.bf')
+            with open(program_file, 'w') as f:
+                f.write(EXAMPLES[0][0][0])
+            output = MemorySink()
+            run(load(program_file), output)
+            self.assertEqual(output.getvalue(), 'Hello, World!\n')
+            cached = os.listdir(os.path.join(directory, '__pycache__'))
+            self.assertEqual(len(cached), 1)
+            with open(program_file, 'w') as f:
+                f.write('"!iH",,,@')
+            output = MemorySink()
+            run(load(program_file), output)
+            self.assertEqual(output.getvalue(), 'Hi!')
+            self.assertEqual(
+                len(os.listdir(os.path.join(directory, '__pycache__'))), 2)
+
+    def test_cached_bytecode_is_used(self):
+        with tempfile.TemporaryDirectory() as directory:
+            program_file = os.path.join(directory, 'hello.bf')
+            with open(program_file, 'w') as f:
+                f.write('"!iH",,,@')
+            load(program_file)
+            path, = [os.path.join(directory, '__pycache__', name)
+                     for name in os.listdir(
+                         os.path.join(directory, '__pycache__'))]
+            with open(path, 'rb') as f:
+                data = f.read()
+            load(program_file, use_cache=False)
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), data)
+            self.assertTrue(os.path.basename(path).startswith('hello.bf.'))
+            save_cached(path, compile(
+                transpile(Playfield.from_lines(['"!eyB",,,,@'])), 'bye.bf',
+                'exec'))
+            for use_cache, expected in ((True, 'Bye!'), (False, 'Hi!')):
+                output = MemorySink()
+                load(program_file, use_cache=use_cache)['run'](output.append)
+                self.assertEqual(output.getvalue(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
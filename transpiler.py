@@ -0,0 +1,406 @@
+import hashlib
+import io
+import marshal
+import os
+import sys
+from argparse import ArgumentParser
+from importlib.util import MAGIC_NUMBER
+from analysis import Analysis, BRANCHES, DIGITS
+from interpreter import COMMAND_SYMBOLS
+from jit import TraceBuilder, BINARY_OPERATIONS
+from playfield import Playfield
+from sinks import FileSink, StdoutSink
+from sources import INPUT_EXHAUSTED
+from exceptions import CompileError, PlayfieldSizeError
+
+FORMAT_VERSION = 1
+HALT = -1
+SELF_MODIFYING = "Программа изменяет собственный код командой p в клетке " \
+                 "({}, {}), её нельзя скомпилировать."
+CODE_MODIFIED = "Программа изменила собственный код командой p в клетке " \
+                "({}, {}), скомпилированная программа остановлена."
+HEADER = '''\
+# Befunge program compiled by transpiler.py, format {version}
+import sys
+'''
+INPUT = '''
+TOKEN = re.compile(rb'\\s*(\\S+)')
+
+
+class Input:
+    def __init__(self, stream):
+        self.stream = stream
+        self.data = b''
+        self.cursor = 0
+
+    def fill(self):
+        if self.stream is None:
+            return False
+        chunk = getattr(self.stream, 'read1', self.stream.read)(65536)
+        if not chunk:
+            self.stream = None
+            return False
+        self.data = self.data[self.cursor:] + chunk
+        self.cursor = 0
+        return True
+
+    def char(self):
+        if self.cursor >= len(self.data) and not self.fill():
+            raise EOFError
+        self.cursor += 1
+        return self.data[self.cursor - 1]
+
+    def number(self, s):
+        while True:
+            match = TOKEN.match(self.data, self.cursor)
+            if match is not None and match.end() < len(self.data):
+                break
+            if not self.fill():
+                if match is None:
+                    raise EOFError
+                break
+        self.cursor = match.end()
+        token = match.group(1)
+        try:
+            s.append(int(token))
+        except ValueError:
+            print(f'{token.decode(errors="replace")} is not int')
+'''
+RANDOM = '''
+
+def directions(seed):
+    generator = Random(seed)
+    while True:
+        bits = generator.getrandbits(64)
+        for _ in range(32):
+            yield bits & 3
+            bits >>= 2
+'''
+PUT = '''\
+    def put(x, y, value):
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            position = y * WIDTH + x
+            if position in CODE and cells[position] != value:
+                raise CodeModified(x, y)
+            cells[position] = value
+'''
+GET = '''\
+    def get(x, y):
+        if 0 <= x < WIDTH and 0 <= y < HEIGHT:
+            return cells[y * WIDTH + x]
+        return 0
+'''
+FOOTER = '''
+
+if __name__ == '__main__':
+    try:
+        run(sys.stdout.write, sys.stdin.buffer)
+    except EOFError:
+        print(INPUT_EXHAUSTED)
+'''
+
+argparser = ArgumentParser(prog='main.py compile')
+argparser.add_argument('program_file',
+                       help="path to Befunge executable code file")
+argparser.add_argument('-i', '--input_file',
+                       help="path to file with additional args that are "
+                            "separated by whitespace, '-' for standard input")
+argparser.add_argument('-o', '--output', default='output.txt',
+                       help="path to output file, '-' for standard output "
+                            "(default: output.txt)")
+argparser.add_argument('--width', type=int,
+                       help="playfield width, by default the length of the "
+                            "longest program line")
+argparser.add_argument('--height', type=int,
+                       help="playfield height, by default the number of "
+                            "program lines")
+argparser.add_argument('--seed', type=int,
+                       help="seed for the random directions of ?")
+argparser.add_argument('--emit',
+                       help="write the generated Python module to this file "
+                            "instead of running the program")
+argparser.add_argument('--no-cache', action='store_true',
+                       help="do not read or write the compiled bytecode in "
+                            "__pycache__ next to the program")
+
+
+def is_literal(value):
+    return value.lstrip('-').isdigit()
+
+
+class BlockBuilder(TraceBuilder):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+        self.loops = False
+
+    def flush(self):
+        if len(self.values) == 1:
+            self.lines.append(f's.append({self.values[0]})')
+        elif self.values:
+            self.lines.append(f's.extend(({", ".join(self.values)},))')
+        self.values = []
+
+    def jump(self, target):
+        if target == self.index:
+            self.loops = True
+            return 'continue'
+        return f'return {target}'
+
+    def source(self, exit_lines):
+        self.flush()
+        lines = self.lines + exit_lines
+        if self.loops:
+            lines = ['while True:'] + ['    ' + line for line in lines]
+        body = '\n        '.join(lines)
+        return f'    def b{self.index}(s):\n        {body}\n'
+
+
+class Transpiler:
+    def __init__(self, playfield):
+        self.playfield = playfield
+        self.analysis = Analysis(playfield)
+        self.code = self.analysis.reachable_cells
+        self.symbols = {self.analysis.symbol(state)
+                        for state in self.analysis.graph if not state[2]}
+        self.index = {block[0]: i
+                      for i, block in enumerate(self.analysis.blocks)}
+        self.dynamic_puts = False
+
+    def put(self, builder):
+        y, x, value = builder.pop(), builder.pop(), builder.pop()
+        if not is_literal(x) or not is_literal(y):
+            self.dynamic_puts = True
+            builder.call('put({}, {}, {})', x, y, value)
+            return
+        x, y = int(x), int(y)
+        if not self.playfield.contains(x, y):
+            return
+        position = y * self.playfield.width + x
+        if position in self.code and (
+                not is_literal(value)
+                or int(value) != self.playfield.cells[position]):
+            raise CompileError(SELF_MODIFYING.format(x, y))
+        builder.call('cells[{}] = {}', position, value)
+
+    def get(self, builder):
+        y, x = builder.pop(), builder.pop()
+        if 'p' not in self.symbols and is_literal(x) and is_literal(y):
+            builder.push(str(self.playfield.get(int(x), int(y))))
+        else:
+            builder.push(builder.temporary(f'get({x}, {y})'))
+
+    def block(self, i, block):
+        builder = BlockBuilder(i)
+        for state in block:
+            position, direction, quote_mode = state
+            symbol = self.analysis.symbol(state)
+            if quote_mode:
+                if symbol != '"':
+                    builder.push(str(self.playfield.cells[position]))
+            elif symbol in DIGITS:
+                builder.push(symbol)
+            elif symbol in BINARY_OPERATIONS:
+                builder.binary(symbol)
+            elif symbol == ':':
+                value = builder.pop()
+                builder.push(value)
+                builder.push(value)
+            elif symbol == '\\':
+                first, second = builder.pop(), builder.pop()
+                builder.push(first)
+                builder.push(second)
+            elif symbol == '$':
+                builder.drop()
+            elif symbol == '!':
+                builder.push(builder.temporary(
+                    f'1 if {builder.pop()} == 0 else 0'))
+            elif symbol == 'g':
+                self.get(builder)
+            elif symbol == 'p':
+                self.put(builder)
+            elif symbol == '.':
+                builder.call("write(str({}) + ' ')", builder.pop())
+            elif symbol == ',':
+                builder.call('write(chr({}))', builder.pop())
+            elif symbol == '&':
+                builder.flush()
+                builder.call('data.number(s)')
+            elif symbol == '~':
+                builder.push(builder.temporary('data.char()'))
+        targets = [self.index[target]
+                   for target in self.analysis.graph[block[-1]]]
+        if quote_mode:
+            return builder.source([builder.jump(targets[0])])
+        if symbol in BRANCHES:
+            condition = builder.pop()
+            if is_literal(condition):
+                return builder.source(
+                    [builder.jump(targets[0 if int(condition) else 1])])
+            return builder.source([f'if {condition}:',
+                                   '    ' + builder.jump(targets[0]),
+                                   builder.jump(targets[1])])
+        if symbol == '?':
+            return builder.source(
+                [f'return {tuple(targets)}[direction()]'])
+        if symbol == '@':
+            return builder.source([f'return {HALT}'])
+        if symbol not in COMMAND_SYMBOLS and symbol not in DIGITS:
+            return builder.source([f'raise KeyError({symbol!r})'])
+        return builder.source([builder.jump(targets[0])])
+
+    def source(self):
+        blocks = [self.block(i, block)
+                  for i, block in enumerate(self.analysis.blocks)]
+        playfield = self.playfield
+        reads = bool(self.symbols & set('&~'))
+        cells = bool(self.symbols & set('gp'))
+        imports = []
+        if cells:
+            imports.append('from array import array')
+        if reads:
+            imports.append('import re')
+        if '?' in self.symbols:
+            imports.append('from random import Random')
+        parts = [HEADER.format(version=FORMAT_VERSION)]
+        parts += [line + '\n' for line in imports]
+        parts.append(f'\nWIDTH = {playfield.width}\n'
+                     f'HEIGHT = {playfield.height}\n'
+                     f'INPUT_EXHAUSTED = {INPUT_EXHAUSTED!r}\n')
+        if cells:
+            parts.append(f'CELLS = array({playfield.cells.typecode!r}, '
+                         f'{playfield.cells.tolist()!r})\n')
+        if self.dynamic_puts:
+            parts.append(f'CODE = frozenset({sorted(self.code)!r})\n')
+        parts.append('\n\nclass CodeModified(Exception):\n    pass\n')
+        if reads:
+            parts.append(INPUT)
+        if '?' in self.symbols:
+            parts.append(RANDOM)
+        parts.append('\n\ndef run(write=sys.stdout.write, stream=None, '
+                     'seed=None):\n')
+        if reads:
+            parts.append('    data = Input(stream)\n')
+        if '?' in self.symbols:
+            parts.append('    direction = directions(seed).__next__\n')
+        if 'p' in self.symbols:
+            parts.append('    cells = array(CELLS.typecode, CELLS)\n')
+        elif cells:
+            parts.append('    cells = CELLS\n')
+        if self.dynamic_puts:
+            parts.append('\n' + PUT)
+        if 'g' in self.symbols:
+            parts.append('\n' + GET)
+        parts += ['\n' + block for block in blocks]
+        start = self.index.get(self.analysis.start, HALT)
+        names = ', '.join(f'b{i}' for i in range(len(blocks)))
+        parts.append(f'\n    blocks = [{names}]\n'
+                     f'    s = []\n'
+                     f'    b = {start}\n'
+                     f'    while b != {HALT}:\n'
+                     f'        b = blocks[b](s)\n')
+        parts.append(FOOTER)
+        return ''.join(parts)
+
+
+def transpile(playfield):
+    return Transpiler(playfield).source()
+
+
+def read_lines(data):
+    return [line.rstrip() for line in io.StringIO(data.decode(), None)]
+
+
+def cache_path(program_file, digest):
+    directory, name = os.path.split(os.path.abspath(program_file))
+    return os.path.join(directory, '__pycache__', f'{name}.{digest[:16]}.pyc')
+
+
+def load_cached(path):
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if not data.startswith(MAGIC_NUMBER):
+        return None
+    try:
+        return marshal.loads(data[len(MAGIC_NUMBER):])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def save_cached(path, code):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f'{path}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(MAGIC_NUMBER + marshal.dumps(code))
+        os.replace(temporary, path)
+    except OSError:
+        pass
+
+
+def load(program_file, width=None, height=None, use_cache=True):
+    with open(program_file, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha256(f'{FORMAT_VERSION} {width} {height}\n'.encode()
+                            + data).hexdigest()
+    path = cache_path(program_file, digest)
+    code = load_cached(path) if use_cache else None
+    if code is None:
+        playfield = Playfield.from_lines(read_lines(data), width, height)
+        code = compile(transpile(playfield), program_file, 'exec')
+        if use_cache:
+            save_cached(path, code)
+    namespace = {'__name__': 'befunge'}
+    exec(code, namespace)
+    return namespace
+
+
+def run(namespace, output, input_file=None, seed=None):
+    stream = None
+    if input_file == '-':
+        stream = sys.stdin.buffer
+    elif input_file is not None:
+        stream = open(input_file, 'rb')
+    try:
+        namespace['run'](output.append, stream, seed)
+    except EOFError:
+        print(INPUT_EXHAUSTED)
+    except namespace['CodeModified'] as e:
+        print(CODE_MODIFIED.format(*e.args))
+    finally:
+        if stream is not None and input_file != '-':
+            stream.close()
+
+
+def main(argv):
+    args = argparser.parse_args(argv)
+    try:
+        if args.emit is not None:
+            with open(args.program_file, 'rb') as f:
+                playfield = Playfield.from_lines(read_lines(f.read()),
+                                                 args.width, args.height)
+            source = transpile(playfield)
+            with open(args.emit, 'w') as f:
+                f.write(source)
+            return
+        namespace = load(args.program_file, args.width, args.height,
+                         not args.no_cache)
+    except OSError as e:
+        print(f"{e.filename} not found")
+        return
+    except (PlayfieldSizeError, CompileError) as e:
+        print(e)
+        return
+    if args.output == '-':
+        output = StdoutSink()
+    else:
+        output = FileSink(args.output)
+    try:
+        run(namespace, output, args.input_file, args.seed)
+    except FileNotFoundError as e:
+        print(f"{e.filename} not found")
+    finally:
+        output.close()